@@ -1,17 +1,53 @@
+from typing import TYPE_CHECKING, Any
+
 from .hashing.core import (
     ConsistentHashing,
     WeightedConsistentHashing,
     RendezvousHashing,
     fast_hash64,
 )
-from .routing import DHash
-from .stats import weighted_percentile
+from . import hashing, routing
+from .routing import ConcurrentDHash, DHash, RoutingStats, SharedDHash, SharedHotKeyTable
+from .stats import QuantileSketch, weighted_percentile, weighted_percentiles
+
+if TYPE_CHECKING:
+    from .hashing import SlotRouter
+    from .routing import (
+        AdaptiveDHash,
+        FailoverRouter,
+        RateDHash,
+        SnapshotWriter,
+        load_snapshot,
+        save_snapshot,
+    )
+
+
+def __getattr__(name: str) -> Any:
+    if name in routing._LAZY:
+        return getattr(routing, name)
+    if name == "SlotRouter":
+        return hashing.SlotRouter
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "ConsistentHashing",
     "WeightedConsistentHashing",
     "RendezvousHashing",
+    "SlotRouter",
     "DHash",
+    "AdaptiveDHash",
+    "RateDHash",
+    "ConcurrentDHash",
+    "FailoverRouter",
+    "RoutingStats",
+    "SharedDHash",
+    "SharedHotKeyTable",
+    "SnapshotWriter",
+    "load_snapshot",
+    "save_snapshot",
     "fast_hash64",
+    "QuantileSketch",
     "weighted_percentile",
+    "weighted_percentiles",
 ]
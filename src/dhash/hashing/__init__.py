@@ -1,3 +1,23 @@
+import importlib
+from typing import TYPE_CHECKING, Any
+
 from .core import ConsistentHashing, WeightedConsistentHashing, RendezvousHashing, fast_hash64
 
-__all__ = ["ConsistentHashing", "WeightedConsistentHashing", "RendezvousHashing", "fast_hash64"]
+if TYPE_CHECKING:
+    from .slots import SlotRouter
+
+
+def __getattr__(name: str) -> Any:
+    # The slot router builds its CRC16 table on import, so it loads on first use.
+    if name == "SlotRouter":
+        return importlib.import_module(".slots", __name__).SlotRouter
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = [
+    "ConsistentHashing",
+    "WeightedConsistentHashing",
+    "RendezvousHashing",
+    "SlotRouter",
+    "fast_hash64",
+]
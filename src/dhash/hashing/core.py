@@ -1,18 +1,35 @@
 from bisect import bisect
-from typing import Any, Dict, List, Optional
-
-try:
-    import xxhash as _xx
-except ImportError as e:
-    raise RuntimeError(
-        "The 'xxhash' package is required. Install it via: pip install xxhash"
-    ) from e
+from typing import Any, Callable, Dict, List, Optional
 
 from ..config import VIRTUAL_POINTS_PER_NODE
 
+_xxh64_intdigest: Optional[Callable[[bytes], int]] = None
+
+
+def _load_xxh64() -> Callable[[bytes], int]:
+    global _xxh64_intdigest
+    try:
+        import xxhash
+    except ImportError as e:
+        raise RuntimeError(
+            "The 'xxhash' package is required. Install it via: pip install xxhash"
+        ) from e
+    _xxh64_intdigest = xxhash.xxh64_intdigest
+    return _xxh64_intdigest
+
 
 def fast_hash64(key: Any) -> int:
-    return int(_xx.xxh64(str(key).encode("utf-8")).intdigest())
+    digest = _xxh64_intdigest or _load_xxh64()
+    # bytes keys hash as-is, so b"k" and "k" land on the same node.
+    if key.__class__ is bytes:
+        return digest(key)
+    return digest(str(key).encode("utf-8"))
+
+
+def suffixed_key(key: Any, suffix: str) -> Any:
+    if isinstance(key, bytes):
+        return key + b"|" + suffix.encode("utf-8")
+    return f"{key}|{suffix}"
 
 
 class ConsistentHashing:
@@ -20,6 +37,7 @@ class ConsistentHashing:
         self.replicas = replicas
         self.ring: Dict[int, str] = {}
         self.sorted_keys: List[int] = []
+        self.version = 0
         for node in nodes:
             self.add_node(node)
 
@@ -33,6 +51,14 @@ class ConsistentHashing:
             self.ring[k] = node
             self.sorted_keys.append(k)
         self.sorted_keys.sort()
+        self.version += 1
+
+    def remove_node(self, node: str) -> None:
+        points = {k for k, owner in self.ring.items() if owner == node}
+        for k in points:
+            del self.ring[k]
+        self.sorted_keys = [k for k in self.sorted_keys if k not in points]
+        self.version += 1
 
     def get_node(self, key: Any, op: str = "read") -> str:
         if not self.ring:
@@ -92,7 +118,7 @@ class RendezvousHashing:
 
     @staticmethod
     def _score(key: Any, node: str) -> int:
-        return fast_hash64(f"{key}|{node}")
+        return fast_hash64(suffixed_key(key, node))
 
     def get_node(self, key: Any, op: str = "read") -> str:
         if not self.nodes:
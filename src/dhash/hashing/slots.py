@@ -0,0 +1,176 @@
+from typing import TYPE_CHECKING, Any, Dict, List, Sequence, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+CLUSTER_SLOTS = 16384
+
+
+def _crc16_table() -> List[int]:
+    table = []
+    for byte in range(256):
+        crc = byte << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else (crc << 1)
+        table.append(crc & 0xFFFF)
+    return table
+
+
+# CRC16-CCITT (XMODEM), the variant Redis Cluster uses for key slots.
+_CRC16_TABLE = _crc16_table()
+
+
+def crc16(data: bytes) -> int:
+    crc = 0
+    table = _CRC16_TABLE
+    for b in data:
+        crc = ((crc << 8) & 0xFFFF) ^ table[((crc >> 8) ^ b) & 0xFF]
+    return crc
+
+
+def _key_bytes(key: Any) -> bytes:
+    if isinstance(key, bytes):
+        return key
+    return str(key).encode("utf-8")
+
+
+def hash_tag(raw: bytes) -> bytes:
+    # Only the part between the first "{" and the next "}" is hashed, if it is non-empty.
+    start = raw.find(b"{")
+    if start < 0:
+        return raw
+    end = raw.find(b"}", start + 1)
+    if end <= start + 1:
+        return raw
+    return raw[start + 1 : end]
+
+
+def key_slot(key: Any) -> int:
+    return crc16(hash_tag(_key_bytes(key))) & (CLUSTER_SLOTS - 1)
+
+
+def key_slots(keys: Sequence[Any]) -> "np.ndarray":
+    import numpy as np
+
+    tagged = [hash_tag(_key_bytes(k)) for k in keys]
+    lengths = np.fromiter((len(t) for t in tagged), dtype=np.int64, count=len(tagged))
+    width = int(lengths.max()) if len(tagged) else 0
+    # One row per key, zero-padded; each column step updates every key that is long enough.
+    buf = np.zeros((len(tagged), max(width, 1)), dtype=np.uint8)
+    for i, t in enumerate(tagged):
+        buf[i, : len(t)] = np.frombuffer(t, dtype=np.uint8)
+
+    table = np.asarray(_CRC16_TABLE, dtype=np.uint32)
+    crc = np.zeros(len(tagged), dtype=np.uint32)
+    for col in range(width):
+        active = lengths > col
+        idx = ((crc >> 8) ^ buf[:, col]) & 0xFF
+        updated = ((crc << 8) & 0xFFFF) ^ table[idx]
+        crc = np.where(active, updated, crc)
+    return (crc & (CLUSTER_SLOTS - 1)).astype(np.int64)
+
+
+class SlotRouter:
+    def __init__(self, nodes: List[str]) -> None:
+        if not nodes:
+            raise ValueError("SlotRouter requires at least one node.")
+        self.nodes: List[str] = list(nodes)
+        self.slot_table: List[str] = []
+        self.version = 0
+        # Contiguous, near-equal ranges in node order, as redis-cli --cluster create assigns them.
+        per_node, extra = divmod(CLUSTER_SLOTS, len(self.nodes))
+        for i, node in enumerate(self.nodes):
+            self.slot_table.extend([node] * (per_node + (1 if i < extra else 0)))
+
+    def get_node(self, key: Any, op: str = "read") -> str:
+        return self.slot_table[key_slot(key)]
+
+    def get_nodes(self, keys: Sequence[Any]) -> List[str]:
+        table = self.slot_table
+        return [table[s] for s in key_slots(keys).tolist()]
+
+    def slot_ranges(self) -> List[Tuple[int, int, str]]:
+        ranges: List[Tuple[int, int, str]] = []
+        start = 0
+        for slot in range(1, CLUSTER_SLOTS + 1):
+            if slot == CLUSTER_SLOTS or self.slot_table[slot] != self.slot_table[start]:
+                ranges.append((start, slot - 1, self.slot_table[start]))
+                start = slot
+        return ranges
+
+    def slot_counts(self) -> Dict[str, int]:
+        counts = {n: 0 for n in self.nodes}
+        for node in self.slot_table:
+            counts[node] += 1
+        return counts
+
+    def _move(self, donors: List[str], target: str, quota: int) -> List[Tuple[int, int, str, str]]:
+        # Take slots from the end of each donor's ranges so the donors keep contiguous ranges.
+        counts = self.slot_counts()
+        moves: List[Tuple[int, int, str, str]] = []
+        for donor in donors:
+            surplus = counts[donor] - quota
+            if surplus <= 0:
+                continue
+            slots = [s for s in range(CLUSTER_SLOTS - 1, -1, -1) if self.slot_table[s] == donor]
+            for s in slots[:surplus]:
+                self.slot_table[s] = target
+            moves.extend(self._ranges_of(sorted(slots[:surplus]), donor, target))
+        return moves
+
+    @staticmethod
+    def _ranges_of(slots: List[int], src: str, dst: str) -> List[Tuple[int, int, str, str]]:
+        out: List[Tuple[int, int, str, str]] = []
+        for s in slots:
+            if out and out[-1][1] == s - 1:
+                out[-1] = (out[-1][0], s, src, dst)
+            else:
+                out.append((s, s, src, dst))
+        return out
+
+    def add_node(self, node: str) -> List[Tuple[int, int, str, str]]:
+        if node in self.nodes:
+            return []
+        donors = list(self.nodes)
+        self.nodes.append(node)
+        quota = CLUSTER_SLOTS // len(self.nodes)
+        moves = self._move(donors, node, quota + 1)
+        # Second pass so every donor gives up to the same floor, leaving at most one slot spread.
+        if self.slot_counts()[node] < quota:
+            moves += self._move(donors, node, quota)
+        self.version += 1
+        return moves
+
+    def remove_node(self, node: str) -> List[Tuple[int, int, str, str]]:
+        if node not in self.nodes:
+            return []
+        if len(self.nodes) == 1:
+            raise ValueError("Cannot remove the last node.")
+        counts = self.slot_counts()
+        self.nodes.remove(node)
+        orphaned = [s for s, owner in enumerate(self.slot_table) if owner == node]
+        # Hand out contiguous chunks to the least-loaded remaining nodes.
+        moves: List[Tuple[int, int, str, str]] = []
+        remaining = len(orphaned)
+        pos = 0
+        for i, target in enumerate(sorted(self.nodes, key=lambda n: (counts[n], n))):
+            share = remaining // (len(self.nodes) - i)
+            chunk = orphaned[pos : pos + share]
+            for s in chunk:
+                self.slot_table[s] = target
+            moves.extend(self._ranges_of(chunk, node, target))
+            pos += share
+            remaining -= share
+        self.version += 1
+        return moves
+
+    def rebalance(self, nodes: List[str]) -> List[Tuple[int, int, str, str]]:
+        moves: List[Tuple[int, int, str, str]] = []
+        for node in [n for n in self.nodes if n not in nodes]:
+            moves += self.remove_node(node)
+        for node in nodes:
+            moves += self.add_node(node)
+        return moves
+
+
+__all__ = ["CLUSTER_SLOTS", "SlotRouter", "crc16", "hash_tag", "key_slot", "key_slots"]
@@ -1,3 +1,45 @@
+import importlib
+from typing import TYPE_CHECKING, Any
+
+from .concurrent import ConcurrentDHash
 from .router import DHash
+from .shared import SharedDHash, SharedHotKeyTable
+from .stats import RoutingStats
+
+if TYPE_CHECKING:
+    from .adaptive import AdaptiveDHash
+    from .failover import FailoverRouter
+    from .rate import RateDHash
+    from .snapshot import SnapshotWriter, load_snapshot, save_snapshot
+
+# Optional router variants load on first access to keep `import dhash` cheap.
+_LAZY = {
+    "AdaptiveDHash": ".adaptive",
+    "FailoverRouter": ".failover",
+    "RateDHash": ".rate",
+    "SnapshotWriter": ".snapshot",
+    "load_snapshot": ".snapshot",
+    "save_snapshot": ".snapshot",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module, __name__), name)
+
 
-__all__ = ["DHash"]
+__all__ = [
+    "AdaptiveDHash",
+    "ConcurrentDHash",
+    "DHash",
+    "FailoverRouter",
+    "RateDHash",
+    "RoutingStats",
+    "SharedDHash",
+    "SharedHotKeyTable",
+    "SnapshotWriter",
+    "load_snapshot",
+    "save_snapshot",
+]
@@ -0,0 +1,158 @@
+import heapq
+from statistics import pstdev
+from typing import Any, Dict, List, Optional
+
+from ..config import (
+    DEFAULT_HOT_KEY_THRESHOLD,
+    DEFAULT_WINDOW_SIZE,
+    VIRTUAL_POINTS_PER_NODE,
+)
+from .router import DHash
+
+
+class AdaptiveDHash(DHash):
+    __slots__ = (
+        "min_T",
+        "max_T",
+        "min_W",
+        "max_W",
+        "interval",
+        "top_k",
+        "target_cv",
+        "damping",
+        "tolerance",
+        "history",
+        "_ops",
+        "_alt_ops",
+        "_node_ops",
+        "_key_ops",
+        "_prev_cv",
+        "_last_move",
+    )
+
+    def __init__(
+        self,
+        nodes: List[str],
+        hot_key_threshold: int = DEFAULT_HOT_KEY_THRESHOLD,
+        window_size: Optional[int] = DEFAULT_WINDOW_SIZE,
+        replicas: int = VIRTUAL_POINTS_PER_NODE,
+        ring: Optional[Any] = None,
+        *,
+        min_threshold: Optional[int] = None,
+        max_threshold: Optional[int] = None,
+        min_window: Optional[int] = None,
+        max_window: Optional[int] = None,
+        interval: int = 10_000,
+        top_k: int = 16,
+        target_cv: float = 0.05,
+        damping: float = 0.5,
+        tolerance: float = 0.05,
+    ) -> None:
+        super().__init__(nodes, hot_key_threshold, window_size, replicas, ring)
+        if interval < 1:
+            raise ValueError("interval must be at least 1.")
+        if not 0.0 < damping <= 1.0:
+            raise ValueError("damping must be in (0, 1].")
+        self.min_T: int = max(1, self.T // 10 if min_threshold is None else int(min_threshold))
+        self.max_T: int = max(self.min_T, self.T * 10 if max_threshold is None else max_threshold)
+        self.min_W: int = max(1, self.W // 4 if min_window is None else int(min_window))
+        self.max_W: int = max(self.min_W, self.W * 4 if max_window is None else max_window)
+        self.interval: int = int(interval)
+        self.top_k: int = max(1, int(top_k))
+        self.target_cv: float = float(target_cv)
+        self.damping: float = float(damping)
+        self.tolerance: float = float(tolerance)
+        self.history: List[Dict[str, float]] = []
+        self._ops = 0
+        self._alt_ops = 0
+        self._node_ops: Dict[str, int] = {}
+        self._key_ops: Dict[Any, int] = {}
+        self._prev_cv: Optional[float] = None
+        self._last_move = 0
+
+    def get_node(self, key: Any, op: str = "read") -> str:
+        node = super().get_node(key, op)
+        if op == "write":
+            return node
+
+        self._ops += 1
+        self._node_ops[node] = self._node_ops.get(node, 0) + 1
+        self._key_ops[key] = self._key_ops.get(key, 0) + 1
+        if node == self.alt.get(key):
+            self._alt_ops += 1
+        if self._ops >= self.interval:
+            self._adjust()
+        return node
+
+    def get_write_nodes(self, key: Any) -> List[str]:
+        self._sync_membership_if_needed()
+        primary = self._primary_safe(key)
+        # T moves, so a key can fall below it after its alternate is installed. Reads go back to
+        # that alternate once T drops again, so its copy is kept current whatever T is.
+        alternate = self.alt.get(key)
+        if alternate is None or alternate == primary:
+            return [primary]
+        return [primary, alternate]
+
+    def _step(self, current: int, goal: float) -> int:
+        moved = round(current + self.damping * (goal - current))
+        # Move at least one unit, so small values do not get stuck on rounding.
+        if goal > current:
+            return max(moved, current + 1)
+        if goal < current:
+            return min(moved, current - 1)
+        return current
+
+    def _threshold_goal(self, load_cv: float, alt_rate: float) -> float:
+        prev = self._prev_cv
+        if load_cv <= self.target_cv:
+            # Balanced: raise T while keys are still split, to save replica traffic.
+            return self.T * 1.25 if alt_rate > 0 else float(self.T)
+        improved = prev is not None and load_cv < prev * (1 - self.tolerance)
+        worse = prev is not None and load_cv > prev * (1 + self.tolerance)
+        if self._last_move < 0 and not improved:
+            # Lowering T did not help; the imbalance comes from keys D-HASH cannot split further.
+            return self.T * 1.25
+        if self._last_move > 0:
+            return self.T * 0.8 if worse else self.T * 1.25
+        # Imbalance lowers T in proportion to the excess, at most halving it per step.
+        return self.T * max(0.5, self.target_cv / load_cv)
+
+    def _adjust(self) -> None:
+        ops = self._ops
+        loads = [self._node_ops.get(n, 0) for n in self.nodes]
+        mean = ops / len(loads)
+        load_cv = pstdev(loads) / mean if len(loads) > 1 and mean > 0 else 0.0
+        top_share = sum(heapq.nlargest(self.top_k, self._key_ops.values())) / ops
+        alt_rate = self._alt_ops / ops
+
+        goal_t = self._threshold_goal(load_cv, alt_rate)
+        # Concentrated traffic gets shorter windows, so the split evens out within fewer reads.
+        goal_w = self.max_W - (self.max_W - self.min_W) * top_share
+
+        new_t = self._step(self.T, goal_t)
+        new_w = self._step(self.W, goal_w)
+        new_t = min(self.max_T, max(self.min_T, new_t))
+        self._last_move = (new_t > self.T) - (new_t < self.T)
+        self._prev_cv = load_cv
+        self.T = new_t
+        self.hot_key_threshold = self.T
+        self.W = min(self.max_W, max(self.min_W, new_w))
+
+        self.history.append(
+            {
+                "ops": float((len(self.history) + 1) * self.interval),
+                "T": float(self.T),
+                "W": float(self.W),
+                "load_cv": load_cv,
+                "top_k_share": top_share,
+                "alt_rate": alt_rate,
+            }
+        )
+        self._ops = 0
+        self._alt_ops = 0
+        self._node_ops = {}
+        self._key_ops = {}
+
+
+__all__ = ["AdaptiveDHash"]
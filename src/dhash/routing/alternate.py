@@ -1,6 +1,8 @@
 from bisect import bisect
 from typing import Any, Callable, Dict, List
 
+from ..hashing.core import suffixed_key
+
 
 def ensure_alternate(
     key: Any,
@@ -14,13 +16,21 @@ def ensure_alternate(
     if key in alt_dict:
         return
 
-    if not ring_keys or not ring_map or len(nodes) <= 1:
+    if len(nodes) <= 1:
         alt_dict[key] = primary
         return
 
+    if not ring_keys or not ring_map:
+        # Slot-table bases have no ring to walk; pick another node by hash instead.
+        others = [n for n in nodes if n != primary]
+        alt_dict[key] = (
+            others[hash_fn(suffixed_key(key, "alt")) % len(others)] if others else primary
+        )
+        return
+
     hk = hash_fn(key)
     i = bisect(ring_keys, hk) % len(ring_keys)
-    stride = 1 + (hash_fn(f"{key}|alt") % (len(nodes) - 1))
+    stride = 1 + (hash_fn(suffixed_key(key, "alt")) % (len(nodes) - 1))
 
     seen = set()
     ordered = []
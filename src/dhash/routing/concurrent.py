@@ -0,0 +1,153 @@
+import threading
+from typing import Any, Dict, List, Optional
+
+from ..config import (
+    DEFAULT_HOT_KEY_THRESHOLD,
+    DEFAULT_WINDOW_SIZE,
+    VIRTUAL_POINTS_PER_NODE,
+)
+from .alternate import ensure_alternate
+from .guard import check_guard_phase
+from .router import DHash
+from .window import select_window_route
+
+
+class ConcurrentDHash(DHash):
+    __slots__ = ("flush_every", "_stripes", "_locks", "_mask", "_local", "_membership_lock")
+
+    def __init__(
+        self,
+        nodes: List[str],
+        hot_key_threshold: int = DEFAULT_HOT_KEY_THRESHOLD,
+        window_size: Optional[int] = DEFAULT_WINDOW_SIZE,
+        replicas: int = VIRTUAL_POINTS_PER_NODE,
+        ring: Optional[Any] = None,
+        stripes: int = 64,
+        flush_every: int = 0,
+    ) -> None:
+        super().__init__(nodes, hot_key_threshold, window_size, replicas, ring)
+        n_stripes = 1
+        while n_stripes < max(1, int(stripes)):
+            n_stripes <<= 1
+        self.flush_every: int = max(0, int(flush_every))
+        self._stripes: List[Dict[Any, int]] = [{} for _ in range(n_stripes)]
+        self._locks: List[threading.Lock] = [threading.Lock() for _ in range(n_stripes)]
+        self._mask: int = n_stripes - 1
+        self._local = threading.local()
+        self._membership_lock = threading.Lock()
+
+    def _sync_membership_if_needed(self) -> None:
+        if self._ring_unchanged():
+            return
+        with self._membership_lock:
+            super()._sync_membership_if_needed()
+
+    def _pending(self) -> Dict[Any, int]:
+        pending: Optional[Dict[Any, int]] = getattr(self._local, "pending", None)
+        if pending is None:
+            pending = {}
+            self._local.pending = pending
+            self._local.ops = 0
+        return pending
+
+    def _increment(self, key: Any) -> int:
+        idx = hash(key) & self._mask
+        if self.flush_every == 0:
+            with self._locks[idx]:
+                stripe = self._stripes[idx]
+                cnt = stripe.get(key, 0) + 1
+                stripe[key] = cnt
+            return cnt
+
+        # Buffered mode: counts from other threads lag by at most flush_every reads each.
+        pending = self._pending()
+        local_cnt = pending.get(key, 0) + 1
+        pending[key] = local_cnt
+        cnt = self._stripes[idx].get(key, 0) + local_cnt
+        self._local.ops += 1
+        if self._local.ops >= self.flush_every:
+            self.flush_local()
+        return cnt
+
+    def flush_local(self) -> None:
+        pending: Optional[Dict[Any, int]] = getattr(self._local, "pending", None)
+        if not pending:
+            return
+        for key, inc in pending.items():
+            idx = hash(key) & self._mask
+            with self._locks[idx]:
+                stripe = self._stripes[idx]
+                stripe[key] = stripe.get(key, 0) + inc
+        pending.clear()
+        self._local.ops = 0
+
+    def restore_state(self, reads: Dict[Any, int], alt: Dict[Any, str]) -> None:
+        for key, cnt in reads.items():
+            idx = hash(key) & self._mask
+            with self._locks[idx]:
+                self._stripes[idx][key] = cnt
+        self.alt.update(alt)
+
+    def read_count(self, key: Any) -> int:
+        pending: Dict[Any, int] = getattr(self._local, "pending", None) or {}
+        return self._stripes[hash(key) & self._mask].get(key, 0) + pending.get(key, 0)
+
+    def read_counts(self) -> Dict[Any, int]:
+        merged: Dict[Any, int] = {}
+        for stripe in self._stripes:
+            merged.update(stripe)
+        pending: Dict[Any, int] = getattr(self._local, "pending", None) or {}
+        for key, inc in pending.items():
+            merged[key] = merged.get(key, 0) + inc
+        return merged
+
+    def _install_alternate(self, key: Any, primary: str) -> str:
+        candidate: Dict[Any, str] = {}
+        ensure_alternate(
+            key,
+            candidate,
+            self.nodes,
+            getattr(self.ch, "sorted_keys", []),
+            getattr(self.ch, "ring", {}),
+            self._h,
+            primary,
+        )
+        # setdefault is atomic, so racing threads all end up with the first installed value.
+        return self.alt.setdefault(key, candidate[key])
+
+    def get_node(self, key: Any, op: str = "read") -> str:
+        self._sync_membership_if_needed()
+
+        stats = self.stats
+        if op == "write":
+            node = self._primary_safe(key)
+            if stats is not None:
+                stats.write(node)
+            return node
+
+        cnt = self._increment(key)
+        alternate = self.alt.get(key)
+
+        if cnt < self.T and alternate is None:
+            node = self._primary_safe(key)
+            if stats is not None:
+                stats.read(node, False)
+            return node
+
+        primary = self._primary_safe(key)
+        if stats is not None:
+            stats.hot_keys += cnt == self.T
+            stats.alternates_computed += alternate is None
+        if alternate is None:
+            alternate = self._install_alternate(key, primary)
+
+        if check_guard_phase(cnt, self.T, self.W):
+            node = primary
+        else:
+            node = select_window_route(cnt, self.T, self.W, primary, alternate)
+        if stats is not None:
+            stats.read(node, node != primary)
+        return node
+
+
+__all__ = ["ConcurrentDHash"]
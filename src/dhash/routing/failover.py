@@ -0,0 +1,115 @@
+import time
+from bisect import bisect
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
+
+from ..hashing.core import fast_hash64, suffixed_key
+from .alternate import ensure_alternate
+
+
+class FailoverRouter:
+    # Sends requests for a node marked down to the next healthy candidate: the D-HASH alternate
+    # first, then ring successors. A down node is retried after `retry_after` seconds.
+    def __init__(
+        self,
+        router: Any,
+        retry_after: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if retry_after < 0:
+            raise ValueError("retry_after must not be negative.")
+        self.router = router
+        self.retry_after = float(retry_after)
+        self.clock = clock
+        self.failovers = 0
+        self._down: Dict[str, float] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        # Everything else (alt, ch, nodes, stats, ...) comes from the wrapped router.
+        if name == "router":
+            raise AttributeError(name)
+        return getattr(self.router, name)
+
+    def mark_down(self, node: str) -> None:
+        self._down[node] = self.clock()
+
+    def mark_up(self, node: str) -> None:
+        self._down.pop(node, None)
+
+    def is_down(self, node: str) -> bool:
+        since = self._down.get(node)
+        if since is None:
+            return False
+        if self.clock() - since >= self.retry_after:
+            # Let the next request probe the node; a failure marks it down again.
+            self._down.pop(node, None)
+            return False
+        return True
+
+    @property
+    def down_nodes(self) -> Set[str]:
+        return {n for n in list(self._down) if self.is_down(n)}
+
+    def _all_nodes(self, base: Any) -> List[str]:
+        nodes = getattr(self.router, "nodes", None) or getattr(base, "nodes", None)
+        if nodes:
+            return list(nodes)
+        return sorted(set(getattr(base, "ring", {}).values()))
+
+    def _candidates(self, key: Any) -> Iterator[str]:
+        router = self.router
+        base = getattr(router, "ch", router)
+        rk = getattr(base, "sorted_keys", None)
+        ring = getattr(base, "ring", None)
+        alt = getattr(router, "alt", None)
+        if isinstance(alt, dict):
+            primary = router._primary_safe(key)
+            alternate = alt.get(key)
+            if alternate is None:
+                # Work out the alternate without registering it, so read routing is unchanged.
+                scratch: Dict[Any, str] = {}
+                ensure_alternate(
+                    key, scratch, router.nodes, rk or [], ring or {}, router._h, primary
+                )
+                alternate = scratch[key]
+            yield alternate
+            yield primary
+        if rk and ring:
+            i = bisect(rk, fast_hash64(key))
+            for j in range(len(rk)):
+                yield ring[rk[(i + j) % len(rk)]]
+        # Routers without a ring fall back to rendezvous order over the remaining nodes.
+        yield from sorted(
+            self._all_nodes(base), key=lambda n: fast_hash64(suffixed_key(key, n)), reverse=True
+        )
+
+    def fallback(self, key: Any, failed: Optional[str] = None) -> str:
+        seen = {failed}
+        for node in self._candidates(key):
+            if node in seen:
+                continue
+            seen.add(node)
+            if not self.is_down(node):
+                self.failovers += 1
+                return node
+        raise RuntimeError(f"No healthy node left for key {key!r}.")
+
+    def get_node(self, key: Any, op: str = "read") -> str:
+        node: str = self.router.get_node(key, op)
+        if self._down and self.is_down(node):
+            return self.fallback(key, node)
+        return node
+
+    def get_write_nodes(self, key: Any) -> List[str]:
+        get_write_nodes = getattr(self.router, "get_write_nodes", None)
+        nodes: List[str] = (
+            get_write_nodes(key)
+            if get_write_nodes is not None
+            else [self.router.get_node(key, "write")]
+        )
+        if not self._down:
+            return nodes
+        up = [n for n in nodes if not self.is_down(n)]
+        return up or [self.fallback(key, nodes[0])]
+
+
+__all__ = ["FailoverRouter"]
@@ -0,0 +1,209 @@
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..config import (
+    DEFAULT_HOT_KEY_THRESHOLD,
+    DEFAULT_WINDOW_SIZE,
+    VIRTUAL_POINTS_PER_NODE,
+)
+from .alternate import ensure_alternate
+from .guard import check_guard_phase
+from .router import DHash
+from .window import select_window_route
+
+
+class _HotKey:
+    __slots__ = ("buckets", "head", "total", "seq")
+
+    def __init__(self, n_buckets: int, head: int, initial: int) -> None:
+        self.buckets: List[int] = [0] * n_buckets
+        self.buckets[head % n_buckets] = initial
+        self.head = head
+        self.total = initial
+        # Reads since the key became hot; drives the guard phase and window alternation.
+        self.seq = 0
+
+    def advance(self, bucket: int) -> None:
+        n = len(self.buckets)
+        steps = min(bucket - self.head, n)
+        for i in range(1, steps + 1):
+            idx = (self.head + i) % n
+            self.total -= self.buckets[idx]
+            self.buckets[idx] = 0
+        if bucket > self.head:
+            self.head = bucket
+
+
+class RateDHash(DHash):
+    __slots__ = (
+        "rate_window",
+        "n_buckets",
+        "exit_ratio",
+        "clock",
+        "_bucket_width",
+        "_hot",
+        "_cold",
+        "_copies",
+        "_swept_window",
+    )
+
+    def __init__(
+        self,
+        nodes: List[str],
+        hot_key_threshold: int = DEFAULT_HOT_KEY_THRESHOLD,
+        window_size: Optional[int] = DEFAULT_WINDOW_SIZE,
+        replicas: int = VIRTUAL_POINTS_PER_NODE,
+        ring: Optional[Any] = None,
+        *,
+        rate_window_seconds: float = 1.0,
+        buckets: int = 10,
+        exit_ratio: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__(nodes, hot_key_threshold, window_size, replicas, ring)
+        if rate_window_seconds <= 0:
+            raise ValueError("rate_window_seconds must be positive.")
+        if buckets < 1:
+            raise ValueError("buckets must be at least 1.")
+        self.rate_window: float = float(rate_window_seconds)
+        self.n_buckets: int = int(buckets)
+        self.exit_ratio: float = float(exit_ratio)
+        self.clock = clock
+        self._bucket_width: float = self.rate_window / self.n_buckets
+        self._hot: Dict[Any, _HotKey] = {}
+        # Cold keys: [window index, reads in that window, reads in the window before].
+        self._cold: Dict[Any, List[int]] = {}
+        self._swept_window = 0
+        # Alternates of keys that have cooled. Their node may still hold a copy, and a key that
+        # heats up again gets the same alternate, so writes keep reaching it.
+        self._copies: Dict[Any, str] = {}
+
+    def _cold_estimate(self, rec: List[int], now: float) -> float:
+        # Sliding-window approximation: weight the previous window by how much still overlaps.
+        elapsed = now / self.rate_window - rec[0]
+        return rec[1] + rec[2] * max(0.0, 1.0 - elapsed)
+
+    def _sweep(self, window: int) -> None:
+        self._swept_window = window
+        self._cold = {k: rec for k, rec in self._cold.items() if rec[0] >= window - 1}
+        bucket = int(window * self.n_buckets)
+        for key in [k for k, h in self._hot.items() if bucket - h.head >= self.n_buckets]:
+            del self._hot[key]
+            self._retire_alternate(key)
+
+    def _retire_alternate(self, key: Any) -> None:
+        alternate = self.alt.pop(key, None)
+        if alternate is not None:
+            self._copies[key] = alternate
+
+    def _record(self, key: Any, now: float) -> Tuple[float, Optional[int]]:
+        window = int(now / self.rate_window)
+        if window > self._swept_window + 1:
+            self._sweep(window)
+
+        hot = self._hot.get(key)
+        if hot is not None:
+            hot.advance(int(now / self._bucket_width))
+            hot.buckets[hot.head % self.n_buckets] += 1
+            hot.total += 1
+            if hot.total < self.T * self.exit_ratio:
+                del self._hot[key]
+                self._retire_alternate(key)
+                self._cold[key] = [window, hot.total, 0]
+                return float(hot.total), None
+            hot.seq += 1
+            return float(hot.total), hot.seq
+
+        rec = self._cold.get(key)
+        if rec is None or rec[0] < window - 1:
+            rec = [window, 0, 0]
+            self._cold[key] = rec
+        elif rec[0] < window:
+            rec[0], rec[1], rec[2] = window, 0, rec[1]
+        rec[1] += 1
+
+        estimate = self._cold_estimate(rec, now)
+        if estimate < self.T:
+            return estimate, None
+        del self._cold[key]
+        self._hot[key] = _HotKey(self.n_buckets, int(now / self._bucket_width), int(estimate))
+        return estimate, 0
+
+    def rate(self, key: Any) -> float:
+        now = self.clock()
+        hot = self._hot.get(key)
+        if hot is not None:
+            hot.advance(int(now / self._bucket_width))
+            return float(hot.total)
+        rec = self._cold.get(key)
+        if rec is None or rec[0] < int(now / self.rate_window) - 1:
+            return 0.0
+        return self._cold_estimate(rec, now)
+
+    def is_hot(self, key: Any) -> bool:
+        return key in self._hot
+
+    def get_write_nodes(self, key: Any) -> List[str]:
+        self._sync_membership_if_needed()
+        primary = self._primary_safe(key)
+        # A key stays hot until its rate falls below exit_ratio * T, so follow the read routing
+        # rather than comparing the rate with T. A cooled key still writes to its old alternate.
+        alternate = self.alt.get(key) or self._copies.get(key)
+        if alternate is None or alternate == primary:
+            return [primary]
+        return [primary, alternate]
+
+    def read_count(self, key: Any) -> int:
+        return int(self.rate(key))
+
+    def read_counts(self) -> Dict[Any, int]:
+        keys = list(self._cold) + list(self._hot)
+        return {k: int(self.rate(k)) for k in keys}
+
+    def restore_state(self, reads: Dict[Any, int], alt: Dict[Any, str]) -> None:
+        # Rates from before a restart are stale, so only the alternate choices carry over.
+        self.alt.update(alt)
+
+    def get_node(self, key: Any, op: str = "read") -> str:
+        self._sync_membership_if_needed()
+
+        stats = self.stats
+        if op == "write":
+            node = self._primary_safe(key)
+            if stats is not None:
+                stats.write(node)
+            return node
+
+        _rate, seq = self._record(key, self.clock())
+        if seq is None:
+            node = self._primary_safe(key)
+            if stats is not None:
+                stats.read(node, False)
+            return node
+
+        primary = self._primary_safe(key)
+        if stats is not None:
+            stats.hot_keys += seq == 0
+            stats.alternates_computed += key not in self.alt
+        ensure_alternate(
+            key,
+            self.alt,
+            self.nodes,
+            getattr(self.ch, "sorted_keys", []),
+            getattr(self.ch, "ring", {}),
+            self._h,
+            primary,
+        )
+
+        # Shift by T so the existing guard and window rules see reads since the key became hot.
+        cnt = self.T + seq
+        if check_guard_phase(cnt, self.T, self.W):
+            node = primary
+        else:
+            node = select_window_route(cnt, self.T, self.W, primary, self.alt[key])
+        if stats is not None:
+            stats.read(node, node != primary)
+        return node
+
+
+__all__ = ["RateDHash"]
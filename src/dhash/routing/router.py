@@ -1,4 +1,6 @@
+import heapq
 from bisect import bisect
+from operator import itemgetter
 from typing import Any, Dict, List, Optional, Tuple, cast
 
 from ..config import (
@@ -6,9 +8,10 @@ from ..config import (
     DEFAULT_WINDOW_SIZE,
     VIRTUAL_POINTS_PER_NODE,
 )
-from ..hashing.core import ConsistentHashing, fast_hash64
+from ..hashing.core import ConsistentHashing, fast_hash64, suffixed_key
 from .alternate import ensure_alternate
 from .guard import check_guard_phase
+from .stats import RoutingStats
 from .window import select_window_route
 
 
@@ -22,6 +25,8 @@ class DHash:
         "ch",
         "hot_key_threshold",
         "_ring_signature",
+        "_ring_version",
+        "stats",
     )
 
     def __init__(
@@ -30,7 +35,7 @@ class DHash:
         hot_key_threshold: int = DEFAULT_HOT_KEY_THRESHOLD,
         window_size: Optional[int] = DEFAULT_WINDOW_SIZE,
         replicas: int = VIRTUAL_POINTS_PER_NODE,
-        ring: Optional[ConsistentHashing] = None,
+        ring: Optional[Any] = None,
     ) -> None:
         if not nodes:
             raise ValueError("DHash requires at least one node.")
@@ -40,23 +45,31 @@ class DHash:
         self.W: int = max(1, resolved_window)
         self.reads: Dict[Any, int] = {}
         self.alt: Dict[Any, str] = {}
-        self.ch = ring if ring is not None else ConsistentHashing(nodes, replicas=replicas)
+        self.ch: Any = ring if ring is not None else ConsistentHashing(nodes, replicas=replicas)
         self.hot_key_threshold: int = self.T
+        self._ring_version: Optional[int] = getattr(self.ch, "version", None)
         self._ring_signature: Tuple[Tuple[int, ...], Tuple[str, ...]] = (
             self._compute_ring_signature()
         )
+        # Off by default; the hooks then cost one attribute check per call.
+        self.stats: Optional[RoutingStats] = None
 
     @staticmethod
     def _h(key: Any) -> int:
         return fast_hash64(key)
 
     def _compute_ring_signature(self) -> Tuple[Tuple[int, ...], Tuple[str, ...]]:
+        if hasattr(self.ch, "slot_table"):
+            ranges = self.ch.slot_ranges()
+            return tuple(r[0] for r in ranges), tuple(r[2] for r in ranges)
         rk = tuple(getattr(self.ch, "sorted_keys", []))
         ring = cast(Dict[int, str], getattr(self.ch, "ring", {}))
         owners = tuple(ring[k] for k in rk)
         return rk, owners
 
     def _current_ring_nodes(self) -> List[str]:
+        if hasattr(self.ch, "slot_table"):
+            return list(self.ch.nodes)
         ring = cast(Dict[int, str], getattr(self.ch, "ring", {}))
         ordered: List[str] = []
         seen = set()
@@ -67,18 +80,41 @@ class DHash:
                 ordered.append(node)
         return ordered or list(self.nodes)
 
+    def _ring_unchanged(self) -> bool:
+        # Bases that count their membership changes skip rebuilding the signature on every call.
+        # The point count also catches a ring edited without bumping its version.
+        version = getattr(self.ch, "version", None)
+        if version is not None:
+            rk = getattr(self.ch, "sorted_keys", None)
+            return bool(
+                version == self._ring_version
+                and (rk is None or len(rk) == len(self._ring_signature[0]))
+            )
+        return self._compute_ring_signature() == self._ring_signature
+
     def _sync_membership_if_needed(self) -> None:
+        if self._ring_unchanged():
+            return
+        self._ring_version = getattr(self.ch, "version", None)
         signature = self._compute_ring_signature()
         if signature == self._ring_signature:
             return
         self._ring_signature = signature
         self.nodes = self._current_ring_nodes()
         self.alt.clear()
+        if self.stats is not None:
+            self.stats.membership_changes += 1
 
     def refresh_membership(self, nodes: List[str]) -> None:
         self.nodes = list(nodes)
-        self.ch = ConsistentHashing(self.nodes, replicas=self.ch.replicas)
+        if hasattr(self.ch, "slot_table"):
+            self.ch.rebalance(self.nodes)
+        else:
+            self.ch = ConsistentHashing(self.nodes, replicas=self.ch.replicas)
         self.alt.clear()
+        if self.stats is not None:
+            self.stats.membership_changes += 1
+        self._ring_version = getattr(self.ch, "version", None)
         self._ring_signature = self._compute_ring_signature()
 
     def _primary_safe(self, key: Any) -> str:
@@ -90,31 +126,101 @@ class DHash:
             idx = bisect(rk, hk) % len(rk)
             return cast(str, ring[rk[idx]])
 
-        fallback_idx = self._h(f"{key}|p") % len(self.nodes)
+        if hasattr(self.ch, "slot_table"):
+            return cast(str, self.ch.get_node(key))
+
+        fallback_idx = self._h(suffixed_key(key, "p")) % len(self.nodes)
         return self.nodes[fallback_idx]
 
+    def restore_state(self, reads: Dict[Any, int], alt: Dict[Any, str]) -> None:
+        self.reads.update(reads)
+        self.alt.update(alt)
+
+    def read_count(self, key: Any) -> int:
+        return self.reads.get(key, 0)
+
+    def enable_stats(self) -> RoutingStats:
+        if self.stats is None:
+            self.stats = RoutingStats()
+        return self.stats
+
+    def stats_snapshot(self, top_n: int = 10) -> Dict[str, Any]:
+        if self.stats is None:
+            raise RuntimeError("Routing stats are disabled. Call enable_stats() first.")
+        counts = self.read_counts()
+        top = heapq.nlargest(top_n, counts.items(), key=itemgetter(1))
+        snapshot = self.stats.as_dict()
+        snapshot.update(
+            {
+                "T": self.T,
+                "W": self.W,
+                "nodes": list(self.nodes),
+                "tracked_keys": len(counts),
+                "keys_over_threshold": sum(1 for c in counts.values() if c >= self.T),
+                "alternates": len(self.alt),
+                "top_keys": [
+                    {
+                        "key": k,
+                        "reads": c,
+                        "primary": self._primary_safe(k),
+                        "alternate": self._known_alternate(k),
+                    }
+                    for k, c in top
+                ],
+            }
+        )
+        return snapshot
+
+    def read_counts(self) -> Dict[Any, int]:
+        return dict(self.reads)
+
+    def _known_alternate(self, key: Any) -> Optional[str]:
+        return self.alt.get(key)
+
+    def get_write_nodes(self, key: Any) -> List[str]:
+        self._sync_membership_if_needed()
+        primary = self._primary_safe(key)
+        # Keep the alternate fresh from the start of the guard phase, before reads move to it.
+        alternate = self._known_alternate(key)
+        if alternate is None or alternate == primary or self.read_count(key) < self.T:
+            return [primary]
+        return [primary, alternate]
+
     def get_node(self, key: Any, op: str = "read") -> str:
         self._sync_membership_if_needed()
 
+        stats = self.stats
         if op == "write":
-            return self._primary_safe(key)
+            node = self._primary_safe(key)
+            if stats is not None:
+                stats.write(node)
+            return node
 
         cnt = self.reads.get(key, 0) + 1
         self.reads[key] = cnt
 
         if cnt < self.T and key not in self.alt:
-            return self._primary_safe(key)
+            node = self._primary_safe(key)
+            if stats is not None:
+                stats.read(node, False)
+            return node
 
         rk = getattr(self.ch, "sorted_keys", [])
         ring = getattr(self.ch, "ring", {})
         primary = self._primary_safe(key)
 
+        if stats is not None:
+            stats.hot_keys += cnt == self.T
+            stats.alternates_computed += key not in self.alt
         ensure_alternate(key, self.alt, self.nodes, rk, ring, self._h, primary)
 
         if check_guard_phase(cnt, self.T, self.W):
-            return primary
-
-        return select_window_route(cnt, self.T, self.W, primary, self.alt[key])
+            node = primary
+        else:
+            node = select_window_route(cnt, self.T, self.W, primary, self.alt[key])
+        if stats is not None:
+            stats.read(node, node != primary)
+        return node
 
 
 __all__ = ["DHash"]
@@ -0,0 +1,250 @@
+import struct
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, cast
+
+from ..config import (
+    DEFAULT_HOT_KEY_THRESHOLD,
+    DEFAULT_WINDOW_SIZE,
+    VIRTUAL_POINTS_PER_NODE,
+)
+from ..hashing.core import fast_hash64, suffixed_key
+from .alternate import ensure_alternate
+from .guard import check_guard_phase
+from .router import DHash
+from .window import select_window_route
+
+if TYPE_CHECKING:
+    from multiprocessing import shared_memory
+
+_MAGIC = b"DHSK"
+_HEADER = struct.Struct("<4sIIIQ")
+_HEADER_SIZE = 32
+_COUNTER_MAX = 0xFFFFFFFF
+
+
+def _nodes_fingerprint(nodes: List[str]) -> int:
+    return fast_hash64(",".join(sorted(nodes)))
+
+
+class SharedHotKeyTable:
+    __slots__ = (
+        "name",
+        "nodes",
+        "depth",
+        "width",
+        "alt_slots",
+        "_shm",
+        "_counters",
+        "_tags",
+        "_alt",
+    )
+
+    def __init__(self, shm: "shared_memory.SharedMemory", nodes: List[str]) -> None:
+        buf = cast(memoryview, shm.buf)
+        magic, depth, width, alt_slots, fingerprint = _HEADER.unpack_from(buf, 0)
+        if magic != _MAGIC:
+            shm.close()
+            raise ValueError(f"Shared memory block {shm.name!r} is not a hot-key table.")
+        if fingerprint != _nodes_fingerprint(nodes):
+            shm.close()
+            raise ValueError(f"Hot-key table {shm.name!r} was created for a different node set.")
+
+        self.name: str = shm.name
+        self.nodes: List[str] = sorted(nodes)
+        self.depth: int = depth
+        self.width: int = width
+        self.alt_slots: int = alt_slots
+        self._shm = shm
+
+        offset = _HEADER_SIZE
+        counters_size = 4 * depth * width
+        tags_size = 4 * alt_slots
+        self._counters = buf[offset : offset + counters_size].cast("I")
+        offset += counters_size
+        self._tags = buf[offset : offset + tags_size].cast("I")
+        offset += tags_size
+        self._alt = buf[offset : offset + 2 * alt_slots].cast("H")
+
+    @staticmethod
+    def size_for(depth: int, width: int, alt_slots: int) -> int:
+        return _HEADER_SIZE + 4 * depth * width + 4 * alt_slots + 2 * alt_slots
+
+    @classmethod
+    def create(
+        cls,
+        nodes: List[str],
+        name: Optional[str] = None,
+        depth: int = 4,
+        width: int = 1 << 16,
+        alt_slots: int = 1 << 16,
+    ) -> "SharedHotKeyTable":
+        if not nodes:
+            raise ValueError("SharedHotKeyTable requires at least one node.")
+        if len(nodes) >= 0xFFFF:
+            raise ValueError("Too many nodes for a shared hot-key table.")
+        from multiprocessing import shared_memory
+
+        size = cls.size_for(depth, width, alt_slots)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        buf = cast(memoryview, shm.buf)
+        buf[:size] = bytes(size)
+        _HEADER.pack_into(buf, 0, _MAGIC, depth, width, alt_slots, _nodes_fingerprint(nodes))
+        return cls(shm, nodes)
+
+    @classmethod
+    def attach(cls, name: str, nodes: List[str]) -> "SharedHotKeyTable":
+        from multiprocessing import shared_memory
+
+        shm = shared_memory.SharedMemory(name=name, create=False)
+        try:
+            # Only the creator should unlink the block; attached processes just close it.
+            from multiprocessing import resource_tracker
+
+            resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+        except Exception:
+            pass
+        return cls(shm, nodes)
+
+    def _slots(self, key: Any) -> List[int]:
+        h = fast_hash64(key)
+        h1 = h & 0xFFFFFFFF
+        h2 = (h >> 32) | 1
+        width = self.width
+        return [row * width + (h1 + row * h2) % width for row in range(self.depth)]
+
+    def increment(self, key: Any) -> int:
+        counters = self._counters
+        est = _COUNTER_MAX
+        # Plain read-modify-write: concurrent updates may drop an increment, never add one. Hash
+        # collisions in the sketch can still make an estimate higher than the true count.
+        for idx in self._slots(key):
+            value = counters[idx]
+            if value < _COUNTER_MAX:
+                value += 1
+                counters[idx] = value
+            if value < est:
+                est = value
+        return est
+
+    def estimate(self, key: Any) -> int:
+        counters = self._counters
+        return min(counters[idx] for idx in self._slots(key))
+
+    def _alt_slot(self, key: Any) -> Tuple[int, int]:
+        h = fast_hash64(suffixed_key(key, "alt-slot"))
+        return h % self.alt_slots, (h >> 32) | 1
+
+    def get_alternate(self, key: Any) -> Optional[str]:
+        slot, tag = self._alt_slot(key)
+        if self._tags[slot] != tag:
+            return None
+        node_idx = self._alt[slot]
+        if node_idx == 0 or node_idx > len(self.nodes):
+            return None
+        return self.nodes[node_idx - 1]
+
+    def set_alternate(self, key: Any, node: str) -> None:
+        slot, tag = self._alt_slot(key)
+        # Write the node before the tag so a reader never pairs a new tag with an old node.
+        self._alt[slot] = self.nodes.index(node) + 1
+        self._tags[slot] = tag
+
+    def clear_alternates(self) -> None:
+        for i in range(self.alt_slots):
+            self._tags[i] = 0
+
+    def close(self) -> None:
+        self._counters.release()
+        self._tags.release()
+        self._alt.release()
+        self._shm.close()
+
+    def unlink(self) -> None:
+        self._shm.unlink()
+
+
+class SharedDHash(DHash):
+    __slots__ = ("table",)
+
+    def __init__(
+        self,
+        nodes: List[str],
+        table: SharedHotKeyTable,
+        hot_key_threshold: int = DEFAULT_HOT_KEY_THRESHOLD,
+        window_size: Optional[int] = DEFAULT_WINDOW_SIZE,
+        replicas: int = VIRTUAL_POINTS_PER_NODE,
+        ring: Optional[Any] = None,
+    ) -> None:
+        super().__init__(nodes, hot_key_threshold, window_size, replicas, ring)
+        self.table = table
+
+    def read_count(self, key: Any) -> int:
+        return self.table.estimate(key)
+
+    def read_counts(self) -> Dict[Any, int]:
+        # The sketch cannot list its keys, so this reports the keys this process has seen turn hot,
+        # with their host-wide estimates.
+        return {k: self.table.estimate(k) for k in list(self.alt)}
+
+    def _known_alternate(self, key: Any) -> Optional[str]:
+        cached = self.alt.get(key)
+        if cached is not None:
+            return cached
+        shared = self.table.get_alternate(key)
+        return shared if shared in self.nodes else None
+
+    def _alternate_for(self, key: Any, primary: str) -> str:
+        cached = self.alt.get(key)
+        if cached is not None:
+            return cached
+        shared = self.table.get_alternate(key)
+        if shared is not None and shared != primary and shared in self.nodes:
+            self.alt[key] = shared
+            return shared
+        ensure_alternate(
+            key,
+            self.alt,
+            self.nodes,
+            getattr(self.ch, "sorted_keys", []),
+            getattr(self.ch, "ring", {}),
+            self._h,
+            primary,
+        )
+        alternate = self.alt[key]
+        if alternate in self.table.nodes:
+            self.table.set_alternate(key, alternate)
+        return alternate
+
+    def get_node(self, key: Any, op: str = "read") -> str:
+        self._sync_membership_if_needed()
+
+        stats = self.stats
+        if op == "write":
+            node = self._primary_safe(key)
+            if stats is not None:
+                stats.write(node)
+            return node
+
+        cnt = self.table.increment(key)
+
+        if cnt < self.T and key not in self.alt:
+            node = self._primary_safe(key)
+            if stats is not None:
+                stats.read(node, False)
+            return node
+
+        primary = self._primary_safe(key)
+        if stats is not None:
+            stats.hot_keys += cnt == self.T
+            stats.alternates_computed += key not in self.alt
+        alternate = self._alternate_for(key, primary)
+
+        if check_guard_phase(cnt, self.T, self.W):
+            node = primary
+        else:
+            node = select_window_route(cnt, self.T, self.W, primary, alternate)
+        if stats is not None:
+            stats.read(node, node != primary)
+        return node
+
+
+__all__ = ["SharedDHash", "SharedHotKeyTable"]
@@ -0,0 +1,192 @@
+import mmap
+import os
+import struct
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..hashing.core import fast_hash64
+from .router import DHash
+
+_MAGIC = b"DHSN"
+_FORMAT_VERSION = 1
+# magic, format version, reserved, ring fingerprint, T, node count, entry count
+_HEADER = struct.Struct("<4sHHQIII")
+_NODE = struct.Struct("<H")
+# read count, alternate node index, key type, key length
+_ENTRY = struct.Struct("<IHBH")
+_NO_ALT = 0xFFFF
+_KEY_STR = 0
+_KEY_BYTES = 1
+_COUNT_MAX = 0xFFFFFFFF
+_KEY_MAX = 0xFFFF
+
+
+def ring_fingerprint(router: DHash) -> int:
+    ring_keys, owners = router._compute_ring_signature()
+    return fast_hash64(",".join(f"{k}:{n}" for k, n in zip(ring_keys, owners)))
+
+
+def _encode_key(key: Any) -> Optional[Tuple[int, bytes]]:
+    if isinstance(key, str):
+        raw = key.encode("utf-8", "surrogateescape")
+        kind = _KEY_STR
+    elif isinstance(key, bytes):
+        raw, kind = key, _KEY_BYTES
+    else:
+        return None
+    return (kind, raw) if len(raw) <= _KEY_MAX else None
+
+
+def save_snapshot(router: DHash, path: str, min_count: Optional[int] = None) -> int:
+    floor = max(1, router.T // 2) if min_count is None else max(1, int(min_count))
+    reads = router.read_counts()
+    alt = dict(router.alt)
+    nodes = list(router.nodes)
+    node_index = {n: i for i, n in enumerate(nodes)}
+
+    body: List[bytes] = []
+    for node in nodes:
+        raw = node.encode("utf-8")
+        body.append(_NODE.pack(len(raw)))
+        body.append(raw)
+
+    entries = 0
+    for key, cnt in reads.items():
+        if cnt < floor:
+            continue
+        encoded = _encode_key(key)
+        if encoded is None:
+            continue
+        kind, raw = encoded
+        alt_idx = node_index.get(alt.get(key, ""), _NO_ALT)
+        body.append(_ENTRY.pack(min(cnt, _COUNT_MAX), alt_idx, kind, len(raw)))
+        body.append(raw)
+        entries += 1
+
+    header = _HEADER.pack(
+        _MAGIC,
+        _FORMAT_VERSION,
+        0,
+        ring_fingerprint(router),
+        min(router.T, _COUNT_MAX),
+        len(nodes),
+        entries,
+    )
+    # Write to a temp file and rename, so readers never see a partial snapshot.
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(b"".join(body))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return entries
+
+
+def _parse(buf: memoryview, router: DHash) -> Tuple[Dict[Any, int], Dict[Any, str]]:
+    magic, version, _reserved, fingerprint, _t, n_nodes, n_entries = _HEADER.unpack_from(buf, 0)
+    if magic != _MAGIC:
+        raise ValueError("Not a D-HASH router snapshot.")
+    if version != _FORMAT_VERSION:
+        raise ValueError(f"Unsupported snapshot format version: {version}")
+
+    pos = _HEADER.size
+    nodes: List[str] = []
+    for _ in range(n_nodes):
+        (size,) = _NODE.unpack_from(buf, pos)
+        pos += _NODE.size
+        nodes.append(bytes(buf[pos : pos + size]).decode("utf-8"))
+        pos += size
+
+    # Alternates are only valid for the ring they were chosen on; counts stay valid either way.
+    same_ring = fingerprint == ring_fingerprint(router)
+    live_nodes = set(router.nodes)
+    reads: Dict[Any, int] = {}
+    alt: Dict[Any, str] = {}
+    for _ in range(n_entries):
+        cnt, alt_idx, kind, size = _ENTRY.unpack_from(buf, pos)
+        pos += _ENTRY.size
+        raw = bytes(buf[pos : pos + size])
+        if len(raw) != size:
+            raise ValueError("Snapshot is truncated.")
+        pos += size
+        key: Any = raw.decode("utf-8", "surrogateescape") if kind == _KEY_STR else raw
+        reads[key] = cnt
+        if not same_ring or alt_idx >= len(nodes):
+            continue
+        node = nodes[alt_idx]
+        if node in live_nodes and node != router._primary_safe(key):
+            alt[key] = node
+    return reads, alt
+
+
+def load_snapshot(router: DHash, path: str) -> int:
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < _HEADER.size:
+            raise ValueError("Snapshot is truncated.")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            buf = memoryview(mm)
+            try:
+                reads, alt = _parse(buf, router)
+            except struct.error as e:
+                raise ValueError("Snapshot is truncated.") from e
+            finally:
+                buf.release()
+    router.restore_state(reads, alt)
+    return len(reads)
+
+
+class SnapshotWriter:
+    def __init__(
+        self,
+        router: DHash,
+        path: str,
+        interval_seconds: float = 30.0,
+        min_count: Optional[int] = None,
+    ) -> None:
+        if interval_seconds <= 0:
+            raise ValueError("interval_seconds must be positive.")
+        self.router = router
+        self.path = path
+        self.interval_seconds = float(interval_seconds)
+        self.min_count = min_count
+        self.saves = 0
+        self.last_error: Optional[BaseException] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def save(self) -> int:
+        try:
+            entries = save_snapshot(self.router, self.path, self.min_count)
+        except OSError as e:
+            self.last_error = e
+            return 0
+        self.saves += 1
+        return entries
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            self.save()
+
+    def start(self) -> "SnapshotWriter":
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="dhash-snapshot", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self.save()
+
+    def __enter__(self) -> "SnapshotWriter":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+
+__all__ = ["SnapshotWriter", "load_snapshot", "ring_fingerprint", "save_snapshot"]
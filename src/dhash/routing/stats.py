@@ -0,0 +1,53 @@
+from typing import Any, Dict
+
+
+class RoutingStats:
+    # Plain counters; under free threading, concurrent increments may undercount slightly.
+    __slots__ = (
+        "reads",
+        "writes",
+        "primary_reads",
+        "alternate_reads",
+        "hot_keys",
+        "alternates_computed",
+        "membership_changes",
+        "node_routes",
+    )
+
+    def __init__(self) -> None:
+        self.reads = 0
+        self.writes = 0
+        self.primary_reads = 0
+        self.alternate_reads = 0
+        # Keys whose count reached T while stats were on.
+        self.hot_keys = 0
+        self.alternates_computed = 0
+        self.membership_changes = 0
+        self.node_routes: Dict[str, int] = {}
+
+    def read(self, node: str, alternate: bool) -> None:
+        self.reads += 1
+        if alternate:
+            self.alternate_reads += 1
+        else:
+            self.primary_reads += 1
+        self.node_routes[node] = self.node_routes.get(node, 0) + 1
+
+    def write(self, node: str) -> None:
+        self.writes += 1
+        self.node_routes[node] = self.node_routes.get(node, 0) + 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "reads": self.reads,
+            "writes": self.writes,
+            "primary_reads": self.primary_reads,
+            "alternate_reads": self.alternate_reads,
+            "hot_keys": self.hot_keys,
+            "alternates_computed": self.alternates_computed,
+            "membership_changes": self.membership_changes,
+            "node_routes": dict(self.node_routes),
+        }
+
+
+__all__ = ["RoutingStats"]
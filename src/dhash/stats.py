@@ -1,4 +1,8 @@
-from typing import List, Tuple
+import math
+from typing import TYPE_CHECKING, Any, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
 
 
 def weighted_percentile(samples: List[Tuple[float, int]], q: float) -> float:
@@ -26,3 +30,148 @@ def weighted_percentile(samples: List[Tuple[float, int]], q: float) -> float:
         cum = next_cum
 
     return samples_sorted[-1][0]
+
+
+def _sorted_percentiles(
+    values: "np.ndarray", weights: "np.ndarray", qs: Sequence[float]
+) -> List[float]:
+    import numpy as np
+
+    # Same rule as weighted_percentile, with one cumsum and a searchsorted per batch of quantiles.
+    n = values.size
+    if n == 0:
+        return [0.0] * len(qs)
+    cum = np.cumsum(weights)
+    total = float(cum[-1])
+    if total <= 0:
+        return [0.0] * len(qs)
+    cum_before = np.concatenate(([0.0], cum[:-1]))
+    targets = np.asarray(qs, dtype=np.float64) * total
+    idx = np.searchsorted(cum, targets, side="left")
+
+    out: List[float] = []
+    for target, i in zip(targets.tolist(), idx.tolist()):
+        if i >= n:
+            out.append(float(values[-1]))
+            continue
+        v = float(values[i])
+        w = float(weights[i])
+        if w == 0:
+            out.append(v)
+            continue
+        prev_v = float(values[i - 1]) if i > 0 else float(values[0])
+        out.append(prev_v + (v - prev_v) * ((target - float(cum_before[i])) / w))
+    return out
+
+
+def _as_arrays(samples: Any) -> Tuple["np.ndarray", "np.ndarray"]:
+    import numpy as np
+
+    arr = np.asarray(samples, dtype=np.float64)
+    if arr.size == 0:
+        return np.empty(0), np.empty(0)
+    order = np.argsort(arr[:, 0], kind="stable")
+    return arr[order, 0], arr[order, 1]
+
+
+def weighted_percentiles(samples: Any, qs: Sequence[float]) -> List[float]:
+    values, weights = _as_arrays(samples)
+    return _sorted_percentiles(values, weights, qs)
+
+
+class QuantileSketch:
+    # Merging t-digest: samples stay exact until there are more than `compression` of them,
+    # then adjacent ones merge into centroids sized by the k1 scale (small near the tails).
+    def __init__(self, compression: int = 200, buffer_size: Optional[int] = None) -> None:
+        if compression < 10:
+            raise ValueError("compression must be at least 10.")
+        self.compression = int(compression)
+        self.buffer_size = int(buffer_size or 5 * compression)
+        self._values: List[float] = []
+        self._weights: List[float] = []
+        self._means: Optional["np.ndarray"] = None
+        self._counts: Optional["np.ndarray"] = None
+        self._merged = False
+        self._min = math.inf
+        self._max = -math.inf
+
+    def add(self, value: float, weight: float = 1) -> None:
+        if weight < 0:
+            raise ValueError("weight must not be negative.")
+        value = float(value)
+        self._values.append(value)
+        self._weights.append(float(weight))
+        self._min = min(self._min, value)
+        self._max = max(self._max, value)
+        if len(self._values) >= self.buffer_size:
+            self._compress()
+
+    def update(self, samples: Sequence[Tuple[float, float]]) -> None:
+        for value, weight in samples:
+            self.add(value, weight)
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        means, counts = other._centroids()
+        self._values.extend(means.tolist())
+        self._weights.extend(counts.tolist())
+        self._merged = self._merged or other._merged
+        self._min = min(self._min, other._min)
+        self._max = max(self._max, other._max)
+        self._compress()
+        return self
+
+    @property
+    def total_weight(self) -> float:
+        _means, counts = self._centroids()
+        return float(counts.sum())
+
+    def _centroids(self) -> Tuple["np.ndarray", "np.ndarray"]:
+        if self._values or self._means is None:
+            self._compress()
+        assert self._means is not None and self._counts is not None
+        return self._means, self._counts
+
+    def _compress(self) -> None:
+        import numpy as np
+
+        values = np.asarray(self._values, dtype=np.float64)
+        weights = np.asarray(self._weights, dtype=np.float64)
+        if self._means is not None and self._counts is not None:
+            values = np.concatenate((self._means, values))
+            weights = np.concatenate((self._counts, weights))
+        self._values, self._weights = [], []
+
+        order = np.argsort(values, kind="stable")
+        values, weights = values[order], weights[order]
+        if values.size > self.compression:
+            keep = weights > 0
+            values, weights = values[keep], weights[keep]
+        if values.size > self.compression:
+            cum = np.cumsum(weights)
+            q_mid = (cum - weights / 2) / cum[-1]
+            k = np.floor(self.compression / math.pi * np.arcsin(2 * q_mid - 1))
+            starts = np.concatenate(([0], np.flatnonzero(np.diff(k)) + 1))
+            counts = np.add.reduceat(weights, starts)
+            values = np.add.reduceat(values * weights, starts) / counts
+            weights = counts
+            self._merged = True
+        self._means, self._counts = values, weights
+
+    def quantiles(self, qs: Sequence[float]) -> List[float]:
+        import numpy as np
+
+        means, counts = self._centroids()
+        if not self._merged:
+            return _sorted_percentiles(means, counts, qs)
+        # Once samples are merged, interpolate between centroid centres, pinned to the extremes.
+        cum = np.cumsum(counts)
+        centres = np.concatenate(([0.0], cum - counts / 2, [cum[-1]]))
+        points = np.concatenate(([self._min], means, [self._max]))
+        targets = np.asarray(qs, dtype=np.float64) * cum[-1]
+        return [float(v) for v in np.interp(targets, centres, points)]
+
+    def quantile(self, q: float) -> float:
+        return self.quantiles([q])[0]
+
+
+__all__ = ["QuantileSketch", "weighted_percentile", "weighted_percentiles"]
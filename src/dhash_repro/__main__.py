@@ -1,36 +1,449 @@
+import argparse
 import logging
-import os
+import sys
+from typing import Any, Dict, List, Optional
 
-from dhash_repro.experiment import run_experiments
+from dhash_repro.config.settings import (
+    FAULT_SCENARIOS,
+    MODES,
+    REPLICATION_MODES,
+    VALUE_SIZE_DISTRIBUTIONS,
+    ExperimentSettings,
+    apply_overrides,
+    load_settings_file,
+    settings_from_env,
+)
+from dhash_repro.persistence.writer import OUTPUT_FORMATS
+from dhash_repro.workloads.dynamic import WORKLOAD_KINDS
 
 logger = logging.getLogger(__name__)
 
+_COMMANDS = ("run", "bench-threads", "bench-routers", "analyze-load", "proxy", "bench-proxy")
 
-def _get_mode() -> str:
-    return os.getenv("DHASH_MODE", "all").strip().lower()
+_ROUTER_NAMES: Dict[str, str] = {
+    "ch": "Consistent Hashing",
+    "wch": "Weighted CH",
+    "rendezvous": "Rendezvous",
+    "cluster": "Redis Cluster",
+    "dhash-slots": "D-HASH Slots",
+    "dhash": "D-HASH",
+    "dhash-auto": "D-HASH Auto",
+    "dhash-rate": "D-HASH Rate",
+}
 
 
-def _get_alpha() -> float:
-    return float(os.getenv("DHASH_ALPHA", "1.5"))
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m dhash_repro",
+        description="Run the D-HASH Redis benchmark experiments.",
+    )
+    sub = parser.add_subparsers(dest="command")
+
+    run = sub.add_parser("run", help="run experiment stages (default command)")
+    run.add_argument("--config", help="TOML or JSON file with experiment settings")
+    run.add_argument("--mode", choices=MODES)
+    run.add_argument("--alpha", type=float, help="Zipf alpha for pipeline and ablation stages")
+    run.add_argument("--repeats", type=int)
+    run.add_argument("--dataset")
+    run.add_argument("--nodes", help="comma-separated Redis nodes, host or host:port")
+    run.add_argument("--pipeline-sweep", help="comma-separated pipeline sizes")
+    run.add_argument("--zipf-alphas", help="comma-separated alphas for the zipf stage")
+    run.add_argument("--thresholds", dest="ablation_thresholds", help="comma-separated T values")
+    run.add_argument("--workload-size", type=int, help="requests per cell (default: trace size)")
+    run.add_argument(
+        "--workload",
+        choices=WORKLOAD_KINDS,
+        help="request stream: stationary zipf, shifting hotspot, flash crowd or diurnal",
+    )
+    run.add_argument(
+        "--workload-params",
+        help="comma-separated name=value pairs, e.g. shift_every=50000 or flash_rate=0.3",
+    )
+    run.add_argument("--value-bytes", type=int, help="value size, or the mean of --value-sizes")
+    run.add_argument(
+        "--value-sizes",
+        choices=VALUE_SIZE_DISTRIBUTIONS,
+        help="per-key value sizes: fixed, a distribution, or the dataset's size field (trace)",
+    )
+    run.add_argument("-B", dest="B", type=float, help="override the dataset pipeline size")
+    run.add_argument("-T", dest="T", type=float, help="override the dataset threshold")
+    run.add_argument("-W", dest="W", type=float, help="override the dataset window size")
+    run.add_argument("--rho", type=float, help="override the dataset T/B ratio")
+    run.add_argument(
+        "--near-cache-size", type=int, help="client-side cache entries for hot keys (0: off)"
+    )
+    run.add_argument("--near-cache-ttl", type=float, help="near-cache entry TTL in seconds")
+    run.add_argument(
+        "--write-fraction",
+        type=float,
+        help="share of requests that are writes (default: write then read every key)",
+    )
+    run.add_argument(
+        "--write-replication",
+        choices=REPLICATION_MODES,
+        help="copy writes of hot keys to their alternate: off, sync or async",
+    )
+    run.add_argument(
+        "--timeseries-interval",
+        type=float,
+        help="seconds per slice of the per-cell time-series export (0: off)",
+    )
+    run.add_argument(
+        "--fault-scenario",
+        choices=FAULT_SCENARIOS,
+        help="inject a fault on one node during each cell: slow, down or recover",
+    )
+    run.add_argument("--fault-node", help="node the fault hits (default: the last node)")
+    run.add_argument(
+        "--fault-params",
+        help="comma-separated name=value pairs, e.g. delay_ms=50 or down_at_s=2,up_at_s=5",
+    )
+    run.add_argument("--concurrency", type=int)
+    run.add_argument("--output-format", choices=sorted(OUTPUT_FORMATS))
+    run.add_argument("--output-dir")
+    run.add_argument(
+        "--no-reuse-preload",
+        dest="reuse_preload",
+        action="store_false",
+        default=None,
+        help="flush and fully preload before every cell",
+    )
+    run.add_argument(
+        "--memory-stats",
+        action="store_true",
+        default=None,
+        help="flush before every cell and record Redis memory per cell (needs --concurrency 1)",
+    )
+    run.add_argument(
+        "--routing-stats",
+        action="store_true",
+        default=None,
+        help="count D-HASH routing decisions and log a summary per cell",
+    )
+    run.add_argument(
+        "--dry-run", action="store_true", help="print the cell plan and estimated op count"
+    )
+
+    threads = sub.add_parser(
+        "bench-threads", help="measure get_node throughput of DHash routers across threads"
+    )
+    threads.add_argument("--threads", default="1,2,4,8,16,32", help="comma-separated counts")
+    threads.add_argument("--ops", type=int, default=50_000, help="reads per thread")
+    threads.add_argument("--keys", type=int, default=10_000, help="distinct keys")
+    threads.add_argument("--alpha", type=float, default=1.3)
+    threads.add_argument("--stripes", type=int, default=64)
+    threads.add_argument("--flush-every", type=int, default=0)
+    threads.add_argument("-T", dest="T", type=int, default=300)
+    threads.add_argument("-W", dest="W", type=int, default=200)
 
+    routers = sub.add_parser(
+        "bench-routers", help="measure get_node cost of every router without Redis"
+    )
+    routers.add_argument("--routers", help="comma-separated router classes (default: all)")
+    routers.add_argument("--node-counts", default="4,16,64", help="comma-separated node counts")
+    routers.add_argument("--vnodes", help="comma-separated virtual nodes per node")
+    routers.add_argument("--key-types", default="str,bytes,int", help="str, bytes and/or int")
+    routers.add_argument("--alphas", default="0,1.1", help="Zipf alphas; 0 is uniform")
+    routers.add_argument("--ops", type=int, default=20_000, help="get_node calls per case")
+    routers.add_argument("--keys", type=int, default=10_000, help="distinct keys")
+    routers.add_argument("--repeat", type=int, default=5, help="timed rounds; the best is kept")
+    routers.add_argument("--output", help="write results as JSON to this file")
+    routers.add_argument("--baseline", help="JSON results to compare against")
+    routers.add_argument(
+        "--tolerance", type=float, default=0.25, help="allowed ns/op slowdown over the baseline"
+    )
+
+    analyze = sub.add_parser(
+        "analyze-load", help="compute node balance for router settings offline, without Redis"
+    )
+    analyze.add_argument("--router", choices=sorted(_ROUTER_NAMES), default="dhash")
+    analyze.add_argument("--alphas", default="1.1,1.3,1.5", help="comma-separated Zipf alphas")
+    analyze.add_argument("--thresholds", default="300", help="comma-separated T values")
+    analyze.add_argument("--windows", default="200", help="comma-separated W values")
+    analyze.add_argument("--node-counts", default="5", help="comma-separated node counts")
+    analyze.add_argument("--keys", type=int, default=10_000, help="distinct keys")
+    analyze.add_argument("--ops", type=int, default=100_000, help="requests per point")
+    analyze.add_argument("--processes", type=int, help="worker processes (default: CPU count)")
+
+    proxy = sub.add_parser("proxy", help="run a RESP proxy that routes keys to the Redis nodes")
+    proxy.add_argument("--listen", default="0.0.0.0:7000", help="host:port to accept clients on")
+    proxy.add_argument("--pool-size", type=int, default=2, help="upstream connections per node")
+    proxy.add_argument("--snapshot", help="D-HASH hot-key snapshot to restore and keep updated")
+    proxy.add_argument(
+        "--snapshot-interval", type=float, default=30.0, help="seconds between snapshots"
+    )
+    proxy.add_argument(
+        "--metrics-port", type=int, help="serve D-HASH routing stats for Prometheus on this port"
+    )
+    _add_router_args(proxy)
+
+    bench_proxy = sub.add_parser("bench-proxy", help="compare a running proxy to direct access")
+    bench_proxy.add_argument("--proxy", default="127.0.0.1:7000", help="proxy host:port")
+    bench_proxy.add_argument("--ops", type=int, default=100_000)
+    bench_proxy.add_argument("--keys", type=int, default=10_000)
+    bench_proxy.add_argument("--alpha", type=float, default=1.3)
+    bench_proxy.add_argument("--pipeline", type=int, default=200)
+    _add_router_args(bench_proxy)
+    return parser
+
+
+def _add_router_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--nodes", help="comma-separated Redis nodes, host or host:port")
+    parser.add_argument("--router", choices=sorted(_ROUTER_NAMES), default="dhash")
+    parser.add_argument("-T", dest="T", type=int, default=300)
+    parser.add_argument("-W", dest="W", type=int, default=200)
+
+
+def _router_factory(args: argparse.Namespace) -> Any:
+    from dhash_repro.experiment import build_router
+
+    nodes = settings_from_env().nodes
+    if args.nodes:
+        nodes = [n.strip() for n in args.nodes.split(",") if n.strip()]
+    mode_name = _ROUTER_NAMES[args.router]
+    return nodes, lambda: build_router(mode_name, nodes, args.W, {"T": args.T, "W": args.W})
+
+
+def _run_proxy(args: argparse.Namespace) -> None:
+    import asyncio
+    import os
+
+    from dhash.routing import DHash, SnapshotWriter, load_snapshot
+    from dhash_repro.clients.redis_client import split_node_address
+    from dhash_repro.proxy import RoutingProxy
+
+    nodes, factory = _router_factory(args)
+    host, port = split_node_address(args.listen)
+    router = factory()
+    proxy = RoutingProxy(
+        router, {n: split_node_address(n) for n in nodes}, pool_size=args.pool_size
+    )
 
-def _get_repeats() -> int:
-    return int(os.getenv("DHASH_REPEATS", "1"))
+    writer = None
+    if args.snapshot and isinstance(router, DHash):
+        if os.path.exists(args.snapshot):
+            restored = load_snapshot(router, args.snapshot)
+            logger.info("[Proxy] Restored %d hot keys from %s.", restored, args.snapshot)
+        writer = SnapshotWriter(router, args.snapshot, args.snapshot_interval).start()
 
+    metrics = None
+    if args.metrics_port is not None and isinstance(router, DHash):
+        from dhash_repro.monitoring import MetricsServer
 
-def main() -> None:
+        metrics = MetricsServer(router, port=args.metrics_port).start()
+        logger.info("[Proxy] Serving routing stats on :%d/metrics.", args.metrics_port)
+
+    async def _serve() -> None:
+        await proxy.start(host, port)
+        try:
+            await proxy.serve_forever()
+        finally:
+            await proxy.close()
+
+    try:
+        asyncio.run(_serve())
+    finally:
+        if writer is not None:
+            writer.stop()
+        if metrics is not None:
+            metrics.stop()
+
+
+def _bench_proxy(args: argparse.Namespace) -> None:
+    import json
+
+    from dhash_repro.config.defaults import SEED, reset_np_rng
+    from dhash_repro.proxy.bench import bench_proxy_vs_direct
+    from dhash_repro.workloads.zipf import generate_zipf_workload
+
+    _nodes, factory = _router_factory(args)
+    reset_np_rng(SEED)
+    ranked = [f"key-{i}" for i in range(args.keys)]
+    keys = generate_zipf_workload(ranked, size=args.ops, alpha=args.alpha)
+    result = bench_proxy_vs_direct(keys, factory, args.proxy, pipeline_size=args.pipeline)
+    print(json.dumps(result))
+
+
+def _bench_threads(args: argparse.Namespace) -> None:
+    import json
+
+    from dhash import ConcurrentDHash, DHash
+    from dhash_repro.benchmark.concurrency import bench_router_threads
+    from dhash_repro.config.defaults import NODES, SEED, reset_np_rng
+    from dhash_repro.workloads.zipf import generate_zipf_workload
+
+    reset_np_rng(SEED)
+    ranked = [f"key-{i}" for i in range(args.keys)]
+    keys = generate_zipf_workload(ranked, size=max(args.ops, args.keys), alpha=args.alpha)
+    counts = [int(t) for t in args.threads.split(",") if t.strip()]
+
+    factories: Dict[str, Any] = {
+        "DHash": lambda: DHash(NODES, hot_key_threshold=args.T, window_size=args.W),
+        "ConcurrentDHash": lambda: ConcurrentDHash(
+            NODES,
+            hot_key_threshold=args.T,
+            window_size=args.W,
+            stripes=args.stripes,
+            flush_every=args.flush_every,
+        ),
+    }
+    for factory in factories.values():
+        for row in bench_router_threads(factory, keys, counts, ops_per_thread=args.ops):
+            print(json.dumps(row))
+
+
+def _csv(raw: str) -> List[str]:
+    return [part.strip() for part in raw.split(",") if part.strip()]
+
+
+def _bench_routers(args: argparse.Namespace) -> None:
+    import json
+
+    from dhash_repro.benchmark.micro import (
+        DEFAULT_VNODES,
+        compare_to_baseline,
+        load_results,
+        run_suite,
+        write_results,
+    )
+
+    rows = run_suite(
+        routers=_csv(args.routers) if args.routers else None,
+        node_counts=[int(n) for n in _csv(args.node_counts)],
+        vnodes=[int(v) for v in _csv(args.vnodes)] if args.vnodes else DEFAULT_VNODES,
+        key_types=_csv(args.key_types),
+        alphas=[float(a) for a in _csv(args.alphas)],
+        ops=args.ops,
+        n_keys=args.keys,
+        repeat=args.repeat,
+    )
+    for row in rows:
+        print(json.dumps(row))
+    if args.output:
+        write_results(args.output, rows)
+    if args.baseline:
+        regressions = compare_to_baseline(rows, load_results(args.baseline), args.tolerance)
+        for r in regressions:
+            logger.warning(
+                "[Regression] %s: %.0f -> %.0f ns/op (x%.2f)",
+                r["case"],
+                r["baseline_ns_per_op"],
+                r["ns_per_op"],
+                r["ratio"],
+            )
+        if regressions:
+            raise SystemExit(1)
+
+
+def _analyze_load(args: argparse.Namespace) -> None:
+    import json
+
+    from dhash_repro.analysis import sweep_load
+
+    rows = sweep_load(
+        alphas=[float(a) for a in _csv(args.alphas)],
+        thresholds=[int(t) for t in _csv(args.thresholds)],
+        windows=[int(w) for w in _csv(args.windows)],
+        node_counts=[int(n) for n in _csv(args.node_counts)],
+        n_keys=args.keys,
+        size=args.ops,
+        mode=_ROUTER_NAMES[args.router],
+        processes=args.processes,
+    )
+    for row in rows:
+        print(json.dumps(row))
+
+
+def resolve_settings(args: argparse.Namespace) -> ExperimentSettings:
+    settings = settings_from_env()
+    if args.config:
+        settings = apply_overrides(settings, load_settings_file(args.config))
+
+    cli: Dict[str, Any] = {
+        name: getattr(args, name)
+        for name in (
+            "mode",
+            "alpha",
+            "repeats",
+            "dataset",
+            "workload",
+            "workload_params",
+            "nodes",
+            "pipeline_sweep",
+            "zipf_alphas",
+            "ablation_thresholds",
+            "value_bytes",
+            "value_sizes",
+            "near_cache_size",
+            "near_cache_ttl",
+            "write_fraction",
+            "write_replication",
+            "timeseries_interval",
+            "fault_scenario",
+            "fault_node",
+            "fault_params",
+            "concurrency",
+            "reuse_preload",
+            "memory_stats",
+            "routing_stats",
+            "output_format",
+            "output_dir",
+        )
+        if getattr(args, name) is not None
+    }
+    if args.workload_size is not None:
+        cli["workload_size"] = args.workload_size
+    dataset_params = {k: getattr(args, k) for k in ("B", "T", "W", "rho")}
+    dataset_params = {k: v for k, v in dataset_params.items() if v is not None}
+    if dataset_params:
+        cli["dataset_params"] = dataset_params
+
+    return apply_overrides(settings, cli).validate()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
     logging.basicConfig(
         level=logging.INFO,
         format="%(asctime)s [%(levelname)s] %(message)s",
         datefmt="%H:%M:%S",
     )
 
-    mode = _get_mode()
-    alpha = _get_alpha()
-    repeats = _get_repeats()
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv or argv[0] not in _COMMANDS + ("-h", "--help"):
+        argv.insert(0, "run")
+    args = build_parser().parse_args(argv)
 
-    logger.info("Starting D-HASH experiments (mode=%s, alpha=%s, repeats=%s)", mode, alpha, repeats)
-    run_experiments(mode=mode, alpha=alpha, repeats=repeats)
+    if args.command == "bench-threads":
+        _bench_threads(args)
+        return
+    if args.command == "bench-routers":
+        _bench_routers(args)
+        return
+    if args.command == "analyze-load":
+        _analyze_load(args)
+        return
+    if args.command == "proxy":
+        _run_proxy(args)
+        return
+    if args.command == "bench-proxy":
+        _bench_proxy(args)
+        return
+
+    from dhash_repro.experiment import describe_plan, run_experiments
+
+    settings = resolve_settings(args)
+    if args.dry_run:
+        print(describe_plan(settings))
+        return
+
+    logger.info(
+        "Starting D-HASH experiments (mode=%s, alpha=%s, repeats=%s, concurrency=%s)",
+        settings.mode,
+        settings.alpha,
+        settings.repeats,
+        settings.concurrency,
+    )
+    run_experiments(settings)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,3 @@
+from .load import alternate_reads, analyze_load, gini, sweep_load
+
+__all__ = ["alternate_reads", "analyze_load", "gini", "sweep_load"]
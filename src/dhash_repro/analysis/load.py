@@ -0,0 +1,188 @@
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from dhash import DHash, fast_hash64
+from dhash.routing.alternate import ensure_alternate
+
+from ..config.defaults import SEED, reset_np_rng
+from ..workloads.keys import encode_keys
+from ..workloads.zipf import generate_zipf_indices
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def gini(loads: Union[Sequence[float], "np.ndarray"]) -> float:
+    import numpy as np
+
+    x = np.sort(np.asarray(loads, dtype=np.float64))
+    n = len(x)
+    total = x.sum()
+    if n == 0 or total <= 0:
+        return 0.0
+    ranks = np.arange(1, n + 1, dtype=np.float64)
+    return float(2.0 * (ranks * x).sum() / (n * total) - (n + 1) / n)
+
+
+def alternate_reads(counts: "np.ndarray", threshold: int, window: int) -> "np.ndarray":
+    import numpy as np
+
+    # Reads T .. T+W-1 are the guard phase; after that, windows of W alternate, starting with
+    # the alternate. This matches check_guard_phase and select_window_route for a static T and W.
+    split = np.maximum(np.asarray(counts, dtype=np.int64) - (threshold + window) + 1, 0)
+    full, rem = np.divmod(split, 2 * window)
+    return full * window + np.minimum(rem, window)
+
+
+def _ring_owners(base: Any, keys: Sequence[Any]) -> List[str]:
+    import numpy as np
+
+    if hasattr(base, "slot_table"):
+        from dhash.hashing.slots import key_slots
+
+        table = base.slot_table
+        return [table[s] for s in key_slots(keys).tolist()]
+    sorted_keys = getattr(base, "sorted_keys", None)
+    ring = getattr(base, "ring", None)
+    if sorted_keys and ring:
+        points = np.asarray(sorted_keys, dtype=np.uint64)
+        hashes = np.fromiter((fast_hash64(k) for k in keys), dtype=np.uint64, count=len(keys))
+        # side="right" matches bisect() in the routers.
+        idx = np.searchsorted(points, hashes, side="right") % len(points)
+        return [ring[sorted_keys[i]] for i in idx.tolist()]
+    return [base.get_node(k) for k in keys]
+
+
+def _contributions(
+    router: Any, ids: "np.ndarray", keys: Sequence[Any]
+) -> Tuple[List[Tuple[int, str, int]], int, str]:
+    import numpy as np
+
+    counts = np.bincount(ids, minlength=len(keys))
+    used = np.flatnonzero(counts)
+    used_keys = [keys[i] for i in used.tolist()]
+
+    if type(router) is DHash:
+        primaries = _ring_owners(router.ch, used_keys)
+        alt_counts = alternate_reads(counts[used], router.T, router.W)
+        rows: List[Tuple[int, str, int]] = []
+        alt_total = 0
+        rk = getattr(router.ch, "sorted_keys", [])
+        ring = getattr(router.ch, "ring", {})
+        for i, key, primary, n, n_alt in zip(
+            used.tolist(), used_keys, primaries, counts[used].tolist(), alt_counts.tolist()
+        ):
+            # The router picks an alternate at the T-th read, before any read goes to it.
+            if n >= router.T:
+                ensure_alternate(key, router.alt, router.nodes, rk, ring, router._h, primary)
+            if n_alt:
+                alternate = router.alt[key]
+                rows.append((i, alternate, n_alt))
+                alt_total += n_alt if alternate != primary else 0
+            rows.append((i, primary, n - n_alt))
+        return rows, alt_total, "closed-form"
+
+    if isinstance(router, DHash):
+        # Adaptive and rate-based routers depend on request order, so replay the workload.
+        per_key: Counter[Tuple[int, str]] = Counter()
+        alt_total = 0
+        get_node = router.get_node
+        primary_of: Dict[int, str] = {}
+        for i in ids.tolist():
+            node = get_node(keys[i], "read")
+            per_key[(i, node)] += 1
+            if i not in primary_of:
+                primary_of[i] = router._primary_safe(keys[i])
+            alt_total += node != primary_of[i]
+        return [(i, node, n) for (i, node), n in per_key.items()], alt_total, "replay"
+
+    owners = _ring_owners(router, used_keys)
+    rows = [(i, node, n) for i, node, n in zip(used.tolist(), owners, counts[used].tolist())]
+    return rows, 0, "batch"
+
+
+def analyze_load(router: Any, ids: Any, keys: Sequence[Any]) -> Dict[str, Any]:
+    import numpy as np
+
+    ids = np.asarray(ids, dtype=np.int64)
+    rows, alt_total, method = _contributions(router, ids, keys)
+    nodes = list(getattr(router, "nodes", None) or sorted({node for _, node, _ in rows}))
+
+    node_load = {n: 0 for n in nodes}
+    hottest: Dict[str, Tuple[int, int]] = {}
+    for i, node, n in rows:
+        node_load[node] = node_load.get(node, 0) + n
+        if n > hottest.get(node, (-1, 0))[1]:
+            hottest[node] = (i, n)
+
+    total = int(ids.size)
+    loads = np.asarray(list(node_load.values()), dtype=np.float64)
+    mean = loads.mean() if loads.size else 0.0
+    return {
+        "method": method,
+        "requests": total,
+        "nodes": len(node_load),
+        "node_load": node_load,
+        "node_share": {n: (v / total if total else 0.0) for n, v in node_load.items()},
+        "max_mean_ratio": float(loads.max() / mean) if mean > 0 else 0.0,
+        "gini": gini(loads),
+        "load_stddev": float(loads.std(ddof=1)) if loads.size > 1 else 0.0,
+        "hottest_key": {n: keys[i] for n, (i, _) in hottest.items()},
+        "hottest_key_share": {
+            n: (c / node_load[n] if node_load[n] else 0.0) for n, (_, c) in hottest.items()
+        },
+        "alternate_share": alt_total / total if total else 0.0,
+        "split_keys": len(getattr(router, "alt", ())),
+    }
+
+
+def _sweep_point(point: Tuple[str, float, int, int, int, int, int]) -> Dict[str, Any]:
+    from ..experiment import build_router
+
+    mode, alpha, threshold, window, n_nodes, n_keys, size = point
+    keys = encode_keys(f"key-{i}" for i in range(n_keys))
+    reset_np_rng(SEED)
+    ids = generate_zipf_indices(n_keys, size, alpha)
+    nodes = [f"node-{i}" for i in range(1, n_nodes + 1)]
+    router = build_router(mode, nodes, window, {"T": threshold, "W": window})
+    result = analyze_load(router, ids, keys)
+    return {
+        "mode": mode,
+        "alpha": alpha,
+        "T": threshold,
+        "W": window,
+        "nodes": n_nodes,
+        "requests": result["requests"],
+        "max_mean_ratio": result["max_mean_ratio"],
+        "gini": result["gini"],
+        "load_stddev": result["load_stddev"],
+        "max_hottest_key_share": max(result["hottest_key_share"].values(), default=0.0),
+        "alternate_share": result["alternate_share"],
+        "split_keys": result["split_keys"],
+        "method": result["method"],
+    }
+
+
+def sweep_load(
+    alphas: Sequence[float],
+    thresholds: Sequence[int],
+    windows: Sequence[int],
+    node_counts: Sequence[int],
+    n_keys: int = 10_000,
+    size: int = 100_000,
+    mode: str = "D-HASH",
+    processes: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    points = [
+        (mode, float(a), int(t), int(w), int(n), n_keys, size)
+        for a, t, w, n in product(alphas, thresholds, windows, node_counts)
+    ]
+    if processes == 1 or len(points) <= 1:
+        return [_sweep_point(p) for p in points]
+    with ProcessPoolExecutor(max_workers=processes) as ex:
+        return list(ex.map(_sweep_point, points))
+
+
+__all__ = ["alternate_reads", "analyze_load", "gini", "sweep_load"]
@@ -1,28 +1,75 @@
 import logging
+import secrets
 import time
+from bisect import bisect_right
 from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor
 from statistics import stdev
-from typing import Any, Dict, List, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple, cast
 
-from dhash.stats import weighted_percentile
+from dhash.stats import weighted_percentiles
 
+from ..clients.near_cache import NearCache
+from ..clients.read_counts import ReadCounts
 from ..clients.redis_client import redis_client_for_node
+from ..clients.replication import REPLICATION_MODES, ReplicationQueue, redis_replica_sender
 from ..config.defaults import NODES, PIPELINE_SIZE_DEFAULT, TTL_SECONDS, VALUE_BYTES
+from ..workloads.values import PayloadFn, ValuePayloads, value_payload
+from .timeseries import IntervalRecorder
 
 logger = logging.getLogger(__name__)
 
+LATENCY_HIST_BOUNDS_US: List[float] = [float(2**i) for i in range(21)]
 
-def load_stddev(node_load: Dict[str, int]) -> float:
-    vals = [node_load.get(n, 0) for n in NODES]
+
+def load_stddev(node_load: Dict[str, int], nodes: Optional[List[str]] = None) -> float:
+    vals = [node_load.get(n, 0) for n in (nodes if nodes is not None else NODES)]
     return stdev(vals) if len(vals) > 1 else 0.0
 
 
-def _value_payload(value_bytes: int) -> bytes:
-    base = b'{"v":0}'
-    if value_bytes <= len(base):
-        return base[: max(value_bytes, 0)]
-    return base + b"x" * (value_bytes - len(base))
+def latency_histogram(samples: List[Tuple[float, int]]) -> List[int]:
+    counts = [0] * (len(LATENCY_HIST_BOUNDS_US) + 1)
+    for v, w in samples:
+        counts[bisect_right(LATENCY_HIST_BOUNDS_US, v * 1e6)] += w
+    return counts
+
+
+def split_read_write(
+    keys: List[Any], write_fraction: Optional[float]
+) -> Tuple[List[Any], List[Any]]:
+    if write_fraction is None:
+        return keys, keys
+    if not 0.0 <= write_fraction <= 1.0:
+        raise ValueError("write_fraction must be between 0 and 1.")
+    writes: List[Any] = []
+    reads: List[Any] = []
+    # Spread writes evenly through the sequence so the split is deterministic.
+    for i, k in enumerate(keys):
+        if int((i + 1) * write_fraction) > int(i * write_fraction):
+            writes.append(k)
+        else:
+            reads.append(k)
+    return writes, reads
+
+
+def write_targets(sharding: Any, key: Any) -> List[str]:
+    get_write_nodes = getattr(sharding, "get_write_nodes", None)
+    if get_write_nodes is not None:
+        return cast(List[str], get_write_nodes(key))
+    return [sharding.get_node(key, op="write")]
+
+
+def _read_metrics(reads: ReadCounts) -> Dict[str, Any]:
+    totals = reads.totals()
+    return {
+        "read_hits": totals["hits"],
+        "read_misses": totals["misses"],
+        "read_stale": totals["stale"],
+        "hit_ratio": reads.hit_ratio(),
+        "alt_hit_ratio": reads.hit_ratio("alternate"),
+        "read_counts_by_node": reads.by_node(),
+        "read_counts_by_route": reads.by_route(),
+    }
 
 
 def benchmark_cluster(
@@ -31,18 +78,122 @@ def benchmark_cluster(
     ex_seconds: int = TTL_SECONDS,
     pipeline_size: int = PIPELINE_SIZE_DEFAULT,
     value_bytes: int = VALUE_BYTES,
+    db: int = 0,
+    nodes: Optional[List[str]] = None,
+    near_cache: Optional[NearCache] = None,
+    write_fraction: Optional[float] = None,
+    write_replication: str = "off",
+    replication_max_lag: float = 0.05,
+    recorder: Optional[IntervalRecorder] = None,
+    payloads: Optional[PayloadFn] = None,
+    write_version: Optional[int] = None,
+    on_start: Optional[Callable[[], None]] = None,
 ) -> Dict[str, Any]:
+    if write_replication not in REPLICATION_MODES:
+        raise ValueError(
+            f"Unknown write_replication: {write_replication}. "
+            f"Expected one of {list(REPLICATION_MODES)}"
+        )
+    nodes = list(nodes) if nodes is not None else list(NODES)
+    write_keys, read_keys = split_read_write(keys, write_fraction)
     write_buckets: Dict[str, List[Any]] = defaultdict(list)
     read_buckets: Dict[str, List[Any]] = defaultdict(list)
+    # Per primary bucket, the alternates each write is copied to after the primary acknowledges.
+    async_replicas: Dict[str, List[List[str]]] = defaultdict(list)
+    # Each call writes its own version marker, so a read that returns a value left by the preload
+    # or by an earlier cell, for a key this call has written, is counted as stale.
+    if write_version is None:
+        write_version = secrets.randbits(47) | 1
+    payload = value_payload(value_bytes, write_version)
+    if isinstance(payloads, ValuePayloads):
+        payloads = payloads.versioned(write_version)
+    near_hits = 0
+    near_time = 0.0
+    replica_writes = 0
+    # Async replica copies are sent from the replication thread, so their bytes are counted here.
+    replica_bytes = 0
+    # Per read bucket, one byte per read: 1 if it went to the key's alternate.
+    read_alt: Dict[str, bytearray] = defaultdict(bytearray)
+    alt_map = getattr(sharding, "alt", None)
+    if not isinstance(alt_map, dict):
+        alt_map = None
+
+    # The primary lookup must not go through get_node, which would count as a routed write.
+    primary_of = getattr(sharding, "_primary_safe", None)
+
+    def _is_alternate(k: Any, node: str) -> bool:
+        # Only keys with an alternate can be read from one; the primary check covers alt == primary.
+        return (
+            alt_map is not None
+            and primary_of is not None
+            and alt_map.get(k) == node
+            and node != primary_of(k)
+        )
+
+    def _route_read(k: Any) -> str:
+        node: str = sharding.get_node(k, op="read")
+        read_alt[node].append(_is_alternate(k, node))
+        return node
+
+    def _route_write(k: Any) -> None:
+        nonlocal replica_writes, replica_bytes
+        if write_replication == "off":
+            write_buckets[sharding.get_node(k, op="write")].append(k)
+            return
+        primary, *replicas = write_targets(sharding, k)
+        write_buckets[primary].append(k)
+        replica_writes += len(replicas)
+        if write_replication == "async":
+            async_replicas[primary].append(replicas)
+            value_len = len(payload if payloads is None else payloads(k))
+            replica_bytes += value_len * len(replicas)
+            return
+        for node in replicas:
+            write_buckets[node].append(k)
+
+    if near_cache is None and write_fraction is None:
+        for k in keys:
+            _route_write(k)
+            read_buckets[_route_read(k)].append(k)
+    elif near_cache is None:
+        for k in write_keys:
+            _route_write(k)
+        for k in read_keys:
+            read_buckets[_route_read(k)].append(k)
+    else:
+        # All writes execute before all reads, so invalidate first and then serve reads.
+        for k in write_keys:
+            _route_write(k)
+            near_cache.invalidate(k)
+        for k in read_keys:
+            node = sharding.get_node(k, op="read")
+            t0 = time.perf_counter_ns()
+            cached = near_cache.get(k)
+            if cached is not None:
+                near_time += (time.perf_counter_ns() - t0) / 1e9
+                near_hits += 1
+                continue
+            read_alt[node].append(_is_alternate(k, node))
+            read_buckets[node].append(k)
+            # The Redis read returns the payload written above, so fill the cache with it.
+            near_cache.put(k, payload if payloads is None else payloads(k))
+
+    # Keys the benchmark writes must read back with this run's value; others keep the preload value.
+    written = set(write_keys) if write_fraction is not None else None
+    reads = ReadCounts()
 
-    for k in keys:
-        p_node = sharding.get_node(k, op="write")
-        write_buckets[p_node].append(k)
-        read_buckets[sharding.get_node(k, op="read")].append(k)
+    def _expected(k: Any) -> Optional[bytes]:
+        if written is not None and k not in written:
+            return None
+        return payload if payloads is None else payloads(k)
 
     node_load: Dict[str, int] = {
-        n: len(write_buckets.get(n, [])) + len(read_buckets.get(n, [])) for n in NODES
+        n: len(write_buckets.get(n, [])) + len(read_buckets.get(n, [])) for n in nodes
     }
+    for plans in async_replicas.values():
+        for replicas in plans:
+            for node in replicas:
+                node_load[node] = node_load.get(node, 0) + 1
 
     if sum(node_load.values()) == 0:
         return {
@@ -50,66 +201,177 @@ def benchmark_cluster(
             "avg_ms": 0.0,
             "p95_ms": 0.0,
             "p99_ms": 0.0,
+            "latency_hist": latency_histogram([]),
+            "near_cache_hits": near_hits,
+            "near_cache_hit_ratio": 0.0,
+            "write_fanout": 0.0,
+            "replication_lag_ms": 0.0,
+            "bytes_written": 0,
+            "bytes_read": 0,
+            "bandwidth_mb_s": 0.0,
+            "errors": 0,
+            "error_rate": 0.0,
+            "rerouted": 0,
+            **_read_metrics(reads),
             "node_load": node_load,
         }
 
-    payload = _value_payload(value_bytes)
+    replication: Optional[ReplicationQueue] = None
+    if write_replication == "async" and replica_writes:
+        replication = ReplicationQueue(
+            redis_replica_sender(payload if payloads is None else payloads, ex_seconds, db=db),
+            max_lag_seconds=replication_max_lag,
+        ).start()
 
-    def _io_write(item: Tuple[str, List[Any]]) -> Tuple[float, List[Tuple[float, int]]]:
-        node, node_keys = item
-        cli = redis_client_for_node(node)
-        total_time = 0.0
-        samples: List[Tuple[float, int]] = []
-        for i in range(0, len(node_keys), pipeline_size):
-            chunk = node_keys[i : i + pipeline_size]
-            pipe = cli.pipeline()
+    # Set when the router is a FailoverRouter; failed pipelines are then retried elsewhere.
+    failover: Any = sharding if hasattr(sharding, "fallback") else None
+
+    def _pipeline(
+        node: str,
+        chunk: List[Any],
+        write: bool,
+        alternates: Optional[bytearray] = None,
+        route: str = "primary",
+    ) -> int:
+        pipe = redis_client_for_node(node, db=db).pipeline()
+        if not write:
             for k in chunk:
-                pipe.set(str(k), payload, ex=ex_seconds)
-            t0 = time.perf_counter_ns()
+                pipe.get(k)
+            return reads.count(node, chunk, pipe.execute(), _expected, alternates, route)
+        if payloads is None:
+            for k in chunk:
+                pipe.set(k, payload, ex=ex_seconds)
             pipe.execute()
-            dt = (time.perf_counter_ns() - t0) / 1e9
-            total_time += dt
-            ops = max(len(chunk), 1)
-            samples.append((dt / ops, ops))
-        return total_time, samples
+            return len(payload) * len(chunk)
+        nbytes = 0
+        for k in chunk:
+            value = payloads(k)
+            pipe.set(k, value, ex=ex_seconds)
+            nbytes += len(value)
+        pipe.execute()
+        return nbytes
 
-    def _io_read(item: Tuple[str, List[Any]]) -> Tuple[float, List[Tuple[float, int]]]:
+    def _execute(
+        node: str, chunk: List[Any], write: bool, alternates: Optional[bytearray]
+    ) -> Tuple[int, int, int]:
+        # Returns payload bytes moved, operations that failed, and operations rerouted.
+        if failover is None or not failover.is_down(node):
+            try:
+                return _pipeline(node, chunk, write, alternates), 0, 0
+            except Exception as e:
+                if failover is None:
+                    logger.debug("Pipeline to %s failed: %s", node, e)
+                    return 0, len(chunk), 0
+                failover.mark_down(node)
+        targets: Dict[str, List[Any]] = defaultdict(list)
+        failed = 0
+        for k in chunk:
+            try:
+                targets[failover.fallback(k, node)].append(k)
+            except RuntimeError:
+                failed += 1
+        nbytes = rerouted = 0
+        for target, target_keys in targets.items():
+            try:
+                nbytes += _pipeline(target, target_keys, write, route="failover")
+                rerouted += len(target_keys)
+            except Exception as e:
+                logger.debug("Failover pipeline to %s failed: %s", target, e)
+                failover.mark_down(target)
+                failed += len(target_keys)
+        return nbytes, failed, rerouted
+
+    def _io(
+        item: Tuple[str, List[Any]], write: bool
+    ) -> Tuple[float, List[Tuple[float, int]], Tuple[int, int, int]]:
         node, node_keys = item
-        cli = redis_client_for_node(node)
         total_time = 0.0
         samples: List[Tuple[float, int]] = []
+        nbytes = errors = rerouted = 0
         for i in range(0, len(node_keys), pipeline_size):
             chunk = node_keys[i : i + pipeline_size]
-            pipe = cli.pipeline()
-            for k in chunk:
-                pipe.get(str(k))
+            alternates = None if write else read_alt[node][i : i + pipeline_size]
             t0 = time.perf_counter_ns()
-            _ = pipe.execute()
+            chunk_bytes, chunk_errors, chunk_rerouted = _execute(node, chunk, write, alternates)
+            if write and replication is not None:
+                for k, replicas in zip(chunk, async_replicas.get(node, [])[i : i + pipeline_size]):
+                    for replica in replicas:
+                        replication.submit(replica, k)
             dt = (time.perf_counter_ns() - t0) / 1e9
+            nbytes += chunk_bytes
+            errors += chunk_errors
+            rerouted += chunk_rerouted
             total_time += dt
             ops = max(len(chunk), 1)
             samples.append((dt / ops, ops))
-        return total_time, samples
+            if recorder is None:
+                continue
+            if write:
+                recorder.record(node, len(chunk), dt / ops)
+            else:
+                recorder.record(node, len(chunk), dt / ops, len(chunk), sum(alternates or b""))
+        return total_time, samples, (nbytes, errors, rerouted)
 
+    # Routing is done; on_start runs right before the first request goes out.
+    if on_start is not None:
+        on_start()
+    if recorder is not None:
+        recorder.start()
     write_node_totals, write_all_samples = [], []
     read_node_totals, read_all_samples = [], []
+    bytes_written = replica_bytes
+    bytes_read = errors = rerouted = 0
 
     with ThreadPoolExecutor(max_workers=max(1, len(write_buckets))) as ex:
-        for total, samples in ex.map(_io_write, write_buckets.items()):
+        for total, samples, (nbytes, failed, moved) in ex.map(
+            lambda item: _io(item, True), write_buckets.items()
+        ):
             write_node_totals.append(total)
             write_all_samples.extend(samples)
+            bytes_written += nbytes
+            errors += failed
+            rerouted += moved
 
     with ThreadPoolExecutor(max_workers=max(1, len(read_buckets))) as ex:
-        for total, samples in ex.map(_io_read, read_buckets.items()):
+        for total, samples, (nbytes, failed, moved) in ex.map(
+            lambda item: _io(item, False), read_buckets.items()
+        ):
             read_node_totals.append(total)
             read_all_samples.extend(samples)
+            bytes_read += nbytes
+            errors += failed
+            rerouted += moved
+    if errors:
+        logger.warning("[Benchmark] %d operations failed (%d rerouted).", errors, rerouted)
+    read_metrics = _read_metrics(reads)
+    if read_metrics["read_misses"] or read_metrics["read_stale"]:
+        logger.info(
+            "[Benchmark] Reads: %d misses, %d stale by route %s.",
+            read_metrics["read_misses"],
+            read_metrics["read_stale"],
+            read_metrics["read_counts_by_route"],
+        )
+
+    replication_lag_ms = 0.0
+    if replication is not None:
+        replication.close()
+        replication_lag_ms = float(replication.stats()["max_lag_ms"])
 
     cluster_wall = (max(write_node_totals) if write_node_totals else 0.0) + (
         max(read_node_totals) if read_node_totals else 0.0
     )
-    total_ops = sum(len(v) for v in write_buckets.values()) + sum(
+    # Synchronous replica copies are extra work per write, not extra client operations.
+    attempted = sum(len(v) for v in write_buckets.values()) + sum(
         len(v) for v in read_buckets.values()
     )
+    # Only operations that succeeded, on their node or after failover, count as throughput.
+    total_ops = attempted - errors
+    if write_replication == "sync":
+        total_ops -= replica_writes
+    if near_hits:
+        cluster_wall += near_time
+        total_ops += near_hits
+        read_all_samples.append((near_time / near_hits, near_hits))
     throughput = (total_ops / cluster_wall) if cluster_wall > 0 else 0.0
 
     def _wavg(samples: List[Tuple[float, int]]) -> float:
@@ -117,10 +379,28 @@ def benchmark_cluster(
         return sum(v * w for v, w in samples) / wsum if wsum > 0 else 0.0
 
     combined_samples = write_all_samples + read_all_samples
+    p95, p99 = weighted_percentiles(combined_samples, [0.95, 0.99])
     return {
         "throughput_ops_s": float(throughput),
         "avg_ms": float(_wavg(combined_samples) * 1000.0),
-        "p95_ms": float(weighted_percentile(combined_samples, 0.95) * 1000.0),
-        "p99_ms": float(weighted_percentile(combined_samples, 0.99) * 1000.0),
-        "node_load": {n: int(node_load.get(n, 0)) for n in NODES},
+        "p95_ms": p95 * 1000.0,
+        "p99_ms": p99 * 1000.0,
+        "latency_hist": latency_histogram(combined_samples),
+        "near_cache_hits": near_hits,
+        "near_cache_hit_ratio": near_hits / len(read_keys) if read_keys else 0.0,
+        "write_fanout": (
+            (len(write_keys) + replica_writes) / len(write_keys) if write_keys else 0.0
+        ),
+        "replication_lag_ms": replication_lag_ms,
+        "bytes_written": bytes_written,
+        "bytes_read": bytes_read,
+        # Payload bytes only; keys and protocol framing are not counted.
+        "bandwidth_mb_s": (
+            (bytes_written + bytes_read) / cluster_wall / 1e6 if cluster_wall > 0 else 0.0
+        ),
+        "errors": errors,
+        "error_rate": errors / attempted if attempted else 0.0,
+        "rerouted": rerouted,
+        **read_metrics,
+        "node_load": {n: int(node_load.get(n, 0)) for n in nodes},
     }
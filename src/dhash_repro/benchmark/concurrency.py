@@ -0,0 +1,63 @@
+import threading
+import time
+from typing import Any, Callable, Dict, List, Sequence
+
+DEFAULT_THREAD_COUNTS: List[int] = [1, 2, 4, 8, 16, 32]
+
+
+def bench_router_threads(
+    router_factory: Callable[[], Any],
+    keys: Sequence[Any],
+    threads: Sequence[int] = DEFAULT_THREAD_COUNTS,
+    ops_per_thread: int = 50_000,
+) -> List[Dict[str, Any]]:
+    if not keys:
+        raise ValueError("Key list is empty.")
+
+    results: List[Dict[str, Any]] = []
+    for n_threads in threads:
+        router = router_factory()
+        barrier = threading.Barrier(n_threads + 1)
+        errors: List[BaseException] = []
+
+        def _worker(offset: int) -> None:
+            get_node = router.get_node
+            n_keys = len(keys)
+            try:
+                barrier.wait()
+                for i in range(ops_per_thread):
+                    get_node(keys[(offset + i) % n_keys], "read")
+                flush = getattr(router, "flush_local", None)
+                if flush is not None:
+                    flush()
+            except BaseException as e:
+                errors.append(e)
+
+        workers = [
+            threading.Thread(target=_worker, args=(t * 7919,), daemon=True)
+            for t in range(n_threads)
+        ]
+        for w in workers:
+            w.start()
+        barrier.wait()
+        t0 = time.perf_counter_ns()
+        for w in workers:
+            w.join()
+        elapsed = (time.perf_counter_ns() - t0) / 1e9
+        if errors:
+            raise errors[0]
+
+        total_ops = n_threads * ops_per_thread
+        counted = sum(router.read_counts().values()) if hasattr(router, "read_counts") else 0
+        results.append(
+            {
+                "router": type(router).__name__,
+                "threads": n_threads,
+                "ops": total_ops,
+                "seconds": elapsed,
+                "ops_per_s": total_ops / elapsed if elapsed > 0 else 0.0,
+                "ns_per_op": elapsed * 1e9 / total_ops,
+                "lost_increments": total_ops - counted,
+            }
+        )
+    return results
@@ -0,0 +1,100 @@
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from ..clients.redis_client import override_node_address, split_node_address
+from ..config.settings import FAULT_SCENARIOS
+from ..proxy.delay import DelayProxy
+
+logger = logging.getLogger(__name__)
+
+# Parameters of each scenario, with their defaults. Times are seconds from the benchmark start.
+FAULT_PARAMS: Dict[str, Dict[str, float]] = {
+    "none": {},
+    "slow": {"delay_ms": 20.0},
+    "down": {"down_at_s": 1.0},
+    "recover": {"down_at_s": 1.0, "up_at_s": 3.0},
+}
+
+
+def resolve_fault_params(
+    scenario: str, params: Optional[Dict[str, float]] = None
+) -> Dict[str, float]:
+    if scenario not in FAULT_SCENARIOS:
+        raise ValueError(
+            f"Unsupported fault scenario: {scenario}. Expected one of {list(FAULT_SCENARIOS)}"
+        )
+    params = dict(params or {})
+    unknown = set(params) - set(FAULT_PARAMS[scenario])
+    if unknown:
+        raise ValueError(f"Unknown parameters for fault scenario {scenario}: {sorted(unknown)}")
+    resolved = {**FAULT_PARAMS[scenario], **{k: float(v) for k, v in params.items()}}
+    if any(v < 0 for v in resolved.values()):
+        raise ValueError("Fault parameters must not be negative.")
+    if resolved.get("up_at_s", float("inf")) < resolved.get("down_at_s", 0.0):
+        raise ValueError("up_at_s must not be before down_at_s.")
+    return resolved
+
+
+class FaultInjector:
+    # Puts a DelayProxy in front of one node for the length of a cell. start() reroutes the
+    # node's connections through it; arm() starts the down/up timers when the benchmark begins.
+    def __init__(self, scenario: str, node: str, params: Optional[Dict[str, float]] = None) -> None:
+        self.scenario = scenario
+        self.node = node
+        self.params = resolve_fault_params(scenario, params)
+        self.events: List[Tuple[float, str]] = []
+        self._proxy: Optional[DelayProxy] = None
+        self._timers: List[threading.Timer] = []
+        self._armed_at = 0.0
+
+    def start(self) -> "FaultInjector":
+        if self._proxy is None:
+            delay = self.params.get("delay_ms", 0.0) / 1000.0
+            self._proxy = DelayProxy(split_node_address(self.node), delay_seconds=delay).start()
+            host, port = self._proxy.address
+            override_node_address(self.node, f"{host}:{port}")
+            logger.info(
+                "[Fault] %s on %s via %s:%d %s", self.scenario, self.node, host, port, self.params
+            )
+        return self
+
+    def __enter__(self) -> "FaultInjector":
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    def arm(self) -> None:
+        self._armed_at = time.perf_counter()
+        if "down_at_s" in self.params:
+            self._schedule(self.params["down_at_s"], True)
+        if "up_at_s" in self.params:
+            self._schedule(self.params["up_at_s"], False)
+
+    def _schedule(self, after: float, down: bool) -> None:
+        timer = threading.Timer(after, self._set_down, args=(down,))
+        timer.daemon = True
+        timer.start()
+        self._timers.append(timer)
+
+    def _set_down(self, down: bool) -> None:
+        if self._proxy is None:
+            return
+        self._proxy.set_down(down)
+        at = time.perf_counter() - self._armed_at
+        self.events.append((at, "down" if down else "up"))
+        logger.info("[Fault] %s is %s at %.2fs.", self.node, "down" if down else "up", at)
+
+    def stop(self) -> None:
+        for timer in self._timers:
+            timer.cancel()
+        self._timers = []
+        if self._proxy is not None:
+            override_node_address(self.node, None)
+            self._proxy.stop()
+            self._proxy = None
+
+
+__all__ = ["FAULT_PARAMS", "FaultInjector", "resolve_fault_params"]
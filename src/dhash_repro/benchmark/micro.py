@@ -0,0 +1,245 @@
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from dhash import (
+    ConcurrentDHash,
+    ConsistentHashing,
+    DHash,
+    RendezvousHashing,
+    WeightedConsistentHashing,
+)
+from dhash.config import DEFAULT_HOT_KEY_THRESHOLD, DEFAULT_WINDOW_SIZE, VIRTUAL_POINTS_PER_NODE
+from dhash.hashing.slots import SlotRouter
+from dhash.routing.adaptive import AdaptiveDHash
+from dhash.routing.rate import RateDHash
+
+from ..config.defaults import SEED, reset_np_rng, runtime_env_metadata
+from ..workloads.zipf import generate_zipf_workload
+
+KEY_TYPES = ("str", "bytes", "int")
+DEFAULT_NODE_COUNTS: List[int] = [4, 16, 64]
+DEFAULT_VNODES: List[int] = [VIRTUAL_POINTS_PER_NODE]
+DEFAULT_ALPHAS: List[float] = [0.0, 1.1]
+
+RouterBuilder = Callable[[List[str], int], Any]
+# Routers without virtual nodes; one vnode setting is enough for them.
+NO_VNODES = ("RendezvousHashing", "SlotRouter")
+
+
+def _rebuild_ring(router: Any, nodes: List[str]) -> None:
+    router.add_node(nodes[-1])
+
+
+def _rebuild_dhash(router: Any, nodes: List[str]) -> None:
+    router.refresh_membership(nodes)
+
+
+def _dhash_builder(cls: Any) -> RouterBuilder:
+    return lambda nodes, v: cls(
+        nodes,
+        hot_key_threshold=DEFAULT_HOT_KEY_THRESHOLD,
+        window_size=DEFAULT_WINDOW_SIZE,
+        replicas=v,
+    )
+
+
+# name -> (build(nodes, vnodes), grow-by-one-node step, or None to rebuild from scratch)
+ROUTERS: Dict[str, Tuple[RouterBuilder, Optional[Callable[[Any, List[str]], None]]]] = {
+    "ConsistentHashing": (lambda nodes, v: ConsistentHashing(nodes, replicas=v), _rebuild_ring),
+    "WeightedConsistentHashing": (
+        lambda nodes, v: WeightedConsistentHashing(nodes, base_replicas=v),
+        None,
+    ),
+    "RendezvousHashing": (lambda nodes, v: RendezvousHashing(nodes), None),
+    "SlotRouter": (lambda nodes, v: SlotRouter(nodes), _rebuild_ring),
+    "DHash": (_dhash_builder(DHash), _rebuild_dhash),
+    "ConcurrentDHash": (_dhash_builder(ConcurrentDHash), _rebuild_dhash),
+    "RateDHash": (_dhash_builder(RateDHash), _rebuild_dhash),
+    "AdaptiveDHash": (_dhash_builder(AdaptiveDHash), _rebuild_dhash),
+}
+
+
+def make_keys(n_keys: int, ops: int, alpha: float, key_type: str) -> List[Any]:
+    if key_type not in KEY_TYPES:
+        raise ValueError(f"key_type must be one of {KEY_TYPES}.")
+    ranked: List[Any]
+    if key_type == "int":
+        ranked = list(range(n_keys))
+    elif key_type == "bytes":
+        ranked = [f"key-{i}".encode() for i in range(n_keys)]
+    else:
+        ranked = [f"key-{i}" for i in range(n_keys)]
+    reset_np_rng(SEED)
+    return generate_zipf_workload(ranked, size=ops, alpha=alpha)
+
+
+def _time_get_node(router: Any, keys: Sequence[Any]) -> int:
+    get_node = router.get_node
+    t0 = time.perf_counter_ns()
+    for k in keys:
+        get_node(k, "read")
+    return time.perf_counter_ns() - t0
+
+
+def _retained_per_op(build: Callable[[], Any], keys: Sequence[Any]) -> Tuple[float, float]:
+    # Net growth, not allocations: memory that lives on after the calls, such as read counters
+    # and alternates. Temporaries freed within a call do not show up.
+    router = build()
+    get_node = router.get_node
+    gc.collect()
+    tracemalloc.start()
+    try:
+        blocks0 = sys.getallocatedblocks()
+        bytes0, _ = tracemalloc.get_traced_memory()
+        for k in keys:
+            get_node(k, "read")
+        bytes1, _ = tracemalloc.get_traced_memory()
+        blocks1 = sys.getallocatedblocks()
+    finally:
+        tracemalloc.stop()
+    n = max(1, len(keys))
+    return (blocks1 - blocks0) / n, (bytes1 - bytes0) / n
+
+
+def _best_ns(fn: Callable[[], int], repeat: int) -> int:
+    return min(fn() for _ in range(max(1, repeat)))
+
+
+def _timed(fn: Callable[[], Any]) -> int:
+    t0 = time.perf_counter_ns()
+    fn()
+    return time.perf_counter_ns() - t0
+
+
+def case_id(row: Dict[str, Any]) -> str:
+    return (
+        f"{row['router']}/nodes={row['nodes']}/vnodes={row['vnodes']}"
+        f"/key={row['key_type']}/alpha={row['alpha']:g}"
+    )
+
+
+def bench_router(
+    name: str,
+    n_nodes: int,
+    vnodes: int,
+    keys: Sequence[Any],
+    key_type: str,
+    alpha: float,
+    repeat: int = 5,
+) -> Dict[str, Any]:
+    if name not in ROUTERS:
+        raise ValueError(f"Unknown router: {name}")
+    builder, rebuild = ROUTERS[name]
+    nodes = [f"node{i}" for i in range(n_nodes)]
+    grown = nodes + [f"node{n_nodes}"]
+
+    def _build() -> Any:
+        return builder(nodes, vnodes)
+
+    def _run() -> int:
+        # Fresh router each round, so D-HASH counters start from zero every time.
+        return _time_get_node(_build(), keys)
+
+    def _rebuild_once() -> int:
+        if rebuild is None:
+            return _timed(lambda: builder(grown, vnodes))
+        router = _build()
+        return _timed(lambda: rebuild(router, grown))
+
+    elapsed = _best_ns(_run, repeat)
+    blocks, retained_bytes = _retained_per_op(_build, keys)
+    row: Dict[str, Any] = {
+        "router": name,
+        "nodes": n_nodes,
+        # Rendezvous and slot routers have no ring, so their vnode setting is meaningless.
+        "vnodes": 0 if name in NO_VNODES else vnodes,
+        "key_type": key_type,
+        "alpha": alpha,
+        "ops": len(keys),
+        "ns_per_op": elapsed / max(1, len(keys)),
+        "retained_blocks_per_op": blocks,
+        "retained_bytes_per_op": retained_bytes,
+        "construct_us": _best_ns(lambda: _timed(_build), repeat) / 1000.0,
+        "rebuild_us": _best_ns(_rebuild_once, repeat) / 1000.0,
+    }
+    row["case"] = case_id(row)
+    return row
+
+
+def run_suite(
+    routers: Optional[Sequence[str]] = None,
+    node_counts: Sequence[int] = DEFAULT_NODE_COUNTS,
+    vnodes: Sequence[int] = DEFAULT_VNODES,
+    key_types: Sequence[str] = KEY_TYPES,
+    alphas: Sequence[float] = DEFAULT_ALPHAS,
+    ops: int = 20_000,
+    n_keys: int = 10_000,
+    repeat: int = 5,
+) -> List[Dict[str, Any]]:
+    names = list(routers) if routers else list(ROUTERS)
+    rows: List[Dict[str, Any]] = []
+    for key_type in key_types:
+        for alpha in alphas:
+            keys = make_keys(n_keys, ops, alpha, key_type)
+            for name in names:
+                for v in vnodes if name not in NO_VNODES else vnodes[:1]:
+                    for n in node_counts:
+                        rows.append(bench_router(name, n, v, keys, key_type, alpha, repeat))
+    return rows
+
+
+def compare_to_baseline(
+    rows: Sequence[Dict[str, Any]],
+    baseline: Sequence[Dict[str, Any]],
+    tolerance: float = 0.25,
+) -> List[Dict[str, Any]]:
+    previous = {r["case"]: r for r in baseline}
+    regressions: List[Dict[str, Any]] = []
+    for row in rows:
+        old = previous.get(row["case"])
+        if old is None or old["ns_per_op"] <= 0:
+            continue
+        ratio = row["ns_per_op"] / old["ns_per_op"]
+        if ratio > 1.0 + tolerance:
+            regressions.append(
+                {
+                    "case": row["case"],
+                    "baseline_ns_per_op": old["ns_per_op"],
+                    "ns_per_op": row["ns_per_op"],
+                    "ratio": ratio,
+                }
+            )
+    return regressions
+
+
+def write_results(path: str, rows: Sequence[Dict[str, Any]]) -> None:
+    payload = {"metadata": runtime_env_metadata(), "results": list(rows)}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+
+
+def load_results(path: str) -> List[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        payload = json.load(f)
+    return list(payload["results"])
+
+
+__all__ = [
+    "DEFAULT_ALPHAS",
+    "DEFAULT_NODE_COUNTS",
+    "DEFAULT_VNODES",
+    "KEY_TYPES",
+    "NO_VNODES",
+    "ROUTERS",
+    "bench_router",
+    "case_id",
+    "compare_to_baseline",
+    "load_results",
+    "make_keys",
+    "run_suite",
+    "write_results",
+]
@@ -0,0 +1,115 @@
+import threading
+import time
+from bisect import bisect_right
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class IntervalRecorder:
+    # Fixed time slices from start(); arrays grow by doubling if the run outlasts the estimate.
+    def __init__(
+        self,
+        nodes: Sequence[str],
+        interval_seconds: float = 0.1,
+        hist_bounds_us: Sequence[float] = (),
+        expected_seconds: float = 60.0,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        import numpy as np
+
+        if interval_seconds <= 0:
+            raise ValueError("interval_seconds must be positive.")
+        self.nodes: List[str] = list(nodes)
+        self.interval_seconds = float(interval_seconds)
+        self.hist_bounds_us: List[float] = list(hist_bounds_us)
+        self.clock = clock
+        self._node_index: Dict[str, int] = {n: i for i, n in enumerate(self.nodes)}
+        self._lock = threading.Lock()
+        self._start: Optional[float] = None
+        self._used = 0
+        size = max(1, int(expected_seconds / self.interval_seconds) + 1)
+        self._ops = np.zeros(size, dtype=np.int64)
+        self._latency_sum = np.zeros(size, dtype=np.float64)
+        self._node_ops = np.zeros((size, len(self.nodes)), dtype=np.int64)
+        # Reads per interval: column 0 served by the primary, column 1 by the alternate.
+        self._routes = np.zeros((size, 2), dtype=np.int64)
+        self._hist = np.zeros((size, len(self.hist_bounds_us) + 1), dtype=np.int64)
+
+    def start(self) -> "IntervalRecorder":
+        self._start = self.clock()
+        return self
+
+    def _grow(self, needed: int) -> None:
+        import numpy as np
+
+        size = len(self._ops)
+        while size <= needed:
+            size *= 2
+        extra = size - len(self._ops)
+        self._ops = np.concatenate((self._ops, np.zeros(extra, dtype=np.int64)))
+        self._latency_sum = np.concatenate((self._latency_sum, np.zeros(extra)))
+        self._node_ops = np.vstack((self._node_ops, np.zeros((extra, len(self.nodes)), np.int64)))
+        self._routes = np.vstack((self._routes, np.zeros((extra, 2), dtype=np.int64)))
+        self._hist = np.vstack((self._hist, np.zeros((extra, self._hist.shape[1]), np.int64)))
+
+    def record(
+        self,
+        node: str,
+        ops: int,
+        latency_s: float,
+        reads: int = 0,
+        alternate_reads: int = 0,
+        now: Optional[float] = None,
+    ) -> None:
+        if self._start is None:
+            self.start()
+        assert self._start is not None
+        t = self.clock() if now is None else now
+        idx = max(0, int((t - self._start) / self.interval_seconds))
+        bucket = bisect_right(self.hist_bounds_us, latency_s * 1e6)
+        col = self._node_index.get(node)
+        with self._lock:
+            if idx >= len(self._ops):
+                self._grow(idx)
+            self._ops[idx] += ops
+            self._latency_sum[idx] += latency_s * ops
+            self._hist[idx, bucket] += ops
+            if col is not None:
+                self._node_ops[idx, col] += ops
+            self._routes[idx, 0] += reads - alternate_reads
+            self._routes[idx, 1] += alternate_reads
+            self._used = max(self._used, idx + 1)
+
+    def rows(self) -> List[Dict[str, Any]]:
+        rows: List[Dict[str, Any]] = []
+        for i in range(self._used):
+            ops = int(self._ops[i])
+            rows.append(
+                {
+                    "Interval": i,
+                    "StartS": i * self.interval_seconds,
+                    "Ops": ops,
+                    "Thr": ops / self.interval_seconds,
+                    "AvgMs": float(self._latency_sum[i]) / ops * 1000.0 if ops else 0.0,
+                    "PrimaryReads": int(self._routes[i, 0]),
+                    "AltReads": int(self._routes[i, 1]),
+                    "NodeOps": self._node_ops[i].tolist(),
+                    "LatencyHist": self._hist[i].tolist(),
+                }
+            )
+        return rows
+
+    @property
+    def arrays(self) -> Dict[str, "np.ndarray"]:
+        n = self._used
+        return {
+            "ops": self._ops[:n],
+            "node_ops": self._node_ops[:n],
+            "routes": self._routes[:n],
+            "latency_hist": self._hist[:n],
+        }
+
+
+__all__ = ["IntervalRecorder"]
@@ -0,0 +1,138 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from dhash.hashing.core import fast_hash64
+
+
+class _FrequencySketch:
+    __slots__ = ("depth", "width", "table", "additions", "sample_size")
+
+    def __init__(self, capacity: int, depth: int = 4) -> None:
+        width = 16
+        while width < 8 * capacity:
+            width <<= 1
+        self.depth = depth
+        self.width = width
+        self.table: List[List[int]] = [[0] * width for _ in range(depth)]
+        self.additions = 0
+        self.sample_size = 10 * max(1, capacity)
+
+    def _indexes(self, key: Any) -> List[int]:
+        h = fast_hash64(key)
+        h1 = h & 0xFFFFFFFF
+        h2 = (h >> 32) | 1
+        return [(h1 + i * h2) & (self.width - 1) for i in range(self.depth)]
+
+    def increment(self, key: Any) -> None:
+        for row, idx in zip(self.table, self._indexes(key)):
+            if row[idx] < 15:
+                row[idx] += 1
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            # Periodic halving lets old popularity fade out.
+            for row in self.table:
+                for i, v in enumerate(row):
+                    row[i] = v >> 1
+            self.additions //= 2
+
+    def frequency(self, key: Any) -> int:
+        return min(row[idx] for row, idx in zip(self.table, self._indexes(key)))
+
+
+class NearCache:
+    def __init__(
+        self,
+        router: Any = None,
+        capacity: int = 1024,
+        ttl_seconds: float = 1.0,
+        window_ratio: float = 0.01,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if capacity < 1:
+            raise ValueError("NearCache capacity must be at least 1.")
+        self.router = router
+        self.capacity = int(capacity)
+        self.ttl_seconds = float(ttl_seconds)
+        self.clock = clock
+        self.window_capacity = max(1, int(self.capacity * window_ratio))
+        self.main_capacity = max(1, self.capacity - self.window_capacity)
+        self._window: "OrderedDict[Any, Tuple[bytes, float]]" = OrderedDict()
+        self._main: "OrderedDict[Any, Tuple[bytes, float]]" = OrderedDict()
+        self._sketch = _FrequencySketch(self.capacity)
+        self.hits = 0
+        self.misses = 0
+        self.rejected = 0
+        self.evictions = 0
+        self.admissions_rejected = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._window) + len(self._main)
+
+    def is_hot(self, key: Any) -> bool:
+        router = self.router
+        if router is None or not hasattr(router, "T"):
+            return True
+        return int(router.read_count(key)) >= int(router.T)
+
+    def get(self, key: Any) -> Optional[bytes]:
+        self._sketch.increment(key)
+        for segment in (self._main, self._window):
+            entry = segment.get(key)
+            if entry is None:
+                continue
+            value, expires_at = entry
+            if expires_at <= self.clock():
+                del segment[key]
+                break
+            segment.move_to_end(key)
+            self.hits += 1
+            return value
+        self.misses += 1
+        return None
+
+    def put(self, key: Any, value: bytes) -> bool:
+        if not self.is_hot(key):
+            self.rejected += 1
+            return False
+        entry = (value, self.clock() + self.ttl_seconds)
+        if key in self._main:
+            self._main[key] = entry
+            self._main.move_to_end(key)
+            return True
+        self._window[key] = entry
+        self._window.move_to_end(key)
+        if len(self._window) > self.window_capacity:
+            self._admit(*self._window.popitem(last=False))
+        return True
+
+    def _admit(self, candidate: Any, entry: Tuple[bytes, float]) -> None:
+        if len(self._main) < self.main_capacity:
+            self._main[candidate] = entry
+            return
+        victim = next(iter(self._main))
+        # TinyLFU admission: the window's eviction only replaces a more popular main entry.
+        if self._sketch.frequency(candidate) > self._sketch.frequency(victim):
+            del self._main[victim]
+            self._main[candidate] = entry
+            self.evictions += 1
+        else:
+            self.admissions_rejected += 1
+
+    def invalidate(self, key: Any) -> None:
+        if self._window.pop(key, None) is not None or self._main.pop(key, None) is not None:
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "rejected": self.rejected,
+            "evictions": self.evictions,
+            "admissions_rejected": self.admissions_rejected,
+            "invalidations": self.invalidations,
+            "size": len(self),
+        }
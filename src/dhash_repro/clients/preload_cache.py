@@ -0,0 +1,98 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple, cast
+
+from ..config.defaults import TTL_SECONDS
+
+Placement = Dict[str, List[Any]]
+PlacementKey = Tuple[str, str, str]
+
+
+def _router_signature(sharding: Any) -> str:
+    base = getattr(sharding, "ch", sharding)
+    digest = hashlib.blake2b(digest_size=16)
+    sorted_keys = getattr(base, "sorted_keys", None)
+    slot_table = getattr(base, "slot_table", None)
+    if slot_table is not None:
+        for start, end, node in base.slot_ranges():
+            digest.update(f"{start}-{end}={node};".encode("utf-8"))
+    elif sorted_keys is not None:
+        ring = cast(Dict[int, str], getattr(base, "ring", {}))
+        for k in sorted_keys:
+            digest.update(f"{k}={ring[k]};".encode("utf-8"))
+    else:
+        for node in getattr(base, "nodes", ()):
+            digest.update(f"{node};".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _keyset_signature(keys: List[Any]) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for k in keys:
+        digest.update(k if isinstance(k, bytes) else str(k).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class PreloadCache:
+    def __init__(
+        self,
+        min_remaining_seconds: float = TTL_SECONDS / 2,
+        max_placements: int = 8,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.min_remaining_seconds = float(min_remaining_seconds)
+        self.max_placements = max(1, int(max_placements))
+        self.clock = clock
+        self._resident: Dict[str, Dict[Any, float]] = {}
+        self._placements: "OrderedDict[PlacementKey, Placement]" = OrderedDict()
+        self._keyset: Optional[Tuple[List[Any], int, str]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_empty(self) -> bool:
+        return not self._resident
+
+    def placement_key(self, sharding: Any, keys: List[Any]) -> PlacementKey:
+        # `keys` is the caller's own list, which stays the same object across cells, so the key
+        # set is hashed once rather than once per preload.
+        if self._keyset is None or self._keyset[0] is not keys or self._keyset[1] != len(keys):
+            self._keyset = (keys, len(keys), _keyset_signature(keys))
+        return type(sharding).__name__, _router_signature(sharding), self._keyset[2]
+
+    def placement(self, key: PlacementKey, build: Callable[[], Placement]) -> Placement:
+        with self._lock:
+            cached = self._placements.get(key)
+            if cached is not None:
+                self._placements.move_to_end(key)
+                return cached
+        built = build()
+        with self._lock:
+            self._placements[key] = built
+            while len(self._placements) > self.max_placements:
+                self._placements.popitem(last=False)
+        return built
+
+    def missing(self, placement: Placement) -> Placement:
+        fresh_until = self.clock() + self.min_remaining_seconds
+        delta: Placement = {}
+        with self._lock:
+            for node, node_keys in placement.items():
+                resident = self._resident.get(node, {})
+                need = [k for k in node_keys if resident.get(k, 0.0) < fresh_until]
+                if need:
+                    delta[node] = need
+        return delta
+
+    def mark_written(self, node: str, keys: List[Any], ttl_seconds: float) -> None:
+        deadline = self.clock() + float(ttl_seconds)
+        with self._lock:
+            resident = self._resident.setdefault(node, {})
+            for k in keys:
+                resident[k] = deadline
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._resident.clear()
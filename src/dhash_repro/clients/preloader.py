@@ -0,0 +1,154 @@
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+ChunkWriter = Callable[[str, List[Any]], None]
+
+PRELOAD_CHUNK_SIZE: int = 5_000
+PRELOAD_QUEUE_DEPTH: int = 4
+PRELOAD_PROGRESS_SECONDS: float = 5.0
+
+
+class StreamingPreloader:
+    # Collects routed keys into per-node chunks and writes them from one thread per node while the
+    # caller keeps routing. Each node queues at most `queue_depth` chunks; when a node falls behind,
+    # add() waits for it instead of buffering the whole key set.
+    def __init__(
+        self,
+        write: ChunkWriter,
+        chunk_size: int = PRELOAD_CHUNK_SIZE,
+        queue_depth: int = PRELOAD_QUEUE_DEPTH,
+        on_written: Optional[ChunkWriter] = None,
+        total: Optional[int] = None,
+        progress_seconds: float = PRELOAD_PROGRESS_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1.")
+        if queue_depth < 1:
+            raise ValueError("queue_depth must be at least 1.")
+        self.write = write
+        self.chunk_size = int(chunk_size)
+        self.queue_depth = int(queue_depth)
+        self.on_written = on_written
+        self.total = total
+        self.progress_seconds = float(progress_seconds)
+        self.clock = clock
+        self.queued = 0
+        self.written = 0
+        self.failed = 0
+        self._buffers: Dict[str, List[Any]] = {}
+        self._queues: Dict[str, "queue.Queue[Optional[List[Any]]]"] = {}
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._started = clock()
+        self._reported = self._started
+
+    def __enter__(self) -> "StreamingPreloader":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def add(self, node: str, key: Any) -> None:
+        buf = self._buffers.get(node)
+        if buf is None:
+            buf = self._buffers[node] = []
+        buf.append(key)
+        if len(buf) >= self.chunk_size:
+            self._buffers[node] = []
+            self._put(node, buf)
+
+    def add_many(self, node: str, keys: List[Any]) -> None:
+        buf = self._buffers.setdefault(node, [])
+        buf.extend(keys)
+        start = 0
+        while len(buf) - start >= self.chunk_size:
+            self._put(node, buf[start : start + self.chunk_size])
+            start += self.chunk_size
+        del buf[:start]
+
+    def _put(self, node: str, chunk: List[Any]) -> None:
+        q = self._queues.get(node)
+        if q is None:
+            q = self._queues[node] = queue.Queue(maxsize=self.queue_depth)
+            thread = threading.Thread(
+                target=self._run, args=(node, q), name=f"dhash-preload-{node}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        self.queued += len(chunk)
+        q.put(chunk)
+        self._report()
+
+    def _run(self, node: str, q: "queue.Queue[Optional[List[Any]]]") -> None:
+        while True:
+            chunk = q.get()
+            if chunk is None:
+                return
+            try:
+                self.write(node, chunk)
+            except Exception as e:
+                logger.warning("Preload write failed on %s: %s", node, e)
+                with self._lock:
+                    self.failed += len(chunk)
+                continue
+            with self._lock:
+                self.written += len(chunk)
+            if self.on_written is not None:
+                self.on_written(node, chunk)
+
+    def _report(self, final: bool = False) -> None:
+        now = self.clock()
+        if not final and now - self._reported < self.progress_seconds:
+            return
+        self._reported = now
+        total = f"/{self.total}" if self.total is not None else ""
+        logger.info(
+            "[Preload] %d%s copies routed, %d written (%.0f copies/s).",
+            self.queued,
+            total,
+            self.written,
+            self.rate(now),
+        )
+
+    def rate(self, now: Optional[float] = None) -> float:
+        elapsed = (self.clock() if now is None else now) - self._started
+        return self.written / elapsed if elapsed > 0 else 0.0
+
+    def close(self) -> Dict[str, Any]:
+        for node, buf in list(self._buffers.items()):
+            if buf:
+                self._buffers[node] = []
+                self._put(node, buf)
+        for q in self._queues.values():
+            q.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._queues.clear()
+        self._threads.clear()
+        if self.queued:
+            self._report(final=True)
+        return self.stats()
+
+    def stats(self) -> Dict[str, Any]:
+        now = self.clock()
+        return {
+            "queued": self.queued,
+            "written": self.written,
+            "failed": self.failed,
+            "seconds": now - self._started,
+            "copies_per_s": self.rate(now),
+        }
+
+
+__all__ = [
+    "PRELOAD_CHUNK_SIZE",
+    "PRELOAD_QUEUE_DEPTH",
+    "ChunkWriter",
+    "StreamingPreloader",
+]
@@ -0,0 +1,85 @@
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Where a read was sent: the key's primary, its D-HASH alternate, or another node after failover.
+READ_ROUTES = ("primary", "alternate", "failover")
+READ_OUTCOMES = ("hits", "misses", "stale")
+
+# Returns the value a read of the key should see, or None when any stored value is current.
+ExpectedFn = Callable[[Any], Optional[bytes]]
+
+
+def _ratio(counts: Dict[str, int]) -> float:
+    reads = counts["hits"] + counts["misses"] + counts["stale"]
+    return counts["hits"] / reads if reads else 0.0
+
+
+class ReadCounts:
+    # Hits, misses and stale values per (node, route). Replies are tallied into local integers
+    # and merged once per pipeline, so nothing is kept per read.
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts: Dict[Tuple[str, str], List[int]] = {}
+
+    def count(
+        self,
+        node: str,
+        keys: Sequence[Any],
+        replies: Sequence[Optional[bytes]],
+        expected: Optional[ExpectedFn] = None,
+        alternates: Optional[Sequence[int]] = None,
+        route: str = "primary",
+    ) -> int:
+        # `alternates` flags reads sent to the key's alternate; without it every read is `route`.
+        # Returns the bytes read.
+        tallies = [[0, 0, 0], [0, 0, 0]]
+        nbytes = 0
+        flags = alternates if alternates is not None else bytes(len(keys))
+        for k, value, alt in zip(keys, replies, flags):
+            tally = tallies[1 if alt else 0]
+            if value is None:
+                tally[1] += 1
+                continue
+            nbytes += len(value)
+            want = expected(k) if expected is not None else None
+            if want is None or value == want:
+                tally[0] += 1
+            else:
+                tally[2] += 1
+        with self._lock:
+            for name, tally in ((route, tallies[0]), ("alternate", tallies[1])):
+                if any(tally):
+                    slot = self._counts.setdefault((node, name), [0, 0, 0])
+                    for i, n in enumerate(tally):
+                        slot[i] += n
+        return nbytes
+
+    def _grouped(self, by: int) -> Dict[str, Dict[str, int]]:
+        out: Dict[str, Dict[str, int]] = {}
+        with self._lock:
+            for key, tally in self._counts.items():
+                group = out.setdefault(key[by], dict.fromkeys(READ_OUTCOMES, 0))
+                for name, n in zip(READ_OUTCOMES, tally):
+                    group[name] += n
+        return out
+
+    def by_node(self) -> Dict[str, Dict[str, int]]:
+        return self._grouped(0)
+
+    def by_route(self) -> Dict[str, Dict[str, int]]:
+        return self._grouped(1)
+
+    def totals(self) -> Dict[str, int]:
+        out = dict.fromkeys(READ_OUTCOMES, 0)
+        for group in self.by_node().values():
+            for name in READ_OUTCOMES:
+                out[name] += group[name]
+        return out
+
+    def hit_ratio(self, route: Optional[str] = None) -> float:
+        if route is None:
+            return _ratio(self.totals())
+        return _ratio(self.by_route().get(route, dict.fromkeys(READ_OUTCOMES, 0)))
+
+
+__all__ = ["READ_OUTCOMES", "READ_ROUTES", "ExpectedFn", "ReadCounts"]
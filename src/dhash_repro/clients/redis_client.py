@@ -1,47 +1,77 @@
 import logging
 import random
+import threading
 import time
 from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor
-from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, cast
-
-from redis import ConnectionPool, Redis
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, cast
 
 from dhash.routing.alternate import ensure_alternate
 
 from ..config.defaults import SEED, TTL_SECONDS
+from ..workloads.values import PayloadFn
+from .preload_cache import PreloadCache
+from .preloader import PRELOAD_CHUNK_SIZE, PRELOAD_QUEUE_DEPTH, StreamingPreloader
+from .read_counts import ReadCounts
+
+if TYPE_CHECKING:
+    from redis import ConnectionPool
 
 logger = logging.getLogger(__name__)
-_connection_pools: Dict[str, ConnectionPool] = {}
+_connection_pools: Dict[Tuple[str, int], "ConnectionPool"] = {}
+_pools_lock = threading.Lock()
+# Node name -> address actually dialled, e.g. a fault-injection proxy in front of the node.
+_address_overrides: Dict[str, str] = {}
 
+RedisInstance = Any
 
-if TYPE_CHECKING:
-    RedisInstance = Any
-else:
-    RedisInstance = Redis
+
+def split_node_address(node: str) -> Tuple[str, int]:
+    host, sep, port = node.rpartition(":")
+    if sep and port.isdigit():
+        return host, int(port)
+    return node, 6379
 
 
-def _redis_client(host: str) -> RedisInstance:
-    if host not in _connection_pools:
-        _connection_pools[host] = ConnectionPool(host=host, port=6379, db=0)
-    return Redis(connection_pool=_connection_pools[host])
+def _redis_client(host: str, db: int = 0) -> RedisInstance:
+    from redis import ConnectionPool, Redis
 
+    pool_key = (host, db)
+    pool = _connection_pools.get(pool_key)
+    if pool is None:
+        with _pools_lock:
+            pool = _connection_pools.get(pool_key)
+            if pool is None:
+                addr, port = split_node_address(host)
+                pool = ConnectionPool(host=addr, port=port, db=db)
+                _connection_pools[pool_key] = pool
+    return Redis(connection_pool=pool)
 
-def redis_client_for_node(node: str) -> RedisInstance:
-    return _redis_client(node)
+
+def redis_client_for_node(node: str, db: int = 0) -> RedisInstance:
+    return _redis_client(_address_overrides.get(node, node), db)
+
+
+def override_node_address(node: str, address: Optional[str]) -> None:
+    # Routing keeps using the node name; only the connection target changes.
+    with _pools_lock:
+        previous = _address_overrides.pop(node, None)
+        if address is not None:
+            _address_overrides[node] = address
+        if previous is not None:
+            for pool_key in [k for k in _connection_pools if k[0] == previous]:
+                _connection_pools.pop(pool_key).disconnect()
 
 
 def _unique_keys(keys: Iterable[Any]) -> List[Any]:
     return list(dict.fromkeys(keys))
 
 
-def preload_cluster(sharding: Any, keys: List[Any], ttl_seconds: int = TTL_SECONDS) -> None:
-    unique_keys = _unique_keys(keys)
-    write_buckets: Dict[str, List[Any]] = defaultdict(list)
-
+def _iter_placement(sharding: Any, unique_keys: Iterable[Any]) -> Iterator[Tuple[str, Any]]:
+    # Yields (node, key) for every copy: the primary, then the D-HASH alternate if there is one.
     for k in unique_keys:
         p_node = sharding.get_node(k, op="write")
-        write_buckets[p_node].append(k)
+        yield p_node, k
 
         if hasattr(sharding, "alt") and hasattr(sharding, "ch"):
             ensure_alternate(
@@ -55,22 +85,94 @@ def preload_cluster(sharding: Any, keys: List[Any], ttl_seconds: int = TTL_SECON
             )
             a_node = cast(Dict[Any, str], sharding.alt).get(k)
             if a_node and a_node != p_node:
-                write_buckets[a_node].append(k)
+                yield a_node, k
 
+
+def _placement_buckets(sharding: Any, unique_keys: List[Any]) -> Dict[str, List[Any]]:
+    write_buckets: Dict[str, List[Any]] = defaultdict(list)
+    for node, k in _iter_placement(sharding, unique_keys):
+        write_buckets[node].append(k)
+    return dict(write_buckets)
+
+
+def preload_cluster(
+    sharding: Any,
+    keys: List[Any],
+    ttl_seconds: int = TTL_SECONDS,
+    *,
+    db: int = 0,
+    cache: Optional[PreloadCache] = None,
+    payloads: Optional[PayloadFn] = None,
+    chunk_size: int = PRELOAD_CHUNK_SIZE,
+    queue_depth: int = PRELOAD_QUEUE_DEPTH,
+) -> Dict[str, Any]:
+    unique_keys = _unique_keys(keys)
     payload = b'{"preload":1}'
-    for node, node_keys in write_buckets.items():
-        try:
-            cli = redis_client_for_node(node)
-            pipe = cli.pipeline()
-            for k in node_keys:
-                pipe.set(str(k), payload, ex=ttl_seconds)
-            pipe.execute()
-        except Exception as e:
-            logger.warning("Preload write failed on %s: %s", node, e)
+
+    def _value(k: Any) -> bytes:
+        return payload if payloads is None else payloads(k)
+
+    def _write(node: str, node_keys: List[Any]) -> None:
+        pipe = redis_client_for_node(node, db=db).pipeline()
+        for k in node_keys:
+            pipe.set(k, _value(k), ex=ttl_seconds)
+        pipe.execute()
+
+    key_bytes = sum(len(_value(k)) for k in unique_keys)
+    copy_bytes = required = 0
+    touched: Set[str] = set()
+    if cache is None:
+        # Keys are written in chunks while the rest are still being routed.
+        with StreamingPreloader(_write, chunk_size, queue_depth) as loader:
+            for node, k in _iter_placement(sharding, unique_keys):
+                loader.add(node, k)
+                copy_bytes += len(_value(k))
+                required += 1
+                touched.add(node)
+        stats = loader.stats()
+    else:
+        placement = cache.placement(
+            cache.placement_key(sharding, keys),
+            lambda: _placement_buckets(sharding, unique_keys),
+        )
+        write_buckets = cache.missing(placement)
+        required = sum(len(v) for v in placement.values())
+        copy_bytes = sum(len(_value(k)) for node_keys in placement.values() for k in node_keys)
+        touched = set(write_buckets)
+
+        def _mark(node: str, node_keys: List[Any]) -> None:
+            cache.mark_written(node, node_keys, ttl_seconds)
+
+        total = sum(len(v) for v in write_buckets.values())
+        with StreamingPreloader(_write, chunk_size, queue_depth, _mark, total=total) as loader:
+            # Round-robin over the nodes so every node's writer has work from the start.
+            longest = max((len(v) for v in write_buckets.values()), default=0)
+            for start in range(0, longest, chunk_size):
+                for node, node_keys in write_buckets.items():
+                    if start < len(node_keys):
+                        loader.add_many(node, node_keys[start : start + chunk_size])
+        stats = loader.stats()
 
     logger.info(
-        "[Preload] Populated %d unique keys across %d nodes.", len(unique_keys), len(write_buckets)
+        "[Preload] Populated %d unique keys across %d nodes "
+        "(%d/%d copies written in %.1fs, %.0f copies/s).",
+        len(unique_keys),
+        len(touched),
+        stats["written"],
+        required,
+        stats["seconds"],
+        stats["copies_per_s"],
     )
+    # Copies beyond one per key are the alternates D-HASH writes for hot-key reads.
+    return {
+        "keys": len(unique_keys),
+        "copies": required,
+        "written": stats["written"],
+        "failed": stats["failed"],
+        "key_bytes": key_bytes,
+        "replica_bytes": copy_bytes - key_bytes,
+        "seconds": stats["seconds"],
+    }
 
 
 def warmup_cluster(
@@ -80,11 +182,15 @@ def warmup_cluster(
     sample_size: int = 1000,
     ratio: Optional[float] = None,
     cap: Optional[int] = None,
-) -> None:
+    db: int = 0,
+    cache: Optional[PreloadCache] = None,
+    payloads: Optional[PayloadFn] = None,
+) -> Dict[str, int]:
+    reads = ReadCounts()
     unique_keys = _unique_keys(keys)
     if not unique_keys:
         logger.info("[Warmup] Skipped because there are no keys.")
-        return
+        return reads.totals()
 
     if ratio is None:
         n = min(len(unique_keys), max(1, int(sample_size)))
@@ -119,37 +225,50 @@ def warmup_cluster(
         read_buckets[sharding.get_node(k, op="read")].append(k)
 
     payload = b'{"warm":1}'
+
+    def _value(k: Any) -> bytes:
+        return payload if payloads is None else payloads(k)
+
     for node, node_keys in write_buckets.items():
         try:
-            cli = redis_client_for_node(node)
+            cli = redis_client_for_node(node, db=db)
             pipe = cli.pipeline()
             for k in node_keys:
-                pipe.set(str(k), payload, ex=60)
+                pipe.set(k, _value(k), ex=60)
             pipe.execute()
         except Exception as e:
             logger.warning("Warmup write failed on %s: %s", node, e)
+            continue
+        if cache is not None:
+            cache.mark_written(node, node_keys, 60)
 
     for node, node_keys in read_buckets.items():
         try:
-            cli = redis_client_for_node(node)
+            cli = redis_client_for_node(node, db=db)
             pipe = cli.pipeline()
             for k in node_keys:
-                pipe.get(str(k))
-            pipe.execute()
+                pipe.get(k)
+            # Every sampled key was just written, so a miss means the read went to the wrong node.
+            reads.count(node, node_keys, pipe.execute(), _value)
         except Exception as e:
             logger.warning("Warmup read failed on %s: %s", node, e)
 
+    totals = reads.totals()
     logger.info(
-        "[Warmup] Touched %d sampled keys across %d nodes.",
+        "[Warmup] Touched %d sampled keys across %d nodes (%d hits, %d misses, %d stale).",
         len(sample),
         len(set(write_buckets) | set(read_buckets)),
+        totals["hits"],
+        totals["misses"],
+        totals["stale"],
     )
+    return totals
 
 
-def flush_databases(redis_nodes: List[str], flush_async: bool = False) -> None:
+def flush_databases(redis_nodes: List[str], flush_async: bool = False, *, db: int = 0) -> None:
     def _init_one(container: str) -> None:
         try:
-            cli = _redis_client(container)
+            cli = _redis_client(container, db)
             if flush_async:
                 try:
                     cli.flushdb(asynchronous=True)
@@ -174,3 +293,32 @@ def flush_databases(redis_nodes: List[str], flush_async: bool = False) -> None:
 
     with ThreadPoolExecutor(max_workers=len(redis_nodes)) as ex:
         list(ex.map(_init_one, redis_nodes))
+
+
+def _info_int(info: Dict[str, Any], field: str) -> int:
+    try:
+        return int(info.get(field, 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+def node_memory_stats(redis_nodes: List[str], *, db: int = 0) -> Dict[str, Dict[str, int]]:
+    # INFO memory and keyspace per node; nodes that cannot be reached are left out.
+    def _one(node: str) -> Optional[Dict[str, int]]:
+        try:
+            cli = redis_client_for_node(node, db=db)
+            memory = cast(Dict[str, Any], cli.info("memory"))
+            keyspace = cast(Dict[str, Any], cli.info("keyspace")).get(f"db{db}") or {}
+        except Exception as e:
+            logger.warning("Redis(%s) INFO failed: %s", node, e)
+            return None
+        return {
+            "used_memory": _info_int(memory, "used_memory"),
+            "used_memory_dataset": _info_int(memory, "used_memory_dataset"),
+            "keys": _info_int(keyspace, "keys"),
+            "expires": _info_int(keyspace, "expires"),
+        }
+
+    with ThreadPoolExecutor(max_workers=max(1, len(redis_nodes))) as ex:
+        results = list(ex.map(_one, redis_nodes))
+    return {node: stats for node, stats in zip(redis_nodes, results) if stats is not None}
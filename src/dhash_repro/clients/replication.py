@@ -0,0 +1,159 @@
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Union
+
+from ..config.settings import REPLICATION_MODES
+from ..workloads.values import PayloadFn
+from .redis_client import redis_client_for_node
+
+logger = logging.getLogger(__name__)
+
+ReplicaSender = Callable[[str, List[Any]], None]
+
+
+def redis_replica_sender(
+    payload: Union[bytes, PayloadFn], ex_seconds: int, db: int = 0
+) -> ReplicaSender:
+    def _send(node: str, keys: List[Any]) -> None:
+        pipe = redis_client_for_node(node, db=db).pipeline()
+        for k in keys:
+            pipe.set(k, payload if isinstance(payload, bytes) else payload(k), ex=ex_seconds)
+        pipe.execute()
+
+    return _send
+
+
+class ReplicationQueue:
+    def __init__(
+        self,
+        send: ReplicaSender,
+        max_lag_seconds: float = 0.05,
+        max_pending: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_lag_seconds <= 0:
+            raise ValueError("max_lag_seconds must be positive.")
+        if max_pending < 1:
+            raise ValueError("max_pending must be at least 1.")
+        self.send = send
+        self.max_lag_seconds = float(max_lag_seconds)
+        self.max_pending = int(max_pending)
+        self.clock = clock
+        self._pending: Deque[Tuple[str, Any, float]] = deque()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._inflight = 0
+        self.replicated = 0
+        self.failed = 0
+        self.stalls = 0
+        self.max_lag = 0.0
+
+    def start(self) -> "ReplicationQueue":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="dhash-replication", daemon=True)
+            self._thread.start()
+        return self
+
+    def __enter__(self) -> "ReplicationQueue":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _over_limit(self) -> bool:
+        if len(self._pending) >= self.max_pending:
+            return True
+        return bool(self._pending) and (self.clock() - self._pending[0][2] >= self.max_lag_seconds)
+
+    def _drain_pending(self) -> List[Tuple[str, Any, float]]:
+        batch = list(self._pending)
+        self._pending.clear()
+        return batch
+
+    def submit(self, node: str, key: Any) -> None:
+        overflow: List[Tuple[str, Any, float]] = []
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("ReplicationQueue is closed.")
+            if self._over_limit():
+                # Back-pressure: the writer waits instead of letting replicas fall further behind.
+                self.stalls += 1
+                if self._thread is None:
+                    overflow = self._drain_pending()
+                else:
+                    self._cond.notify_all()
+                    while self._over_limit() and not self._closed:
+                        self._cond.wait(self.max_lag_seconds)
+            self._pending.append((node, key, self.clock()))
+            self._cond.notify_all()
+        if overflow:
+            self._apply(overflow)
+
+    def _take_batch(self) -> List[Tuple[str, Any, float]]:
+        with self._cond:
+            while not self._pending and not self._closed:
+                self._cond.wait(self.max_lag_seconds / 2)
+            batch = self._drain_pending()
+            self._inflight = len(batch)
+            return batch
+
+    def _apply(self, batch: List[Tuple[str, Any, float]]) -> None:
+        by_node: Dict[str, List[Tuple[Any, float]]] = defaultdict(list)
+        for node, key, queued_at in batch:
+            by_node[node].append((key, queued_at))
+
+        for node, items in by_node.items():
+            try:
+                self.send(node, [k for k, _ in items])
+            except Exception as e:
+                logger.warning("Replication to %s failed: %s", node, e)
+                self.failed += len(items)
+                continue
+            done = self.clock()
+            self.replicated += len(items)
+            self.max_lag = max(self.max_lag, done - min(t for _, t in items))
+
+    def _run(self) -> None:
+        while True:
+            batch = self._take_batch()
+            if batch:
+                self._apply(batch)
+            with self._cond:
+                self._inflight = 0
+                self._cond.notify_all()
+                if self._closed and not self._pending:
+                    return
+
+    def flush(self) -> None:
+        if self._thread is None:
+            with self._cond:
+                batch = self._drain_pending()
+            self._apply(batch)
+            return
+        with self._cond:
+            while self._pending or self._inflight:
+                self._cond.wait(self.max_lag_seconds)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        else:
+            self._apply(self._drain_pending())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "replicated": self.replicated,
+            "failed": self.failed,
+            "stalls": self.stalls,
+            "max_lag_ms": self.max_lag * 1000.0,
+        }
+
+
+__all__ = ["REPLICATION_MODES", "ReplicaSender", "ReplicationQueue", "redis_replica_sender"]
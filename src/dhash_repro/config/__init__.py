@@ -0,0 +1,3 @@
+from .settings import ExperimentSettings, apply_overrides, load_settings_file, settings_from_env
+
+__all__ = ["ExperimentSettings", "apply_overrides", "load_settings_file", "settings_from_env"]
@@ -1,10 +1,7 @@
 import importlib.util
 import logging
 import platform
-from typing import Any, Dict, List
-
-import numpy as np
-from numpy.random import default_rng
+from typing import TYPE_CHECKING, Any, Dict, List
 
 from dhash.config import D_HASH_REPLICATION_FACTOR, VIRTUAL_POINTS_PER_NODE
 
@@ -26,14 +23,27 @@ DATASET_DEFAULTS: Dict[str, Dict[str, float]] = {
 
 SEED: int = 1337
 
-NP_RNG = default_rng(SEED)
+if TYPE_CHECKING:
+    from numpy.random import Generator
+
+# Created on first access so that importing the config does not pull in numpy.
+NP_RNG: "Generator"
 
 
 def reset_np_rng(seed: int) -> None:
     global NP_RNG
+    from numpy.random import default_rng
+
     NP_RNG = default_rng(seed)
 
 
+def __getattr__(name: str) -> Any:
+    if name == "NP_RNG":
+        reset_np_rng(SEED)
+        return NP_RNG
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def setup_logging(level: int = logging.INFO) -> None:
     logging.basicConfig(
         level=level, format="%(asctime)s [%(levelname)s] %(message)s", datefmt="%H:%M:%S"
@@ -43,17 +53,24 @@ def setup_logging(level: int = logging.INFO) -> None:
 logger = logging.getLogger(__name__)
 
 
-def runtime_env_metadata(repeats: int = NUM_REPEATS) -> Dict[str, Any]:
-    import redis as _redis_pkg
+def _package_version(name: str) -> str:
+    import importlib.metadata
+
+    try:
+        return importlib.metadata.version(name)
+    except importlib.metadata.PackageNotFoundError:
+        return "unavailable"
 
+
+def runtime_env_metadata(repeats: int = NUM_REPEATS) -> Dict[str, Any]:
     hiredis_spec = importlib.util.find_spec("hiredis")
     hiredis_enabled = hiredis_spec is not None
 
     return {
         "seed": SEED,
         "python": platform.python_version(),
-        "numpy": np.__version__,
-        "redis_py": _redis_pkg.__version__,
+        "numpy": _package_version("numpy"),
+        "redis_py": _package_version("redis"),
         "hiredis": hiredis_enabled,
         "nodes": ",".join(NODES),
         "virtual_points_per_node": VIRTUAL_POINTS_PER_NODE,
@@ -0,0 +1,226 @@
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field, fields, replace
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional
+
+from .defaults import (
+    ABLAT_THRESHOLDS,
+    DEFAULT_DATASET,
+    NODES,
+    PIPELINE_SWEEP,
+    VALUE_BYTES,
+    ZIPF_ALPHAS,
+)
+
+MODES = ("all", "pipeline", "zipf", "ablation")
+REPLICATION_MODES = ("off", "sync", "async")
+FAULT_SCENARIOS = ("none", "slow", "down", "recover")
+VALUE_SIZE_DISTRIBUTIONS = ("fixed", "uniform", "lognormal", "pareto", "trace")
+# Settings that only choose which cells run, or how and where they run, not what a cell measures.
+_UNFINGERPRINTED = (
+    "mode",
+    "repeats",
+    "concurrency",
+    "routing_stats",
+    "output_format",
+    "output_dir",
+)
+
+
+@dataclass(frozen=True)
+class ExperimentSettings:
+    mode: str = "all"
+    alpha: float = 1.5
+    repeats: int = 1
+    dataset: str = DEFAULT_DATASET
+    nodes: List[str] = field(default_factory=lambda: list(NODES))
+    pipeline_sweep: List[int] = field(default_factory=lambda: list(PIPELINE_SWEEP))
+    zipf_alphas: List[float] = field(default_factory=lambda: list(ZIPF_ALPHAS))
+    ablation_thresholds: List[int] = field(default_factory=lambda: list(ABLAT_THRESHOLDS))
+    dataset_params: Dict[str, float] = field(default_factory=dict)
+    workload_size: Optional[int] = None
+    workload: str = "zipf"
+    workload_params: Dict[str, float] = field(default_factory=dict)
+    value_bytes: int = VALUE_BYTES
+    value_sizes: str = "fixed"
+    near_cache_size: int = 0
+    near_cache_ttl: float = 1.0
+    write_fraction: Optional[float] = None
+    write_replication: str = "off"
+    timeseries_interval: float = 0.0
+    fault_scenario: str = "none"
+    fault_node: Optional[str] = None
+    fault_params: Dict[str, float] = field(default_factory=dict)
+    concurrency: int = 1
+    reuse_preload: bool = True
+    memory_stats: bool = False
+    routing_stats: bool = False
+    output_format: str = "csv"
+    output_dir: str = "persistence"
+
+    def validate(self) -> "ExperimentSettings":
+        if self.mode not in MODES:
+            raise ValueError(f"Unsupported mode: {self.mode}. Expected one of {list(MODES)}")
+        if not self.nodes:
+            raise ValueError("At least one node is required.")
+        if self.repeats < 1:
+            raise ValueError("repeats must be at least 1.")
+        if self.concurrency < 1:
+            raise ValueError("concurrency must be at least 1.")
+        if self.memory_stats and self.concurrency != 1:
+            raise ValueError(
+                "memory_stats needs concurrency 1; INFO memory covers every DB on a node."
+            )
+        if self.value_bytes < 0:
+            raise ValueError("value_bytes must not be negative.")
+        if self.value_sizes not in VALUE_SIZE_DISTRIBUTIONS:
+            raise ValueError(
+                f"Unsupported value_sizes: {self.value_sizes}. "
+                f"Expected one of {list(VALUE_SIZE_DISTRIBUTIONS)}"
+            )
+        if self.near_cache_size < 0:
+            raise ValueError("near_cache_size must not be negative.")
+        if self.write_fraction is not None and not 0.0 <= self.write_fraction <= 1.0:
+            raise ValueError("write_fraction must be between 0 and 1.")
+        if self.write_replication not in REPLICATION_MODES:
+            raise ValueError(
+                f"Unsupported write_replication: {self.write_replication}. "
+                f"Expected one of {list(REPLICATION_MODES)}"
+            )
+        if self.timeseries_interval < 0:
+            raise ValueError("timeseries_interval must not be negative.")
+        if self.workload_size is not None and self.workload_size < 1:
+            raise ValueError("workload_size must be positive.")
+        if self.fault_scenario != "none":
+            from ..benchmark.faults import resolve_fault_params
+
+            resolve_fault_params(self.fault_scenario, self.fault_params)
+            if self.concurrency != 1:
+                raise ValueError("Fault scenarios need concurrency 1; they reroute a shared node.")
+            if self.fault_node is not None and self.fault_node not in self.nodes:
+                raise ValueError(f"fault_node {self.fault_node} is not one of the nodes.")
+        elif self.fault_params:
+            raise ValueError("fault_params need a fault_scenario.")
+        from ..workloads.dynamic import resolve_workload_params
+
+        resolve_workload_params(self.workload, self.workload_size or 1, self.workload_params)
+        unknown = set(self.dataset_params) - {"B", "W", "T", "rho"}
+        if unknown:
+            raise ValueError(f"Unknown dataset parameters: {sorted(unknown)}")
+        return self
+
+    def fingerprint(self) -> str:
+        # Short hash of every setting that changes a cell's result row.
+        values = {f.name: getattr(self, f.name) for f in fields(self)}
+        for name in _UNFINGERPRINTED:
+            values.pop(name)
+        raw = json.dumps(values, sort_keys=True, default=str)
+        return hashlib.blake2b(raw.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _parse_bool(raw: str) -> bool:
+    return raw.strip().lower() not in ("0", "false", "no", "off", "")
+
+
+def _parse_list(raw: Any, item_type: type) -> List[Any]:
+    if isinstance(raw, str):
+        raw = [part for part in raw.split(",") if part.strip()]
+    return [item_type(v.strip() if isinstance(v, str) else v) for v in raw]
+
+
+def _coerce(name: str, raw: Any) -> Any:
+    if name == "nodes":
+        return _parse_list(raw, str)
+    if name in ("pipeline_sweep", "ablation_thresholds"):
+        return _parse_list(raw, int)
+    if name == "zipf_alphas":
+        return _parse_list(raw, float)
+    if name in ("dataset_params", "workload_params", "fault_params"):
+        if isinstance(raw, str):
+            raw = dict(part.split("=", 1) for part in raw.split(",") if part.strip())
+        return {str(k).strip(): float(v) for k, v in dict(raw).items()}
+    if name in (
+        "mode",
+        "dataset",
+        "output_format",
+        "write_replication",
+        "workload",
+        "value_sizes",
+        "fault_scenario",
+    ):
+        return str(raw).strip().lower()
+    if name == "output_dir":
+        return str(raw)
+    if name == "fault_node":
+        return None if raw is None else str(raw).strip()
+    if name in ("alpha", "near_cache_ttl", "timeseries_interval"):
+        return float(raw)
+    if name in ("repeats", "value_bytes", "concurrency", "near_cache_size"):
+        return int(raw)
+    if name == "workload_size":
+        return None if raw is None else int(raw)
+    if name == "write_fraction":
+        return None if raw is None else float(raw)
+    if name in ("reuse_preload", "memory_stats", "routing_stats"):
+        return _parse_bool(raw) if isinstance(raw, str) else bool(raw)
+    raise ValueError(f"Unknown setting: {name}")
+
+
+def apply_overrides(
+    settings: ExperimentSettings, overrides: Mapping[str, Any]
+) -> ExperimentSettings:
+    known = {f.name for f in fields(ExperimentSettings)}
+    changes: Dict[str, Any] = {}
+    for name, raw in overrides.items():
+        key = name.replace("-", "_")
+        if key not in known:
+            raise ValueError(f"Unknown setting: {name}")
+        if raw is None and key not in ("workload_size", "write_fraction"):
+            continue
+        if key in ("dataset_params", "workload_params", "fault_params"):
+            merged = dict(changes.get(key, getattr(settings, key)))
+            merged.update(_coerce(key, raw))
+            changes[key] = merged
+        else:
+            changes[key] = _coerce(key, raw)
+    return replace(settings, **changes)
+
+
+_ENV_VARS: Dict[str, str] = {
+    "mode": "DHASH_MODE",
+    "alpha": "DHASH_ALPHA",
+    "repeats": "DHASH_REPEATS",
+    "dataset": "DHASH_DATASET",
+    "workload": "DHASH_WORKLOAD",
+    "nodes": "DHASH_NODES",
+    "concurrency": "DHASH_CONCURRENCY",
+    "reuse_preload": "DHASH_REUSE_PRELOAD",
+    "output_format": "DHASH_OUTPUT_FORMAT",
+}
+
+
+def settings_from_env(base: Optional[ExperimentSettings] = None) -> ExperimentSettings:
+    overrides = {name: os.environ[var] for name, var in _ENV_VARS.items() if os.getenv(var)}
+    return apply_overrides(base or ExperimentSettings(), overrides)
+
+
+def load_settings_file(path: str) -> Dict[str, Any]:
+    p = Path(path)
+    suffix = p.suffix.lower()
+    if suffix == ".toml":
+        import tomllib
+
+        with open(p, "rb") as f:
+            data: Dict[str, Any] = tomllib.load(f)
+    elif suffix == ".json":
+        with open(p, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    else:
+        raise ValueError(f"Unsupported config file type: {path}. Use .toml or .json")
+    # Allow the settings to live under an [experiment] table.
+    section = data.get("experiment", data)
+    if not isinstance(section, dict):
+        raise ValueError(f"Config file must contain a table of settings: {path}")
+    return section
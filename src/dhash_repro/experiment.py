@@ -1,33 +1,61 @@
 import csv
+import json
 import logging
 import os
 import re
 import zipfile
 from collections import Counter
+from contextlib import ExitStack
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple
-
-from dhash import ConsistentHashing, DHash, RendezvousHashing, WeightedConsistentHashing
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from dhash import (
+    AdaptiveDHash,
+    ConsistentHashing,
+    DHash,
+    RateDHash,
+    RendezvousHashing,
+    SlotRouter,
+    WeightedConsistentHashing,
+)
+from dhash.routing.failover import FailoverRouter
 from dhash.config import VIRTUAL_POINTS_PER_NODE
-from .benchmark.collectors import benchmark_cluster, load_stddev
-from .clients.redis_client import flush_databases, preload_cluster, warmup_cluster
+from .benchmark.collectors import LATENCY_HIST_BOUNDS_US, benchmark_cluster, load_stddev
+from .benchmark.faults import FaultInjector
+from .benchmark.timeseries import IntervalRecorder
+from .clients.near_cache import NearCache
+from .clients.preload_cache import PreloadCache
+from .clients.redis_client import (
+    flush_databases,
+    node_memory_stats,
+    preload_cluster,
+    warmup_cluster,
+)
 from .config.defaults import (
-    ABLAT_THRESHOLDS,
     DATASET_DEFAULTS,
-    DEFAULT_DATASET,
     NODES,
-    PIPELINE_SWEEP,
     SEED,
-    ZIPF_ALPHAS,
-    reset_np_rng,
+    VALUE_BYTES,
     runtime_env_metadata,
 )
-from .persistence.writer import save_to_csv
-from .workloads.zipf import generate_zipf_workload
+from .config.settings import ExperimentSettings
+from .persistence.writer import ResultWriter, save_to_csv
+from .scheduler import Checkpoint, ExperimentCell, WorkloadCache, run_cells
+from .workloads import encode_keys
+from .workloads.values import PayloadFn, value_payloads
 
 logger = logging.getLogger(__name__)
 
-ALL_MODES: Tuple[str, ...] = ("Consistent Hashing", "Weighted CH", "Rendezvous", "D-HASH")
+ALL_MODES: Tuple[str, ...] = (
+    "Consistent Hashing",
+    "Weighted CH",
+    "Rendezvous",
+    "Redis Cluster",
+    "D-HASH",
+)
+AUTO_MODE = "D-HASH Auto"
+RATE_MODE = "D-HASH Rate"
+SLOTS_MODE = "D-HASH Slots"
 
 _CLF_RE = re.compile(
     r"^(?P<host>\S+) \S+ \S+ \[(?P<time>.*?)\] "
@@ -44,8 +72,8 @@ def resolve_algorithms(stage: str, algos: str) -> List[str]:
     return list(ALL_MODES)
 
 
-def _resolve_dataset() -> str:
-    dataset = os.getenv("DHASH_DATASET", DEFAULT_DATASET).strip().lower()
+def _resolve_dataset(name: str) -> str:
+    dataset = name.strip().lower()
     if dataset not in DATASET_DEFAULTS:
         raise ValueError(
             f"Unsupported dataset: {dataset}. Expected one of {sorted(DATASET_DEFAULTS)}"
@@ -144,17 +172,29 @@ def _candidate_paths(dataset: str) -> List[Path]:
     return uniq
 
 
-def _load_ranked_keys_from_trace(trace_path: str) -> Tuple[List[str], int]:
+def _record_size(sizes: Optional[Dict[str, int]], key: str, raw: str) -> None:
+    # The largest response seen stands for the value size; "-" and 304s carry no body.
+    if sizes is not None and raw.isdigit():
+        size = int(raw)
+        if size > sizes.get(key, 0):
+            sizes[key] = size
+
+
+def _load_ranked_keys_from_trace(
+    trace_path: str, sizes: Optional[Dict[str, int]] = None
+) -> Tuple[List[str], int]:
     counts: Counter[str] = Counter()
     total_requests = 0
 
     with open(trace_path, "r", encoding="utf-8") as f:
         for raw in f:
-            key = raw.strip()
+            # A line is a key, optionally followed by a tab and the value size in bytes.
+            key, _, size = raw.strip().partition("\t")
             if not key:
                 continue
             counts[key] += 1
             total_requests += 1
+            _record_size(sizes, key, size.strip())
 
     if not counts:
         raise ValueError(f"Trace file is empty: {trace_path}")
@@ -179,7 +219,9 @@ def _iter_nasa_log_lines(path: Path) -> Iterable[str]:
                 yield line
 
 
-def _load_ranked_keys_from_nasa_raw(path: str) -> Tuple[List[str], int]:
+def _load_ranked_keys_from_nasa_raw(
+    path: str, sizes: Optional[Dict[str, int]] = None
+) -> Tuple[List[str], int]:
     counts: Counter[str] = Counter()
     total_requests = 0
 
@@ -192,6 +234,7 @@ def _load_ranked_keys_from_nasa_raw(path: str) -> Tuple[List[str], int]:
             continue
         counts[url] += 1
         total_requests += 1
+        _record_size(sizes, url, m.group("size"))
 
     if not counts:
         raise ValueError(f"No valid NASA URL keys parsed from: {path}")
@@ -242,7 +285,9 @@ def _load_ranked_keys_from_ebay_raw(
     return ranked_keys, total_requests
 
 
-def _load_dataset_workload_base(dataset: str) -> Tuple[List[str], int]:
+def _load_dataset_workload_base(
+    dataset: str, sizes: Optional[Dict[str, int]] = None
+) -> Tuple[List[str], int]:
     trace_env = _trace_env_var(dataset)
     raw_env = _raw_env_var(dataset)
 
@@ -250,7 +295,7 @@ def _load_dataset_workload_base(dataset: str) -> Tuple[List[str], int]:
     trace_path = os.getenv(trace_env, "").strip()
     if trace_path:
         logger.info("[%s] Loading processed trace from %s", dataset, trace_path)
-        return _load_ranked_keys_from_trace(trace_path)
+        return _load_ranked_keys_from_trace(trace_path, sizes)
 
     # 2) automatic search
     for candidate in _candidate_paths(dataset):
@@ -262,15 +307,15 @@ def _load_dataset_workload_base(dataset: str) -> Tuple[List[str], int]:
         if dataset == "nasa":
             if suffix == ".txt":
                 logger.info("[%s] Loading processed trace from %s", dataset, candidate)
-                return _load_ranked_keys_from_trace(str(candidate))
+                return _load_ranked_keys_from_trace(str(candidate), sizes)
             if suffix in {".zip", ".log"}:
                 logger.info("[%s] Loading raw NASA dataset from %s", dataset, candidate)
-                return _load_ranked_keys_from_nasa_raw(str(candidate))
+                return _load_ranked_keys_from_nasa_raw(str(candidate), sizes)
 
         elif dataset == "ebay":
             if suffix == ".txt":
                 logger.info("[%s] Loading processed trace from %s", dataset, candidate)
-                return _load_ranked_keys_from_trace(str(candidate))
+                return _load_ranked_keys_from_trace(str(candidate), sizes)
             if suffix in {".csv", ".zip"}:
                 logger.info("[%s] Loading raw eBay dataset from %s", dataset, candidate)
                 return _load_ranked_keys_from_ebay_raw(str(candidate))
@@ -282,167 +327,479 @@ def _load_dataset_workload_base(dataset: str) -> Tuple[List[str], int]:
     )
 
 
-def run_single_mode(
-    keys: List[Any],
+def build_router(
     mode_name: str,
-    pipeline_size: int,
+    nodes: List[str],
+    pipeline_size: int = 200,
     dhash_params: Optional[Dict[str, int]] = None,
-    preload_keys: Optional[List[Any]] = None,
-) -> Tuple[float, float, float, float, float]:
-    sh: Any
-
+) -> Any:
     if mode_name == "Consistent Hashing":
-        sh = ConsistentHashing(NODES, replicas=VIRTUAL_POINTS_PER_NODE)
-    elif mode_name == "Weighted CH":
-        sh = WeightedConsistentHashing(
-            NODES,
-            {n: 1.0 + 0.1 * i for i, n in enumerate(NODES)},
+        return ConsistentHashing(nodes, replicas=VIRTUAL_POINTS_PER_NODE)
+    if mode_name == "Weighted CH":
+        return WeightedConsistentHashing(
+            nodes,
+            {n: 1.0 + 0.1 * i for i, n in enumerate(nodes)},
             base_replicas=VIRTUAL_POINTS_PER_NODE,
         )
-    elif mode_name == "Rendezvous":
-        sh = RendezvousHashing(NODES)
-    elif mode_name == "D-HASH":
+    if mode_name == "Rendezvous":
+        return RendezvousHashing(nodes)
+    if mode_name == "Redis Cluster":
+        return SlotRouter(nodes)
+    if mode_name == SLOTS_MODE:
         params = dhash_params or {"T": 300, "W": pipeline_size}
-        sh = DHash(NODES, hot_key_threshold=int(params["T"]), window_size=int(params["W"]))
-    else:
-        raise ValueError(f"Unknown mode: {mode_name}")
+        return DHash(
+            nodes,
+            hot_key_threshold=int(params["T"]),
+            window_size=int(params["W"]),
+            ring=SlotRouter(nodes),
+        )
+    if mode_name in ("D-HASH", AUTO_MODE, RATE_MODE):
+        params = dhash_params or {"T": 300, "W": pipeline_size}
+        router_cls = {AUTO_MODE: AdaptiveDHash, RATE_MODE: RateDHash}.get(mode_name, DHash)
+        return router_cls(nodes, hot_key_threshold=int(params["T"]), window_size=int(params["W"]))
+    raise ValueError(f"Unknown mode: {mode_name}")
 
-    warm_keys = preload_keys if preload_keys is not None else list(dict.fromkeys(keys))
 
-    flush_databases(NODES, flush_async=False)
+def run_single_mode(
+    keys: List[Any],
+    mode_name: str,
+    pipeline_size: int,
+    dhash_params: Optional[Dict[str, int]] = None,
+    preload_keys: Optional[List[Any]] = None,
+    db: int = 0,
+    preload_cache: Optional[PreloadCache] = None,
+    nodes: Optional[List[str]] = None,
+    value_bytes: int = VALUE_BYTES,
+    near_cache_size: int = 0,
+    near_cache_ttl: float = 1.0,
+    write_fraction: Optional[float] = None,
+    write_replication: str = "off",
+    timeseries_interval: float = 0.0,
+    payloads: Optional[PayloadFn] = None,
+    fault_scenario: str = "none",
+    fault_node: Optional[str] = None,
+    fault_params: Optional[Dict[str, float]] = None,
+    memory_stats: bool = False,
+    routing_stats: bool = False,
+) -> Dict[str, Any]:
+    nodes = list(nodes) if nodes is not None else list(NODES)
+    sh = build_router(mode_name, nodes, pipeline_size, dhash_params)
 
-    preload_cluster(sh, warm_keys)
-    warmup_cluster(sh, warm_keys)
+    warm_keys = preload_keys if preload_keys is not None else list(dict.fromkeys(keys))
 
-    metrics = benchmark_cluster(keys, sh, pipeline_size=pipeline_size)
+    if preload_cache is None or preload_cache.is_empty:
+        flush_databases(nodes, flush_async=False, db=db)
+
+    # INFO memory covers the whole server, so it only describes this cell right after a flush.
+    measure_memory = memory_stats and (preload_cache is None or preload_cache.is_empty)
+    mem_before = node_memory_stats(nodes, db=db) if measure_memory else {}
+    placed = preload_cluster(sh, warm_keys, db=db, cache=preload_cache, payloads=payloads)
+    warmup_cluster(sh, warm_keys, db=db, cache=preload_cache, payloads=payloads)
+
+    if routing_stats and isinstance(sh, DHash):
+        sh.enable_stats()
+    near_cache = (
+        NearCache(sh, capacity=near_cache_size, ttl_seconds=near_cache_ttl)
+        if near_cache_size > 0
+        else None
+    )
+    recorder = (
+        IntervalRecorder(nodes, timeseries_interval, LATENCY_HIST_BOUNDS_US)
+        if timeseries_interval > 0
+        else None
+    )
+    with ExitStack() as stack:
+        client: Any = sh
+        on_start: Optional[Callable[[], None]] = None
+        if fault_scenario != "none":
+            # The fault only covers the measured run; preload and warmup see a healthy cluster.
+            injector = stack.enter_context(
+                FaultInjector(fault_scenario, fault_node or nodes[-1], fault_params)
+            )
+            client = FailoverRouter(sh)
+            # The down/up timers start with the first request, not while the keys are routed.
+            on_start = injector.arm
+        metrics = benchmark_cluster(
+            keys,
+            client,
+            pipeline_size=pipeline_size,
+            value_bytes=value_bytes,
+            db=db,
+            nodes=nodes,
+            near_cache=near_cache,
+            write_fraction=write_fraction,
+            write_replication=write_replication,
+            recorder=recorder,
+            payloads=payloads,
+            on_start=on_start,
+        )
+        if fault_scenario != "none":
+            logger.info(
+                "    -> %s fault %s: events=%s errors=%d rerouted=%d failovers=%d",
+                mode_name,
+                fault_scenario,
+                injector.events,
+                metrics["errors"],
+                metrics["rerouted"],
+                client.failovers,
+            )
+    mem_after = node_memory_stats(nodes, db=db) if measure_memory else {}
 
     thr = float(metrics["throughput_ops_s"])
     avg = float(metrics["avg_ms"])
     p95 = float(metrics["p95_ms"])
     p99 = float(metrics["p99_ms"])
-    sd = load_stddev(metrics["node_load"])
+    sd = load_stddev(metrics["node_load"], nodes)
+
+    if routing_stats and isinstance(sh, DHash):
+        snap = sh.stats_snapshot(top_n=3)
+        logger.info(
+            "    -> %s routing: alt_reads=%d/%d hot_keys=%d alternates=%d top=%s",
+            mode_name,
+            snap["alternate_reads"],
+            snap["reads"],
+            snap["keys_over_threshold"],
+            snap["alternates"],
+            [(e["key"], e["reads"]) for e in snap["top_keys"]],
+        )
+
+    tuned: Dict[str, Any] = {}
+    if recorder is not None:
+        # Kept apart from the summary row; run_experiments writes these to their own file.
+        tuned["Intervals"] = recorder.rows()
+    if isinstance(sh, AdaptiveDHash):
+        # The auto arm reports where the controller settled instead of its starting point.
+        tuned.update(T=sh.T, W=sh.W)
+        logger.info("    -> %s tuned T/W over time: %s", mode_name, sh.history)
+
+    used_after = sum(m["used_memory"] for m in mem_after.values())
+    used_before = sum(m["used_memory"] for m in mem_before.values())
+    measured = bool(mem_before and mem_after)
+    memory = {
+        # Left empty unless memory_stats is on; see run_experiments.
+        "MemUsedMB": used_after / 1e6 if measured else None,
+        "MemDeltaMB": (used_after - used_before) / 1e6 if measured else None,
+        "StoredKeys": sum(m["keys"] for m in mem_after.values()) if measured else None,
+        "NodeMemMB": (
+            [mem_after.get(n, {}).get("used_memory", 0) / 1e6 for n in nodes] if measured else []
+        ),
+        "CopyRatio": placed["copies"] / placed["keys"] if placed["keys"] else 0.0,
+        "ReplicaMB": placed["replica_bytes"] / 1e6,
+        "WriteMB": metrics["bytes_written"] / 1e6,
+        "ReadMB": metrics["bytes_read"] / 1e6,
+        "BandwidthMBs": float(metrics["bandwidth_mb_s"]),
+    }
 
     logger.info(
-        "    -> %s (B=%d): Thr=%.1f, P99=%.3fms, LoadSD=%.0f",
+        "    -> %s (B=%d): Thr=%.1f, P99=%.3fms, Hit=%.4f (stale=%d), LoadSD=%.0f, NearHit=%.3f, "
+        "BW=%.1fMB/s, Mem=%s, ReplicaMB=%.2f",
         mode_name,
         pipeline_size,
         thr,
         p99,
+        metrics["hit_ratio"],
+        metrics["read_stale"],
         sd,
+        metrics["near_cache_hit_ratio"],
+        memory["BandwidthMBs"],
+        (
+            f"{used_after / 1e6:.1f}MB (+{(used_after - used_before) / 1e6:.1f}MB)"
+            if measured
+            else "-"
+        ),
+        memory["ReplicaMB"],
     )
-    return thr, avg, p95, p99, sd
-
-
-def run_experiments(mode: str, alpha: float, repeats: int) -> None:
-    os.makedirs("persistence", exist_ok=True)
-
-    dataset = _resolve_dataset()
-    cfg = DATASET_DEFAULTS[dataset]
-    ranked_keys, trace_size = _load_dataset_workload_base(dataset)
-
+    return {
+        "Thr": thr,
+        "Avg": avg,
+        "P95": p95,
+        "P99": p99,
+        "HitRatio": float(metrics["hit_ratio"]),
+        "AltHitRatio": float(metrics["alt_hit_ratio"]),
+        "Misses": int(metrics["read_misses"]),
+        "Stale": int(metrics["read_stale"]),
+        "LoadSD": sd,
+        "NearHitRatio": float(metrics["near_cache_hit_ratio"]),
+        "WriteFanout": float(metrics["write_fanout"]),
+        "ReplLagMs": float(metrics["replication_lag_ms"]),
+        "LatencyHist": list(metrics["latency_hist"]),
+        "Errors": int(metrics["errors"]),
+        "ErrorRate": float(metrics["error_rate"]),
+        "Rerouted": int(metrics["rerouted"]),
+        **memory,
+        **tuned,
+    }
+
+
+def resolve_dataset_params(settings: ExperimentSettings) -> Dict[str, float]:
+    cfg = dict(DATASET_DEFAULTS[_resolve_dataset(settings.dataset)])
+    cfg.update(settings.dataset_params)
+    return cfg
+
+
+def build_experiment_plan(
+    settings: ExperimentSettings,
+    cfg: Dict[str, float],
+) -> Dict[str, List[ExperimentCell]]:
+    mode = settings.mode
+    alpha = settings.alpha
+    repeats = settings.repeats
     optimal_B = int(cfg["B"])
     optimal_W = int(cfg["W"])
     optimal_T = int(cfg["T"])
     sweep_rho = float(cfg["rho"])
 
+    plan: Dict[str, List[ExperimentCell]] = {}
+
     if mode in ("pipeline", "all"):
-        results: List[Dict[str, Any]] = []
-        for B in PIPELINE_SWEEP:
+        cells: List[ExperimentCell] = []
+        for B in settings.pipeline_sweep:
             for rep in range(repeats):
-                reset_np_rng(SEED + rep)
-                kz = generate_zipf_workload(ranked_keys, size=trace_size, alpha=alpha)
                 for m in resolve_algorithms("pipeline", "auto"):
-                    d_p = (
-                        {"T": max(30, int(round(sweep_rho * B))), "W": B} if m == "D-HASH" else None
-                    )
-                    t, avg, p95, p99, s = run_single_mode(
-                        kz,
-                        m,
-                        B,
-                        d_p,
-                        preload_keys=ranked_keys,
+                    is_dhash = m == "D-HASH"
+                    cells.append(
+                        ExperimentCell(
+                            stage="pipeline",
+                            mode=m,
+                            alpha=alpha,
+                            pipeline=B,
+                            T=max(30, int(round(sweep_rho * B))) if is_dhash else None,
+                            W=B if is_dhash else None,
+                            rep=rep,
+                        )
                     )
-                    results.append(
-                        {
-                            "Dataset": dataset,
-                            "Mode": m,
-                            "Alpha": alpha,
-                            "Pipeline": B,
-                            "W": B if m == "D-HASH" else None,
-                            "T": d_p["T"] if d_p else None,
-                            "Thr": t,
-                            "Avg": avg,
-                            "P95": p95,
-                            "P99": p99,
-                            "LoadSD": s,
-                        }
-                    )
-        save_to_csv(results, f"persistence/{dataset}_pipeline_sweep.csv")
+        plan["pipeline"] = cells
 
     if mode in ("zipf", "all"):
-        results = []
-        for a in ZIPF_ALPHAS:
+        cells = []
+        for a in settings.zipf_alphas:
             for rep in range(repeats):
-                reset_np_rng(SEED + rep)
-                kz = generate_zipf_workload(ranked_keys, size=trace_size, alpha=a)
                 for m in resolve_algorithms("zipf", "auto"):
-                    d_p = {"T": optimal_T, "W": optimal_W} if m == "D-HASH" else None
-                    t, avg, p95, p99, s = run_single_mode(
-                        kz,
-                        m,
-                        optimal_B,
-                        d_p,
-                        preload_keys=ranked_keys,
-                    )
-                    results.append(
-                        {
-                            "Dataset": dataset,
-                            "Mode": m,
-                            "Alpha": a,
-                            "Pipeline": optimal_B,
-                            "W": optimal_W if m == "D-HASH" else None,
-                            "T": optimal_T if m == "D-HASH" else None,
-                            "Thr": t,
-                            "Avg": avg,
-                            "P95": p95,
-                            "P99": p99,
-                            "LoadSD": s,
-                        }
+                    is_dhash = m == "D-HASH"
+                    cells.append(
+                        ExperimentCell(
+                            stage="zipf",
+                            mode=m,
+                            alpha=a,
+                            pipeline=optimal_B,
+                            T=optimal_T if is_dhash else None,
+                            W=optimal_W if is_dhash else None,
+                            rep=rep,
+                        )
                     )
-        save_to_csv(results, f"persistence/{dataset}_zipf_results.csv")
+        plan["zipf"] = cells
 
     if mode in ("ablation", "all"):
-        results = []
-        for T in ABLAT_THRESHOLDS:
+        cells = []
+        for T in settings.ablation_thresholds:
             for rep in range(repeats):
-                reset_np_rng(SEED + rep)
-                kz = generate_zipf_workload(ranked_keys, size=trace_size, alpha=alpha)
-                t, avg, p95, p99, s = run_single_mode(
-                    kz,
-                    "D-HASH",
-                    optimal_B,
-                    {"T": T, "W": optimal_W},
-                    preload_keys=ranked_keys,
+                cells.append(
+                    ExperimentCell(
+                        stage="ablation",
+                        mode="D-HASH",
+                        alpha=alpha,
+                        pipeline=optimal_B,
+                        T=T,
+                        W=optimal_W,
+                        rep=rep,
+                    )
                 )
-                results.append(
-                    {
-                        "Dataset": dataset,
-                        "Alpha": alpha,
-                        "Pipeline": optimal_B,
-                        "W": optimal_W,
-                        "T": T,
-                        "Thr": t,
-                        "Avg": avg,
-                        "P95": p95,
-                        "P99": p99,
-                        "LoadSD": s,
-                    }
+        # The auto arm starts from the dataset default and tunes T and W online.
+        for rep in range(repeats):
+            cells.append(
+                ExperimentCell(
+                    stage="ablation",
+                    mode=AUTO_MODE,
+                    alpha=alpha,
+                    pipeline=optimal_B,
+                    T=optimal_T,
+                    W=optimal_W,
+                    rep=rep,
                 )
-        save_to_csv(results, f"persistence/{dataset}_threshold_ablation.csv")
+            )
+        plan["ablation"] = cells
+
+    return plan
+
+
+def estimate_cell_ops(cell: ExperimentCell, workload_size: int, unique_keys: int) -> int:
+    copies = 2 if cell.mode in ("D-HASH", AUTO_MODE, SLOTS_MODE) else 1
+    warmup = min(unique_keys, 1000) * (copies + 1)
+    return 2 * workload_size + copies * unique_keys + warmup
+
+
+def describe_plan(settings: ExperimentSettings) -> str:
+    cfg = resolve_dataset_params(settings)
+    ranked_keys, trace_size = _load_dataset_workload_base(settings.dataset)
+    workload_size = settings.workload_size or trace_size
+    plan = build_experiment_plan(settings, cfg)
+
+    lines = [
+        f"dataset={settings.dataset} workload_size={workload_size} "
+        f"unique_keys={len(ranked_keys)} workload={settings.workload} "
+        f"nodes={','.join(settings.nodes)} "
+        f"concurrency={settings.concurrency} output={settings.output_format}",
+    ]
+    total_ops = 0
+    for stage, cells in plan.items():
+        stage_ops = sum(estimate_cell_ops(c, workload_size, len(ranked_keys)) for c in cells)
+        total_ops += stage_ops
+        lines.append(f"[{stage}] {len(cells)} cells, ~{stage_ops:,} ops")
+        for c in cells:
+            lines.append(
+                f"  {c.mode:<18} alpha={c.alpha:<4} B={c.pipeline:<5} "
+                f"T={c.T if c.T is not None else '-':<5} W={c.W if c.W is not None else '-':<5} "
+                f"rep={c.rep}"
+            )
+    lines.append(f"total: {sum(len(c) for c in plan.values())} cells, ~{total_ops:,} ops")
+    return "\n".join(lines)
+
+
+_STAGE_OUTPUTS: Dict[str, str] = {
+    "pipeline": "pipeline_sweep",
+    "zipf": "zipf_results",
+    "ablation": "threshold_ablation",
+}
+
+
+def run_experiments(settings: ExperimentSettings) -> None:
+    out_dir = settings.output_dir
+    os.makedirs(out_dir, exist_ok=True)
+
+    dataset = _resolve_dataset(settings.dataset)
+    cfg = resolve_dataset_params(settings)
+    trace_sizes: Dict[str, int] = {}
+    ranked, trace_size = _load_dataset_workload_base(dataset, trace_sizes)
+    ranked_keys = encode_keys(ranked)
+    workload_size = settings.workload_size or trace_size
+    if settings.value_sizes == "trace" and not trace_sizes:
+        logger.warning(
+            "[%s] The trace has no value sizes; every key uses value_bytes=%d.",
+            dataset,
+            settings.value_bytes,
+        )
+    payloads = value_payloads(
+        ranked_keys,
+        settings.value_sizes,
+        settings.value_bytes,
+        trace_sizes=[trace_sizes.get(k) for k in ranked],
+    )
+    # Non-stationary workloads and fault runs get their own files so they do not overwrite the
+    # Zipf results.
+    prefix = dataset if settings.workload == "zipf" else f"{dataset}_{settings.workload}"
+    if settings.fault_scenario != "none":
+        prefix = f"{prefix}_{settings.fault_scenario}"
 
-    env_row = runtime_env_metadata(repeats)
+    env_row = runtime_env_metadata(settings.repeats)
     env_row.update(
-        {"dataset": dataset, "trace_requests": trace_size, "unique_keys": len(ranked_keys)}
+        {
+            "dataset": dataset,
+            "trace_requests": trace_size,
+            "workload_size": workload_size,
+            "unique_keys": len(ranked_keys),
+            "workload": settings.workload,
+            "workload_params": json.dumps(settings.workload_params, sort_keys=True),
+            "nodes": ",".join(settings.nodes),
+            "value_bytes": settings.value_bytes,
+            "value_sizes": settings.value_sizes,
+            "fault_scenario": settings.fault_scenario,
+            "fault_node": settings.fault_node or "",
+            "fault_params": json.dumps(settings.fault_params, sort_keys=True),
+            "value_bytes_total": (
+                payloads.total_bytes()
+                if payloads is not None
+                else settings.value_bytes * len(ranked_keys)
+            ),
+        }
     )
-    save_to_csv([env_row], f"persistence/{dataset}_env_metadata.csv")
+    result_metadata = dict(env_row, latency_hist_bounds_us=LATENCY_HIST_BOUNDS_US)
+
+    plan = build_experiment_plan(settings, cfg)
+    workloads = WorkloadCache(
+        ranked_keys,
+        workload_size,
+        max_entries=max(16, settings.repeats),
+        kind=settings.workload,
+        params=settings.workload_params,
+    )
+    checkpoint = Checkpoint(
+        os.path.join(out_dir, f"{prefix}_checkpoint.jsonl"), tag=settings.fingerprint()
+    )
+    preload_caches: Dict[int, PreloadCache] = {}
+
+    def _execute(cell: ExperimentCell, db: int) -> Dict[str, Any]:
+        kz = workloads.get(cell.alpha, SEED + cell.rep)
+        # Memory is measured after a flush, so reusing resident keys is off for those runs.
+        reuse = settings.reuse_preload and not settings.memory_stats
+        cache = preload_caches.setdefault(db, PreloadCache()) if reuse else None
+        metrics = run_single_mode(
+            kz,
+            cell.mode,
+            cell.pipeline,
+            cell.dhash_params,
+            preload_keys=ranked_keys,
+            db=db,
+            preload_cache=cache,
+            nodes=settings.nodes,
+            value_bytes=settings.value_bytes,
+            near_cache_size=settings.near_cache_size,
+            near_cache_ttl=settings.near_cache_ttl,
+            write_fraction=settings.write_fraction,
+            write_replication=settings.write_replication,
+            timeseries_interval=settings.timeseries_interval,
+            payloads=payloads,
+            fault_scenario=settings.fault_scenario,
+            fault_node=settings.fault_node,
+            fault_params=settings.fault_params,
+            memory_stats=settings.memory_stats,
+            routing_stats=settings.routing_stats,
+        )
+        row = cell.row_fields(dataset)
+        row.update(metrics)
+        return row
+
+    for stage, cells in plan.items():
+        logger.info(
+            "[%s] Running %d cells (concurrency=%d).", stage, len(cells), settings.concurrency
+        )
+        with ExitStack() as stack:
+            writer = stack.enter_context(
+                ResultWriter(
+                    os.path.join(out_dir, f"{prefix}_{_STAGE_OUTPUTS[stage]}"),
+                    fmt=settings.output_format,
+                    metadata=dict(result_metadata, stage=stage),
+                )
+            )
+            series: Optional[ResultWriter] = None
+            if settings.timeseries_interval > 0:
+                series = stack.enter_context(
+                    ResultWriter(
+                        os.path.join(out_dir, f"{prefix}_{_STAGE_OUTPUTS[stage]}_timeseries"),
+                        fmt=settings.output_format,
+                        metadata=dict(
+                            result_metadata,
+                            stage=stage,
+                            interval_seconds=settings.timeseries_interval,
+                            node_order=list(settings.nodes),
+                        ),
+                    )
+                )
+
+            def _emit(cell: ExperimentCell, row: Dict[str, Any]) -> None:
+                intervals = row.pop("Intervals", None) or []
+                writer.append(row)
+                if series is not None:
+                    for interval in intervals:
+                        series.append({"Cell": cell.key, **cell.row_fields(dataset), **interval})
+
+            run_cells(
+                cells,
+                _execute,
+                concurrency=settings.concurrency,
+                checkpoint=checkpoint,
+                on_result=_emit,
+            )
+
+    save_to_csv([env_row], os.path.join(out_dir, f"{prefix}_env_metadata.csv"))
+    checkpoint.clear()
     logger.info("All experiments finished for dataset=%s.", dataset)
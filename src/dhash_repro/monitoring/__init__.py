@@ -0,0 +1,3 @@
+from .prometheus import MetricsServer, render_prometheus
+
+__all__ = ["MetricsServer", "render_prometheus"]
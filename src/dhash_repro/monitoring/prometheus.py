@@ -0,0 +1,104 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+_COUNTERS: List[Tuple[str, str]] = [
+    ("reads", "Reads routed."),
+    ("writes", "Writes routed."),
+    ("primary_reads", "Reads sent to the primary node."),
+    ("alternate_reads", "Reads sent to the alternate node."),
+    ("hot_keys", "Keys whose read count reached T."),
+    ("alternates_computed", "Alternate nodes chosen."),
+    ("membership_changes", "Ring membership changes detected."),
+]
+_GAUGES: List[Tuple[str, str]] = [
+    ("T", "Hot-key threshold."),
+    ("W", "Alternation window size."),
+    ("tracked_keys", "Keys with a read count."),
+    ("keys_over_threshold", "Keys whose read count is at or above T."),
+    ("alternates", "Keys with an alternate node."),
+]
+
+
+def _label(value: Any) -> str:
+    text = value.decode("utf-8", "backslashreplace") if isinstance(value, bytes) else str(value)
+    return text.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_prometheus(snapshot: Dict[str, Any], prefix: str = "dhash") -> str:
+    lines: List[str] = []
+    for name, help_text in _COUNTERS:
+        lines.append(f"# HELP {prefix}_{name}_total {help_text}")
+        lines.append(f"# TYPE {prefix}_{name}_total counter")
+        lines.append(f"{prefix}_{name}_total {snapshot.get(name, 0)}")
+    for name, help_text in _GAUGES:
+        metric = f"{prefix}_{name.lower()}"
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} gauge")
+        lines.append(f"{metric} {snapshot.get(name, 0)}")
+
+    lines.append(f"# HELP {prefix}_node_routes_total Requests routed to each node.")
+    lines.append(f"# TYPE {prefix}_node_routes_total counter")
+    for node, count in sorted(snapshot.get("node_routes", {}).items()):
+        lines.append(f'{prefix}_node_routes_total{{node="{_label(node)}"}} {count}')
+
+    lines.append(f"# HELP {prefix}_top_key_reads Read count of the hottest keys.")
+    lines.append(f"# TYPE {prefix}_top_key_reads gauge")
+    for rank, entry in enumerate(snapshot.get("top_keys", []), start=1):
+        labels = (
+            f'rank="{rank}",key="{_label(entry["key"])}",primary="{_label(entry["primary"])}",'
+            f'alternate="{_label(entry["alternate"] or "")}"'
+        )
+        lines.append(f"{prefix}_top_key_reads{{{labels}}} {entry['reads']}")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    def __init__(
+        self, router: Any, host: str = "0.0.0.0", port: int = 9108, top_n: int = 10
+    ) -> None:
+        self.router = router
+        self.top_n = top_n
+        router.enable_stats()
+        server = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = render_prometheus(server.router.stats_snapshot(server.top_n)).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        host, port = self._httpd.server_address[:2]
+        return str(host), int(port)
+
+    def start(self) -> "MetricsServer":
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._httpd.serve_forever, name="dhash-metrics", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+
+__all__ = ["MetricsServer", "render_prometheus"]
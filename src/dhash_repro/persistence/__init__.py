@@ -0,0 +1,3 @@
+from .writer import OUTPUT_FORMATS, ResultWriter, save_to_csv
+
+__all__ = ["OUTPUT_FORMATS", "ResultWriter", "save_to_csv"]
@@ -1,6 +1,198 @@
-import pandas as pd
-from typing import Any, Dict, List
+import csv
+import json
+from typing import IO, Any, Dict, List, Optional
+
+OUTPUT_FORMATS: Dict[str, str] = {"csv": ".csv", "arrow": ".arrow", "parquet": ".parquet"}
+
+RESULT_COLUMN_TYPES: Dict[str, str] = {
+    "Dataset": "string",
+    "Mode": "string",
+    "Alpha": "float64",
+    "Pipeline": "int64",
+    "W": "int64",
+    "T": "int64",
+    "Thr": "float64",
+    "Avg": "float64",
+    "P95": "float64",
+    "P99": "float64",
+    "HitRatio": "float64",
+    "AltHitRatio": "float64",
+    "Misses": "int64",
+    "Stale": "int64",
+    "LoadSD": "float64",
+    "NearHitRatio": "float64",
+    "WriteFanout": "float64",
+    "ReplLagMs": "float64",
+    "Tuning": "string",
+    "LatencyHist": "list<int64>",
+    "NodeOps": "list<int64>",
+    "Errors": "int64",
+    "ErrorRate": "float64",
+    "Rerouted": "int64",
+    "MemUsedMB": "float64",
+    "MemDeltaMB": "float64",
+    "StoredKeys": "int64",
+    "NodeMemMB": "list<float64>",
+    "CopyRatio": "float64",
+    "ReplicaMB": "float64",
+    "WriteMB": "float64",
+    "ReadMB": "float64",
+    "BandwidthMBs": "float64",
+}
 
 
 def save_to_csv(results: List[Dict[str, Any]], filepath: str) -> None:
+    import pandas as pd
+
     pd.DataFrame(results).to_csv(filepath, index=False)
+
+
+def _require_pyarrow() -> Any:
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise RuntimeError(
+            "The 'pyarrow' package is required for arrow/parquet output. "
+            "Install it via: pip install pyarrow"
+        ) from e
+    return pa
+
+
+def _infer_column_type(values: List[Any]) -> str:
+    for v in values:
+        if v is None:
+            continue
+        if isinstance(v, bool):
+            return "bool"
+        if isinstance(v, int):
+            return "int64"
+        if isinstance(v, float):
+            return "float64"
+        if isinstance(v, (list, tuple)):
+            return "list<int64>"
+        return "string"
+    return "string"
+
+
+def _arrow_type(pa: Any, name: str) -> Any:
+    if name == "list<int64>":
+        return pa.list_(pa.int64())
+    if name == "list<float64>":
+        return pa.list_(pa.float64())
+    return {
+        "string": pa.string(),
+        "float64": pa.float64(),
+        "int64": pa.int64(),
+        "bool": pa.bool_(),
+    }[name]
+
+
+class ResultWriter:
+    def __init__(
+        self,
+        path_stem: str,
+        fmt: str = "csv",
+        metadata: Optional[Dict[str, Any]] = None,
+        batch_size: int = 32,
+    ) -> None:
+        if fmt not in OUTPUT_FORMATS:
+            raise ValueError(
+                f"Unsupported output format: {fmt}. Expected one of {list(OUTPUT_FORMATS)}"
+            )
+        self.fmt = fmt
+        self.path = path_stem + OUTPUT_FORMATS[fmt]
+        self.metadata = dict(metadata or {})
+        self.batch_size = max(1, int(batch_size))
+        self.rows_written = 0
+        self._pending: List[Dict[str, Any]] = []
+        self._columns: Optional[List[str]] = None
+        self._csv_fp: Optional[IO[str]] = None
+        self._csv: Optional[Any] = None
+        self._schema: Optional[Any] = None
+        self._arrow_sink: Optional[Any] = None
+        self._arrow: Optional[Any] = None
+        if fmt != "csv":
+            _require_pyarrow()
+
+    def __enter__(self) -> "ResultWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def append(self, row: Dict[str, Any]) -> None:
+        self._pending.append(row)
+        if self.fmt == "csv" or len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        if self._columns is None:
+            self._columns = list(self._pending[0])
+        if self.fmt == "csv":
+            self._flush_csv()
+        else:
+            self._flush_arrow()
+        self.rows_written += len(self._pending)
+        self._pending = []
+
+    def _flush_csv(self) -> None:
+        assert self._columns is not None
+        if self._csv is None:
+            self._csv_fp = open(self.path, "w", encoding="utf-8", newline="")
+            self._csv = csv.DictWriter(self._csv_fp, fieldnames=self._columns)
+            self._csv.writeheader()
+        for row in self._pending:
+            self._csv.writerow(
+                {
+                    c: json.dumps(list(v)) if isinstance(v, (list, tuple)) else v
+                    for c, v in row.items()
+                    if c in self._columns
+                }
+            )
+        assert self._csv_fp is not None
+        self._csv_fp.flush()
+
+    def _build_schema(self, pa: Any) -> Any:
+        assert self._columns is not None
+        fields = []
+        for c in self._columns:
+            type_name = RESULT_COLUMN_TYPES.get(c) or _infer_column_type(
+                [row.get(c) for row in self._pending]
+            )
+            fields.append(pa.field(c, _arrow_type(pa, type_name)))
+        metadata = {str(k): json.dumps(v) for k, v in self.metadata.items()}
+        return pa.schema(fields, metadata=metadata)
+
+    def _flush_arrow(self) -> None:
+        pa = _require_pyarrow()
+        if self._schema is None:
+            self._schema = self._build_schema(pa)
+            if self.fmt == "parquet":
+                import pyarrow.parquet as pq
+
+                self._arrow = pq.ParquetWriter(self.path, self._schema)
+            else:
+                self._arrow_sink = pa.OSFile(self.path, "wb")
+                self._arrow = pa.ipc.new_file(self._arrow_sink, self._schema)
+        assert self._arrow is not None
+        batch = pa.RecordBatch.from_pylist(self._pending, schema=self._schema)
+        if self.fmt == "parquet":
+            self._arrow.write_table(pa.Table.from_batches([batch]))
+        else:
+            self._arrow.write_batch(batch)
+
+    def close(self) -> None:
+        self.flush()
+        if self.rows_written == 0 and self.fmt == "csv":
+            open(self.path, "w", encoding="utf-8").close()
+        if self._csv_fp is not None:
+            self._csv_fp.close()
+            self._csv_fp = None
+        if self._arrow is not None:
+            self._arrow.close()
+            self._arrow = None
+        if self._arrow_sink is not None:
+            self._arrow_sink.close()
+            self._arrow_sink = None
@@ -0,0 +1,14 @@
+from .delay import DelayProxy
+from .resp import RespError, RespParser, RespSimple, encode_command, encode_reply
+from .server import RoutingProxy, UpstreamPool
+
+__all__ = [
+    "DelayProxy",
+    "RespError",
+    "RespParser",
+    "RespSimple",
+    "RoutingProxy",
+    "UpstreamPool",
+    "encode_command",
+    "encode_reply",
+]
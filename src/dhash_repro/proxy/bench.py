@@ -0,0 +1,67 @@
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from dhash.stats import weighted_percentiles
+
+from ..clients.redis_client import preload_cluster, redis_client_for_node
+
+
+def _summarize(prefix: str, wall: float, samples: List[Tuple[float, int]]) -> Dict[str, float]:
+    ops = sum(w for _, w in samples)
+    p50, p99 = weighted_percentiles(samples, [0.50, 0.99])
+    return {
+        f"{prefix}_throughput_ops_s": ops / wall if wall > 0 else 0.0,
+        f"{prefix}_p50_ms": p50 * 1000.0,
+        f"{prefix}_p99_ms": p99 * 1000.0,
+    }
+
+
+def bench_proxy_vs_direct(
+    keys: Sequence[Any],
+    router_factory: Callable[[], Any],
+    proxy_address: str,
+    pipeline_size: int = 200,
+    db: int = 0,
+) -> Dict[str, float]:
+    proxy = redis_client_for_node(proxy_address, db=db)
+
+    # Preload every copy directly, alternates included, so both paths read the same stored keys.
+    preload_cluster(router_factory(), list(dict.fromkeys(keys)), db=db)
+
+    router = router_factory()
+    direct_samples: List[Tuple[float, int]] = []
+    t_direct = time.perf_counter_ns()
+    for i in range(0, len(keys), pipeline_size):
+        chunk = keys[i : i + pipeline_size]
+        t0 = time.perf_counter_ns()
+        buckets: Dict[str, List[Any]] = defaultdict(list)
+        for k in chunk:
+            buckets[router.get_node(k, op="read")].append(k)
+        for node, node_keys in buckets.items():
+            node_pipe = redis_client_for_node(node, db=db).pipeline(transaction=False)
+            for k in node_keys:
+                node_pipe.get(k)
+            node_pipe.execute()
+        dt = (time.perf_counter_ns() - t0) / 1e9
+        direct_samples.append((dt / len(chunk), len(chunk)))
+    direct_wall = (time.perf_counter_ns() - t_direct) / 1e9
+
+    proxy_samples: List[Tuple[float, int]] = []
+    t_proxy = time.perf_counter_ns()
+    for i in range(0, len(keys), pipeline_size):
+        chunk = keys[i : i + pipeline_size]
+        t0 = time.perf_counter_ns()
+        pipe = proxy.pipeline(transaction=False)
+        for k in chunk:
+            pipe.get(k)
+        pipe.execute()
+        dt = (time.perf_counter_ns() - t0) / 1e9
+        proxy_samples.append((dt / len(chunk), len(chunk)))
+    proxy_wall = (time.perf_counter_ns() - t_proxy) / 1e9
+
+    result = _summarize("direct", direct_wall, direct_samples)
+    result.update(_summarize("proxy", proxy_wall, proxy_samples))
+    result["added_p50_ms"] = result["proxy_p50_ms"] - result["direct_p50_ms"]
+    result["added_p99_ms"] = result["proxy_p99_ms"] - result["direct_p99_ms"]
+    return result
@@ -0,0 +1,139 @@
+import asyncio
+import logging
+import threading
+from typing import Optional, Set
+
+from .server import Address
+
+logger = logging.getLogger(__name__)
+
+
+class DelayProxy:
+    # A TCP forwarder in front of one node, run on its own event loop thread so synchronous
+    # clients can use it. Requests are held for `delay_seconds`; while down, connections are cut.
+    def __init__(
+        self,
+        upstream: Address,
+        delay_seconds: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.upstream = upstream
+        self.delay_seconds = float(delay_seconds)
+        self.host = host
+        self.port = port
+        self.down = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._writers: Set[asyncio.StreamWriter] = set()
+        self._address: Optional[Address] = None
+
+    @property
+    def address(self) -> Address:
+        if self._address is None:
+            raise RuntimeError("DelayProxy is not running.")
+        return self._address
+
+    def start(self) -> "DelayProxy":
+        if self._thread is not None:
+            return self
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def _run() -> None:
+            asyncio.set_event_loop(loop)
+            self._server = loop.run_until_complete(
+                asyncio.start_server(self._handle, self.host, self.port)
+            )
+            sock = self._server.sockets[0].getsockname()
+            self._address = (sock[0], sock[1])
+            ready.set()
+            loop.run_forever()
+            loop.close()
+
+        self._loop = loop
+        self._thread = threading.Thread(target=_run, name="dhash-delay-proxy", daemon=True)
+        self._thread.start()
+        if not ready.wait(5.0):
+            raise RuntimeError("DelayProxy did not start.")
+        return self
+
+    def __enter__(self) -> "DelayProxy":
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    def set_delay(self, seconds: float) -> None:
+        self.delay_seconds = float(seconds)
+
+    def set_down(self, down: bool) -> None:
+        self.down = down
+        if down and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._drop_connections)
+
+    def _drop_connections(self) -> None:
+        for writer in list(self._writers):
+            writer.close()
+        self._writers.clear()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        if self.down:
+            writer.close()
+            return
+        try:
+            up_reader, up_writer = await asyncio.open_connection(*self.upstream)
+        except OSError as e:
+            logger.warning("[DelayProxy] Upstream %s unreachable: %s", self.upstream, e)
+            writer.close()
+            return
+        self._writers.update((writer, up_writer))
+        try:
+            await asyncio.gather(
+                self._pipe(reader, up_writer, delayed=True),
+                self._pipe(up_reader, writer, delayed=False),
+                return_exceptions=True,
+            )
+        finally:
+            self._writers.difference_update((writer, up_writer))
+            writer.close()
+            up_writer.close()
+
+    async def _pipe(
+        self, src: asyncio.StreamReader, dst: asyncio.StreamWriter, delayed: bool
+    ) -> None:
+        try:
+            while True:
+                data = await src.read(65536)
+                if not data or self.down:
+                    break
+                if delayed and self.delay_seconds > 0:
+                    await asyncio.sleep(self.delay_seconds)
+                dst.write(data)
+                await dst.drain()
+        finally:
+            dst.close()
+
+    def stop(self) -> None:
+        loop, thread = self._loop, self._thread
+        if loop is None or thread is None:
+            return
+
+        async def _shutdown() -> None:
+            if self._server is not None:
+                self._server.close()
+            self._drop_connections()
+            tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        asyncio.run_coroutine_threadsafe(_shutdown(), loop).result(5.0)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        self._loop = self._thread = self._server = None
+        self._address = None
+
+
+__all__ = ["DelayProxy"]
@@ -0,0 +1,120 @@
+from typing import Any, List, Optional, Sequence, Tuple, Union
+
+
+class RespSimple(str):
+    pass
+
+
+class RespError(str):
+    pass
+
+
+RespValue = Union[None, int, bytes, RespSimple, RespError, List[Any]]
+
+_INCOMPLETE = object()
+
+
+class ProtocolError(ValueError):
+    pass
+
+
+class RespParser:
+    def __init__(self) -> None:
+        self._buf = bytearray()
+        self._pos = 0
+
+    def feed(self, data: bytes) -> None:
+        if self._pos:
+            del self._buf[: self._pos]
+            self._pos = 0
+        self._buf.extend(data)
+
+    def _line(self, pos: int) -> Tuple[Optional[bytes], int]:
+        end = self._buf.find(b"\r\n", pos)
+        if end < 0:
+            return None, pos
+        return bytes(self._buf[pos:end]), end + 2
+
+    def _parse_at(self, pos: int) -> Tuple[Any, int]:
+        if pos >= len(self._buf):
+            return _INCOMPLETE, pos
+        prefix = self._buf[pos : pos + 1]
+        line, nxt = self._line(pos + 1)
+        if line is None:
+            return _INCOMPLETE, pos
+
+        if prefix == b"+":
+            return RespSimple(line.decode("utf-8", "replace")), nxt
+        if prefix == b"-":
+            return RespError(line.decode("utf-8", "replace")), nxt
+        if prefix == b":":
+            return int(line), nxt
+        if prefix == b"$":
+            size = int(line)
+            if size < 0:
+                return None, nxt
+            if len(self._buf) < nxt + size + 2:
+                return _INCOMPLETE, pos
+            return bytes(self._buf[nxt : nxt + size]), nxt + size + 2
+        if prefix == b"*":
+            count = int(line)
+            if count < 0:
+                return None, nxt
+            items: List[Any] = []
+            cur = nxt
+            for _ in range(count):
+                item, cur = self._parse_at(cur)
+                if item is _INCOMPLETE:
+                    return _INCOMPLETE, pos
+                items.append(item)
+            return items, cur
+        if prefix.isalpha():
+            # Inline commands, as typed into telnet or redis-cli --no-raw.
+            return [part for part in (prefix + line).split(b" ") if part], nxt
+        raise ProtocolError(f"Unknown RESP type byte: {prefix!r}")
+
+    def parse(self) -> Tuple[bool, RespValue]:
+        value, nxt = self._parse_at(self._pos)
+        if value is _INCOMPLETE:
+            return False, None
+        self._pos = nxt
+        return True, value
+
+    def parse_all(self) -> List[RespValue]:
+        out: List[RespValue] = []
+        while True:
+            ok, value = self.parse()
+            if not ok:
+                return out
+            out.append(value)
+
+
+def encode_command(args: Sequence[Union[bytes, str, int]]) -> bytes:
+    parts = [b"*%d\r\n" % len(args)]
+    for a in args:
+        if isinstance(a, str):
+            a = a.encode("utf-8")
+        elif isinstance(a, int):
+            a = str(a).encode("ascii")
+        parts.append(b"$%d\r\n%s\r\n" % (len(a), a))
+    return b"".join(parts)
+
+
+def encode_reply(value: RespValue) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, RespError):
+        return b"-%s\r\n" % value.encode("utf-8")
+    if isinstance(value, RespSimple):
+        return b"+%s\r\n" % value.encode("utf-8")
+    if isinstance(value, bool):
+        return b":%d\r\n" % int(value)
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, bytes):
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+    if isinstance(value, str):
+        return encode_reply(value.encode("utf-8"))
+    if isinstance(value, list):
+        return b"*%d\r\n" % len(value) + b"".join(encode_reply(v) for v in value)
+    raise TypeError(f"Cannot encode RESP value of type {type(value).__name__}")
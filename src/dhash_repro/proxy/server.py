@@ -0,0 +1,431 @@
+import asyncio
+import itertools
+import logging
+from collections import defaultdict, deque
+from typing import Any, Awaitable, Deque, Dict, List, Optional, Sequence, Tuple, cast
+
+from .resp import (
+    ProtocolError,
+    RespError,
+    RespParser,
+    RespSimple,
+    RespValue,
+    encode_command,
+    encode_reply,
+)
+
+logger = logging.getLogger(__name__)
+
+Address = Tuple[str, int]
+
+
+async def _done(value: RespValue) -> RespValue:
+    return value
+
+
+async def _upstream(reply: Awaitable[RespValue]) -> RespValue:
+    try:
+        return await reply
+    except (ConnectionError, OSError, KeyError) as e:
+        return RespError(f"ERR upstream failure: {e}")
+
+
+async def _first_error(pending: List["asyncio.Future[RespValue]"]) -> RespValue:
+    # The primary's reply is returned; copies to a hot key's alternate must succeed too.
+    replies = await asyncio.gather(*pending)
+    errors = [r for r in replies if isinstance(r, RespError)]
+    return errors[0] if errors else replies[0]
+
+
+class UpstreamConnection:
+    def __init__(self, address: Address) -> None:
+        self.address = address
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._queue: "asyncio.Queue[Tuple[bytes, asyncio.Future[RespValue]]]" = asyncio.Queue()
+        self._inflight: Deque["asyncio.Future[RespValue]"] = deque()
+        self._tasks: List["asyncio.Task[None]"] = []
+        self.closed = False
+
+    async def connect(self) -> None:
+        self._reader, self._writer = await asyncio.open_connection(*self.address)
+        self._tasks = [
+            asyncio.create_task(self._write_loop()),
+            asyncio.create_task(self._read_loop()),
+        ]
+
+    def send(self, args: Sequence[bytes]) -> "asyncio.Future[RespValue]":
+        fut: "asyncio.Future[RespValue]" = asyncio.get_running_loop().create_future()
+        if self.closed:
+            fut.set_exception(ConnectionError(f"Upstream {self.address} connection is closed."))
+            return fut
+        self._queue.put_nowait((encode_command(args), fut))
+        return fut
+
+    def _fail(self, error: Exception) -> None:
+        # Once the connection is gone, nothing queued on it can be answered.
+        self.closed = True
+        current = asyncio.current_task()
+        for task in self._tasks:
+            if task is not current:
+                task.cancel()
+        while self._inflight:
+            fut = self._inflight.popleft()
+            if not fut.done():
+                fut.set_exception(error)
+        while not self._queue.empty():
+            _, fut = self._queue.get_nowait()
+            if not fut.done():
+                fut.set_exception(error)
+
+    async def _write_loop(self) -> None:
+        assert self._writer is not None
+        try:
+            while True:
+                payload, fut = await self._queue.get()
+                batch = [payload]
+                self._inflight.append(fut)
+                # Drain everything already queued so it goes out as one pipeline.
+                while not self._queue.empty():
+                    payload, fut = self._queue.get_nowait()
+                    batch.append(payload)
+                    self._inflight.append(fut)
+                self._writer.write(b"".join(batch))
+                await self._writer.drain()
+        except (ConnectionError, OSError) as e:
+            self._fail(e)
+
+    async def _read_loop(self) -> None:
+        assert self._reader is not None
+        parser = RespParser()
+        try:
+            while True:
+                data = await self._reader.read(65536)
+                if not data:
+                    raise ConnectionError(f"Upstream {self.address} closed the connection.")
+                parser.feed(data)
+                for reply in parser.parse_all():
+                    fut = self._inflight.popleft()
+                    if not fut.done():
+                        fut.set_result(reply)
+        except (ConnectionError, OSError, ProtocolError, ValueError) as e:
+            self._fail(e if isinstance(e, ConnectionError) else ConnectionError(str(e)))
+        finally:
+            if self._writer is not None:
+                self._writer.close()
+
+    async def close(self) -> None:
+        self._fail(ConnectionError(f"Upstream {self.address} connection is closed."))
+        for task in self._tasks:
+            task.cancel()
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
+
+class UpstreamPool:
+    def __init__(self, address: Address, size: int = 2) -> None:
+        self.address = address
+        self.size = max(1, int(size))
+        self._conns: List[UpstreamConnection] = []
+        self._lock = asyncio.Lock()
+
+    async def _ensure(self) -> None:
+        if self._conns:
+            return
+        async with self._lock:
+            if self._conns:
+                return
+            conns = [UpstreamConnection(self.address) for _ in range(self.size)]
+            for c in conns:
+                await c.connect()
+            self._conns = conns
+
+    async def _connection(self, slot: int) -> UpstreamConnection:
+        await self._ensure()
+        conn = self._conns[slot]
+        if not conn.closed:
+            return conn
+        async with self._lock:
+            conn = self._conns[slot]
+            if conn.closed:
+                # Replace a connection the upstream dropped; the failed requests already got errors.
+                conn = UpstreamConnection(self.address)
+                await conn.connect()
+                self._conns[slot] = conn
+                logger.info("[Proxy] Reconnected to %s:%s.", *self.address)
+        return conn
+
+    async def ready(self, client_id: int = 0) -> None:
+        # Connects or reconnects the client's connection so submit() can send without waiting.
+        try:
+            await self._connection(client_id % self.size)
+        except (ConnectionError, OSError) as e:
+            logger.warning("[Proxy] Cannot connect to %s:%s: %s", *self.address, e)
+
+    def submit(self, args: Sequence[bytes], client_id: int = 0) -> "asyncio.Future[RespValue]":
+        # Queues the command at once, so calls made in client order reach the node in that order.
+        slot = client_id % self.size
+        if slot < len(self._conns):
+            return self._conns[slot].send(args)
+        fut: "asyncio.Future[RespValue]" = asyncio.get_running_loop().create_future()
+        fut.set_exception(ConnectionError(f"No connection to upstream {self.address}."))
+        return fut
+
+    async def execute(self, args: Sequence[bytes], client_id: int = 0) -> RespValue:
+        # One connection per client keeps that client's commands in order on the node.
+        conn = await self._connection(client_id % self.size)
+        return await conn.send(args)
+
+    async def close(self) -> None:
+        for c in self._conns:
+            await c.close()
+        self._conns = []
+
+
+class RoutingProxy:
+    def __init__(self, router: Any, addresses: Dict[str, Address], pool_size: int = 2) -> None:
+        self.router = router
+        self.pools: Dict[str, UpstreamPool] = {
+            node: UpstreamPool(addr, pool_size) for node, addr in addresses.items()
+        }
+        self.commands_served = 0
+        self._client_ids = itertools.count()
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> Address:
+        self._server = await asyncio.start_server(self._handle_client, host, port)
+        sock = self._server.sockets[0].getsockname()
+        logger.info("[Proxy] Listening on %s:%s for %d nodes.", sock[0], sock[1], len(self.pools))
+        return sock[0], sock[1]
+
+    async def serve_forever(self) -> None:
+        assert self._server is not None
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for pool in self.pools.values():
+            await pool.close()
+
+    def _pool(self, node: str) -> UpstreamPool:
+        pool = self.pools.get(node)
+        if pool is None:
+            raise KeyError(f"Router returned unknown node: {node}")
+        return pool
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        parser = RespParser()
+        client_id = next(self._client_ids)
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                parser.feed(data)
+                commands = parser.parse_all()
+                if not commands:
+                    continue
+                replies = await self._pipeline(commands, client_id)
+                writer.write(b"".join(encode_reply(r) for r in replies))
+                await writer.drain()
+                if any(
+                    isinstance(c, list) and c and bytes(c[0]).upper() == b"QUIT" for c in commands
+                ):
+                    break
+        except (ProtocolError, ValueError) as e:
+            try:
+                writer.write(encode_reply(RespError(f"ERR Protocol error: {e}")))
+                await writer.drain()
+            except (ConnectionError, OSError):
+                pass
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            writer.close()
+
+    async def _ready(self, client_id: int) -> None:
+        for pool in self.pools.values():
+            await pool.ready(client_id)
+
+    async def _pipeline(self, commands: List[RespValue], client_id: int) -> List[RespValue]:
+        # Every command's requests are queued before the next command's, so a node sees one
+        # client's commands in the order they were sent. A command that may need a follow-up
+        # request (a miss on an alternate) is finished before anything after it is queued.
+        await self._ready(client_id)
+        replies: List[RespValue] = []
+        pending: List[Awaitable[RespValue]] = []
+        for command in commands:
+            reply, follow_up = self._submit(command, client_id)
+            pending.append(reply)
+            if follow_up:
+                replies.extend(await asyncio.gather(*pending))
+                pending = []
+                await self._ready(client_id)
+        replies.extend(await asyncio.gather(*pending))
+        return replies
+
+    async def dispatch(self, command: RespValue, client_id: int = 0) -> RespValue:
+        return (await self._pipeline([command], client_id))[0]
+
+    def _submit(self, command: RespValue, client_id: int) -> Tuple[Awaitable[RespValue], bool]:
+        # Sends the command's requests right away and returns its reply and whether it may send
+        # more requests once replies arrive.
+        if not isinstance(command, list) or not command:
+            return _done(RespError("ERR invalid command")), False
+        args = [a if isinstance(a, bytes) else str(a).encode("utf-8") for a in command]
+        name = args[0].upper()
+        self.commands_served += 1
+        try:
+            if name == b"GET" and len(args) == 2:
+                node = self.router.get_node(args[1], op="read")
+                reply = self._send(node, args, client_id)
+                primary = self._primary(args[1])
+                if primary == node:
+                    return _upstream(reply), False
+                return _upstream(
+                    self._get_alternate(reply, args[1], primary, node, client_id)
+                ), True
+            if name == b"SET" and len(args) >= 3:
+                replies = [self._send(n, args, client_id) for n in self._write_nodes(args[1])]
+                return _upstream(_first_error(replies)), False
+            if name == b"MGET" and len(args) >= 2:
+                return self._mget(args[1:], client_id)
+            if name == b"DEL" and len(args) >= 2:
+                return _upstream(self._del(args[1:], client_id)), False
+            if name == b"PING":
+                return _done(RespSimple("PONG") if len(args) == 1 else args[1]), False
+            if name in (b"QUIT", b"SELECT", b"CLIENT"):
+                return _done(RespSimple("OK")), False
+            if name == b"COMMAND":
+                return _done([]), False
+        except KeyError as e:
+            return _done(RespError(f"ERR upstream failure: {e}")), False
+        return _done(
+            RespError(f"ERR unsupported command '{args[0].decode('utf-8', 'replace')}'")
+        ), False
+
+    def _send(
+        self, node: str, args: Sequence[bytes], client_id: int
+    ) -> "asyncio.Future[RespValue]":
+        return self._pool(node).submit(args, client_id)
+
+    def _write_nodes(self, key: bytes) -> List[str]:
+        # The primary first, then the alternate of a hot key for routers that keep one.
+        get_write_nodes = getattr(self.router, "get_write_nodes", None)
+        if get_write_nodes is not None:
+            return cast(List[str], get_write_nodes(key))
+        return [self.router.get_node(key, op="write")]
+
+    def _primary(self, key: bytes) -> str:
+        return self._write_nodes(key)[0]
+
+    async def _get_alternate(
+        self,
+        reply: "asyncio.Future[RespValue]",
+        key: bytes,
+        primary: str,
+        alternate: str,
+        client_id: int,
+    ) -> RespValue:
+        value = await reply
+        if value is None:
+            return await self._read_through(key, primary, alternate, client_id)
+        return value
+
+    async def _read_through(
+        self, key: bytes, primary: str, alternate: str, client_id: int
+    ) -> RespValue:
+        # An alternate has nothing for keys written before they turned hot. Serve those from the
+        # primary and copy the value over, with the primary's remaining TTL.
+        value, ttl = await asyncio.gather(
+            self._pool(primary).execute([b"GET", key], client_id),
+            self._pool(primary).execute([b"PTTL", key], client_id),
+        )
+        if isinstance(value, bytes):
+            expiry = [b"PX", str(ttl).encode("ascii")] if isinstance(ttl, int) and ttl > 0 else []
+            await self._pool(alternate).execute([b"SET", key, value, *expiry], client_id)
+        return value
+
+    def _mget(self, keys: List[bytes], client_id: int) -> Tuple[Awaitable[RespValue], bool]:
+        groups: Dict[str, List[int]] = defaultdict(list)
+        for i, k in enumerate(keys):
+            groups[self.router.get_node(k, op="read")].append(i)
+        primaries = [self._primary(k) for k in keys]
+        nodes = list(groups)
+        replies = [
+            self._send(n, [b"MGET", *(keys[i] for i in groups[n])], client_id) for n in nodes
+        ]
+        follow_up = any(primaries[i] != n for n in nodes for i in groups[n])
+        return _upstream(self._mget_replies(keys, groups, primaries, replies, client_id)), follow_up
+
+    async def _mget_replies(
+        self,
+        keys: List[bytes],
+        groups: Dict[str, List[int]],
+        primaries: List[str],
+        pending: List["asyncio.Future[RespValue]"],
+        client_id: int,
+    ) -> RespValue:
+        replies = await asyncio.gather(*pending)
+        out: List[Any] = [None] * len(keys)
+        for node, reply in zip(groups, replies):
+            if isinstance(reply, RespError):
+                return reply
+            assert isinstance(reply, list)
+            for i, value in zip(groups[node], reply):
+                out[i] = value
+
+        # Misses on an alternate are read again from the key's primary.
+        retry: Dict[str, List[int]] = defaultdict(list)
+        for node, idx in groups.items():
+            for i in idx:
+                if out[i] is None and primaries[i] != node:
+                    retry[primaries[i]].append(i)
+        if retry:
+            nodes = list(retry)
+            replies = await asyncio.gather(
+                *(
+                    self._pool(n).execute([b"MGET", *(keys[i] for i in retry[n])], client_id)
+                    for n in nodes
+                )
+            )
+            for node, reply in zip(nodes, replies):
+                if isinstance(reply, list):
+                    for i, value in zip(retry[node], reply):
+                        out[i] = value
+        return out
+
+    async def _del_replies(
+        self, requests: List[Tuple[bool, "asyncio.Future[RespValue]"]]
+    ) -> RespValue:
+        replies = await asyncio.gather(*(reply for _, reply in requests))
+        total = 0
+        for (counted, _), reply in zip(requests, replies):
+            if isinstance(reply, RespError):
+                return reply
+            if counted and isinstance(reply, int):
+                total += reply
+        return total
+
+    def _del(self, keys: List[bytes], client_id: int) -> Awaitable[RespValue]:
+        groups: Dict[str, List[bytes]] = defaultdict(list)
+        copies: Dict[str, List[bytes]] = defaultdict(list)
+        for k in keys:
+            primary, *others = self._write_nodes(k)
+            groups[primary].append(k)
+            for node in others:
+                copies[node].append(k)
+
+        # Only deletes on primaries are counted, so the reply matches a single Redis node.
+        requests = [(True, self._send(n, [b"DEL", *ks], client_id)) for n, ks in groups.items()]
+        requests += [(False, self._send(n, [b"DEL", *ks], client_id)) for n, ks in copies.items()]
+        return self._del_replies(requests)
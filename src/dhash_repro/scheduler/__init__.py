@@ -0,0 +1,5 @@
+from .cells import ExperimentCell
+from .checkpoint import Checkpoint
+from .executor import WorkloadCache, run_cells
+
+__all__ = ["Checkpoint", "ExperimentCell", "WorkloadCache", "run_cells"]
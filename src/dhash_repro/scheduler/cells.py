@@ -0,0 +1,35 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+
+@dataclass(frozen=True)
+class ExperimentCell:
+    stage: str
+    mode: str
+    alpha: float
+    pipeline: int
+    T: Optional[int]
+    W: Optional[int]
+    rep: int
+
+    @property
+    def key(self) -> str:
+        return "|".join(
+            str(v)
+            for v in (self.stage, self.mode, self.alpha, self.pipeline, self.T, self.W, self.rep)
+        )
+
+    @property
+    def dhash_params(self) -> Optional[Dict[str, int]]:
+        if self.T is None or self.W is None:
+            return None
+        return {"T": self.T, "W": self.W}
+
+    def row_fields(self, dataset: str) -> Dict[str, Any]:
+        row: Dict[str, Any] = {"Dataset": dataset}
+        if self.stage != "ablation":
+            row["Mode"] = self.mode
+        row.update({"Alpha": self.alpha, "Pipeline": self.pipeline, "W": self.W, "T": self.T})
+        if self.stage == "ablation":
+            row["Tuning"] = "auto" if self.mode == "D-HASH Auto" else "static"
+        return row
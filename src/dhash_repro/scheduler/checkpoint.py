@@ -0,0 +1,59 @@
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class Checkpoint:
+    # `tag` identifies the settings the rows were measured with; rows recorded under another tag are
+    # not restored.
+    def __init__(self, path: str, tag: str = "") -> None:
+        self.path = path
+        self.tag = tag
+        self._lock = threading.Lock()
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        done: Dict[str, Dict[str, Any]] = {}
+        skipped = 0
+        if not os.path.exists(self.path):
+            return done
+        with open(self.path, "r", encoding="utf-8") as f:
+            for lineno, raw in enumerate(f, start=1):
+                line = raw.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn trailing line is expected after a hard interrupt.
+                    logger.warning(
+                        "Ignoring unreadable checkpoint line %d in %s", lineno, self.path
+                    )
+                    continue
+                if entry.get("tag", "") != self.tag:
+                    skipped += 1
+                    continue
+                done[str(entry["cell"])] = dict(entry["row"])
+        if skipped:
+            logger.warning(
+                "Ignoring %d checkpoint rows from a run with other settings in %s",
+                skipped,
+                self.path,
+            )
+        return done
+
+    def record(self, cell_key: str, row: Dict[str, Any]) -> None:
+        line = json.dumps({"cell": cell_key, "tag": self.tag, "row": row}, sort_keys=True)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def clear(self) -> None:
+        with self._lock:
+            if os.path.exists(self.path):
+                os.remove(self.path)
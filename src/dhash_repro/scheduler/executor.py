@@ -0,0 +1,112 @@
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from queue import Queue
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from ..config.defaults import reset_np_rng
+from ..workloads.dynamic import generate_workload
+from .cells import ExperimentCell
+from .checkpoint import Checkpoint
+
+logger = logging.getLogger(__name__)
+
+CellExecutor = Callable[[ExperimentCell, int], Dict[str, Any]]
+ResultCallback = Callable[[ExperimentCell, Dict[str, Any]], None]
+
+
+class WorkloadCache:
+    def __init__(
+        self,
+        ranked_keys: List[Any],
+        size: int,
+        max_entries: int = 16,
+        kind: str = "zipf",
+        params: Optional[Dict[str, float]] = None,
+    ) -> None:
+        self.ranked_keys = ranked_keys
+        self.size = size
+        self.kind = kind
+        self.params = dict(params or {})
+        self.max_entries = max(1, int(max_entries))
+        self._entries: "OrderedDict[Tuple[float, int], List[Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, alpha: float, seed: int) -> List[Any]:
+        cache_key = (float(alpha), int(seed))
+        with self._lock:
+            cached = self._entries.get(cache_key)
+            if cached is not None:
+                self._entries.move_to_end(cache_key)
+                return cached
+
+            # The module-level RNG is shared, so generation stays under the lock.
+            reset_np_rng(seed)
+            workload = generate_workload(
+                self.ranked_keys, self.size, alpha, kind=self.kind, params=self.params
+            )
+            self._entries[cache_key] = workload
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return workload
+
+
+def run_cells(
+    cells: Sequence[ExperimentCell],
+    execute: CellExecutor,
+    *,
+    concurrency: int = 1,
+    checkpoint: Optional[Checkpoint] = None,
+    on_result: Optional[ResultCallback] = None,
+) -> List[Dict[str, Any]]:
+    done = checkpoint.load() if checkpoint is not None else {}
+    results: List[Optional[Dict[str, Any]]] = [done.get(c.key) for c in cells]
+    pending = [i for i, row in enumerate(results) if row is None]
+
+    restored = len(cells) - len(pending)
+    if restored:
+        logger.info("[Scheduler] Restored %d/%d cells from checkpoint.", restored, len(cells))
+
+    workers = max(1, min(int(concurrency), len(pending) or 1))
+    db_slots: "Queue[int]" = Queue()
+    for db in range(workers):
+        db_slots.put(db)
+
+    def _run(idx: int) -> Tuple[int, Dict[str, Any]]:
+        db = db_slots.get()
+        try:
+            row = execute(cells[idx], db)
+        finally:
+            db_slots.put(db)
+        if checkpoint is not None:
+            checkpoint.record(cells[idx].key, row)
+        return idx, row
+
+    next_emit = 0
+
+    def _emit_ready() -> None:
+        # Rows are handed out in plan order even when cells finish out of order.
+        nonlocal next_emit
+        while next_emit < len(cells):
+            row = results[next_emit]
+            if row is None:
+                return
+            if on_result is not None:
+                on_result(cells[next_emit], row)
+            next_emit += 1
+
+    _emit_ready()
+    if workers == 1:
+        for idx in pending:
+            _, results[idx] = _run(idx)
+            _emit_ready()
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            futures = [ex.submit(_run, idx) for idx in pending]
+            for fut in as_completed(futures):
+                idx, row = fut.result()
+                results[idx] = row
+                _emit_ready()
+
+    return [row for row in results if row is not None]
@@ -1,3 +1,31 @@
-from .zipf import generate_zipf_workload
+from .dynamic import (
+    WORKLOAD_KINDS,
+    generate_workload,
+    iter_diurnal,
+    iter_flash_crowd,
+    iter_shifting_hotspot,
+    iter_workload,
+    iter_zipf,
+    mix_operations,
+)
+from .keys import encode_key, encode_keys
+from .values import ValuePayloads, draw_value_sizes, value_payloads
+from .zipf import generate_zipf_indices, generate_zipf_workload
 
-__all__ = ["generate_zipf_workload"]
+__all__ = [
+    "WORKLOAD_KINDS",
+    "ValuePayloads",
+    "draw_value_sizes",
+    "encode_key",
+    "encode_keys",
+    "generate_workload",
+    "generate_zipf_indices",
+    "generate_zipf_workload",
+    "iter_diurnal",
+    "iter_flash_crowd",
+    "iter_shifting_hotspot",
+    "iter_workload",
+    "iter_zipf",
+    "mix_operations",
+    "value_payloads",
+]
@@ -0,0 +1,236 @@
+import math
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..config import defaults
+from .zipf import generate_zipf_workload
+
+if TYPE_CHECKING:
+    import numpy as np
+    from numpy.random import Generator
+
+CHUNK_SIZE: int = 65_536
+
+# Parameters accepted by each workload kind, with their defaults. A default of None is resolved
+# from the workload size.
+WORKLOAD_PARAMS: Dict[str, Dict[str, Optional[float]]] = {
+    "zipf": {},
+    "shifting": {"shift_every": None},
+    "flash": {"flash_start": None, "flash_duration": None, "flash_rate": 0.2, "flash_rank": None},
+    "diurnal": {"alpha_peak": 1.5, "period": None},
+}
+WORKLOAD_KINDS = tuple(WORKLOAD_PARAMS)
+
+
+def _zipf_cdf(n: int, alpha: float) -> "np.ndarray":
+    import numpy as np
+
+    if n <= 0:
+        raise ValueError("Key list is empty.")
+    weights = np.arange(1, n + 1, dtype=np.float64) ** (-alpha)
+    # Built the way Generator.choice builds it, so iter_zipf matches generate_zipf_indices.
+    cdf = np.cumsum(weights / weights.sum())
+    cdf /= cdf[-1]
+    return cdf
+
+
+def _draw(rng: "Generator", cdf: "np.ndarray", size: int) -> "np.ndarray":
+    import numpy as np
+
+    # Same inverse-CDF rule as Generator.choice(p=...), without rebuilding the CDF per call.
+    ranks = np.searchsorted(cdf, rng.random(size), side="right")
+    return np.minimum(ranks, len(cdf) - 1)
+
+
+def _spans(size: int, chunk_size: int, boundaries: Iterable[int] = ()) -> Iterator[Tuple[int, int]]:
+    # Yields [start, end) chunks that never straddle one of the boundaries.
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive.")
+    cuts = sorted({b for b in boundaries if 0 < b < size})
+    start = 0
+    for stop in cuts + [size]:
+        while start < stop:
+            end = min(start + chunk_size, stop)
+            yield start, end
+            start = end
+
+
+def iter_zipf(
+    n: int, size: int, alpha: float = 1.1, chunk_size: int = CHUNK_SIZE
+) -> Iterator["np.ndarray"]:
+    cdf = _zipf_cdf(n, alpha)
+    rng = defaults.NP_RNG
+    return (_draw(rng, cdf, end - start) for start, end in _spans(size, chunk_size))
+
+
+def iter_shifting_hotspot(
+    n: int,
+    size: int,
+    alpha: float = 1.1,
+    shift_every: int = 100_000,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator["np.ndarray"]:
+    if shift_every < 1:
+        raise ValueError("shift_every must be positive.")
+    cdf = _zipf_cdf(n, alpha)
+    rng = defaults.NP_RNG
+
+    def _gen() -> Iterator["np.ndarray"]:
+        import numpy as np
+
+        # Rank r maps to key order[r]; the first period keeps the ranked order.
+        order = np.arange(n)
+        boundaries = range(shift_every, size, shift_every)
+        for start, end in _spans(size, chunk_size, boundaries):
+            if start and start % shift_every == 0:
+                order = rng.permutation(n)
+            yield order[_draw(rng, cdf, end - start)]
+
+    return _gen()
+
+
+def iter_flash_crowd(
+    n: int,
+    size: int,
+    alpha: float = 1.1,
+    flash_start: int = 0,
+    flash_duration: int = 0,
+    flash_rate: float = 0.2,
+    flash_rank: Optional[int] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator["np.ndarray"]:
+    if not 0.0 <= flash_rate <= 1.0:
+        raise ValueError("flash_rate must be between 0 and 1.")
+    if flash_start < 0 or flash_duration < 0:
+        raise ValueError("flash_start and flash_duration must not be negative.")
+    # The burst hits the coldest key unless another rank is given.
+    key = n - 1 if flash_rank is None else int(flash_rank)
+    if not 0 <= key < n:
+        raise ValueError(f"flash_rank must be in [0, {n}).")
+    flash_end = flash_start + flash_duration
+    cdf = _zipf_cdf(n, alpha)
+    rng = defaults.NP_RNG
+
+    def _gen() -> Iterator["np.ndarray"]:
+        for start, end in _spans(size, chunk_size, (flash_start, flash_end)):
+            ids = _draw(rng, cdf, end - start)
+            if flash_start <= start < flash_end and flash_rate > 0:
+                ids[rng.random(end - start) < flash_rate] = key
+            yield ids
+
+    return _gen()
+
+
+def iter_diurnal(
+    n: int,
+    size: int,
+    alpha: float = 1.1,
+    alpha_peak: float = 1.5,
+    period: int = 100_000,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator["np.ndarray"]:
+    if period < 1:
+        raise ValueError("period must be positive.")
+    low = _zipf_cdf(n, alpha)
+    peak = _zipf_cdf(n, alpha_peak)
+    rng = defaults.NP_RNG
+
+    def _gen() -> Iterator["np.ndarray"]:
+        import numpy as np
+
+        for start, end in _spans(size, chunk_size):
+            # The share drawn from the peak exponent follows a cosine: 0 at the start of each
+            # period and 1 half way through.
+            phase = np.arange(start, end, dtype=np.float64) * (2.0 * math.pi / period)
+            at_peak = rng.random(end - start) < 0.5 * (1.0 - np.cos(phase))
+            yield np.where(at_peak, _draw(rng, peak, end - start), _draw(rng, low, end - start))
+
+    return _gen()
+
+
+def mix_operations(
+    chunks: Iterable["np.ndarray"], write_fraction: float
+) -> Iterator[Tuple["np.ndarray", "np.ndarray"]]:
+    import numpy as np
+
+    if not 0.0 <= write_fraction <= 1.0:
+        raise ValueError("write_fraction must be between 0 and 1.")
+    offset = 0
+    for ids in chunks:
+        # Same even spread as split_read_write, continued across chunk boundaries.
+        pos = np.arange(offset, offset + len(ids), dtype=np.float64)
+        writes = np.floor((pos + 1) * write_fraction) > np.floor(pos * write_fraction)
+        offset += len(ids)
+        yield ids, writes
+
+
+def resolve_workload_params(kind: str, size: int, params: Dict[str, float]) -> Dict[str, Any]:
+    if kind not in WORKLOAD_PARAMS:
+        raise ValueError(f"Unsupported workload: {kind}. Expected one of {list(WORKLOAD_KINDS)}")
+    allowed = WORKLOAD_PARAMS[kind]
+    unknown = set(params) - set(allowed)
+    if unknown:
+        raise ValueError(f"Unknown parameters for workload {kind}: {sorted(unknown)}")
+    sized = {
+        "shift_every": max(1, size // 10),
+        "flash_start": size // 2,
+        "flash_duration": max(1, size // 10),
+        "period": max(1, size // 2),
+    }
+    out: Dict[str, Any] = {}
+    for name, default in allowed.items():
+        value = params.get(name, default)
+        if value is None:
+            value = sized.get(name)
+        if value is not None and name not in ("flash_rate", "alpha_peak"):
+            value = int(value)
+        out[name] = value
+    return out
+
+
+def iter_workload(
+    kind: str,
+    n: int,
+    size: int,
+    alpha: float = 1.1,
+    params: Optional[Dict[str, float]] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator["np.ndarray"]:
+    resolved = resolve_workload_params(kind, size, params or {})
+    if kind == "shifting":
+        return iter_shifting_hotspot(n, size, alpha, chunk_size=chunk_size, **resolved)
+    if kind == "flash":
+        return iter_flash_crowd(n, size, alpha, chunk_size=chunk_size, **resolved)
+    if kind == "diurnal":
+        return iter_diurnal(n, size, alpha, chunk_size=chunk_size, **resolved)
+    return iter_zipf(n, size, alpha, chunk_size=chunk_size)
+
+
+def generate_workload(
+    keys: List[Any],
+    size: int,
+    alpha: float = 1.1,
+    kind: str = "zipf",
+    params: Optional[Dict[str, float]] = None,
+) -> List[Any]:
+    import numpy as np
+
+    if not keys:
+        raise ValueError("Key list is empty.")
+    if kind == "zipf" and not params:
+        return generate_zipf_workload(keys, size, alpha)
+    chunks = list(iter_workload(kind, len(keys), size, alpha, params))
+    ids = np.concatenate(chunks) if chunks else np.empty(0, dtype=np.int64)
+    return [keys[i] for i in ids.tolist()]
+
+
+__all__ = [
+    "WORKLOAD_KINDS",
+    "generate_workload",
+    "iter_diurnal",
+    "iter_flash_crowd",
+    "iter_shifting_hotspot",
+    "iter_workload",
+    "iter_zipf",
+    "mix_operations",
+    "resolve_workload_params",
+]
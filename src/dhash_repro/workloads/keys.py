@@ -0,0 +1,15 @@
+from typing import Any, Iterable, List
+
+
+def encode_key(key: Any) -> bytes:
+    if isinstance(key, bytes):
+        return key
+    return str(key).encode("utf-8")
+
+
+def encode_keys(keys: Iterable[Any]) -> List[bytes]:
+    # Encode once at load; routers and Redis pipelines then take the bytes as-is.
+    return [encode_key(k) for k in keys]
+
+
+__all__ = ["encode_key", "encode_keys"]
@@ -0,0 +1,124 @@
+import copy
+import math
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence
+
+from ..config.defaults import SEED
+from ..config.settings import VALUE_SIZE_DISTRIBUTIONS
+
+if TYPE_CHECKING:
+    import numpy as np
+
+PayloadFn = Callable[[Any], bytes]
+
+MAX_VALUE_BYTES: int = 1 << 20
+LOGNORMAL_SIGMA: float = 1.0
+PARETO_SHAPE: float = 1.5
+
+
+def value_payload(value_bytes: int, version: int = 0) -> bytes:
+    # The version marker tells a reader which write a value came from. Version 0 (preload) values
+    # keep their exact size; a versioned value is never cut below its marker.
+    base = b'{"v":%d}' % version
+    if value_bytes <= len(base):
+        return base if version else base[: max(value_bytes, 0)]
+    return base + b"x" * (value_bytes - len(base))
+
+
+def draw_value_sizes(
+    n: int,
+    distribution: str,
+    mean_bytes: int,
+    seed: int = SEED,
+    max_bytes: int = MAX_VALUE_BYTES,
+) -> "np.ndarray":
+    import numpy as np
+
+    if distribution not in VALUE_SIZE_DISTRIBUTIONS or distribution == "trace":
+        raise ValueError(
+            f"Unsupported value size distribution: {distribution}. "
+            f"Expected one of {[d for d in VALUE_SIZE_DISTRIBUTIONS if d != 'trace']}"
+        )
+    mean = max(int(mean_bytes), 0)
+    if distribution == "fixed" or mean == 0:
+        return np.full(n, mean, dtype=np.int64)
+
+    # A generator of its own, so value sizes do not shift the request stream drawn from NP_RNG.
+    rng = np.random.default_rng(seed)
+    if distribution == "uniform":
+        sizes = rng.integers(1, 2 * mean, size=n, endpoint=True).astype(np.float64)
+    elif distribution == "lognormal":
+        mu = math.log(mean) - LOGNORMAL_SIGMA**2 / 2
+        sizes = rng.lognormal(mu, LOGNORMAL_SIGMA, size=n)
+    else:
+        x_min = mean * (PARETO_SHAPE - 1) / PARETO_SHAPE
+        sizes = x_min * (1.0 + rng.pareto(PARETO_SHAPE, size=n))
+    return np.clip(np.rint(sizes), 1, max_bytes).astype(np.int64)
+
+
+class ValuePayloads:
+    # One payload per distinct size, shared by every key of that size.
+    def __init__(
+        self,
+        keys: Sequence[Any],
+        sizes: Sequence[int],
+        default_bytes: int = 0,
+        version: int = 0,
+    ) -> None:
+        if len(keys) != len(sizes):
+            raise ValueError("keys and sizes must have the same length.")
+        self.default_bytes = max(int(default_bytes), 0)
+        self.version = version
+        self._sizes: Dict[Any, int] = {k: int(s) for k, s in zip(keys, sizes)}
+        self._payloads: Dict[int, bytes] = {}
+
+    def size(self, key: Any) -> int:
+        return self._sizes.get(key, self.default_bytes)
+
+    def __call__(self, key: Any) -> bytes:
+        size = self._sizes.get(key, self.default_bytes)
+        payload = self._payloads.get(size)
+        if payload is None:
+            payload = self._payloads[size] = value_payload(size, self.version)
+        return payload
+
+    def versioned(self, version: int) -> "ValuePayloads":
+        # Same per-key sizes with another version marker.
+        other = copy.copy(self)
+        other.version = version
+        other._payloads = {}
+        return other
+
+    def total_bytes(self, keys: Optional[Sequence[Any]] = None) -> int:
+        if keys is None:
+            return sum(self._sizes.values())
+        return sum(self.size(k) for k in keys)
+
+
+def value_payloads(
+    keys: Sequence[Any],
+    distribution: str,
+    mean_bytes: int,
+    trace_sizes: Optional[Sequence[Optional[int]]] = None,
+    seed: int = SEED,
+) -> Optional[ValuePayloads]:
+    if distribution == "fixed":
+        return None
+    if distribution == "trace":
+        if trace_sizes is None or len(trace_sizes) != len(keys):
+            raise ValueError("The trace distribution needs one size per key.")
+        # Keys the trace has no size for fall back to the configured value size.
+        sizes: List[int] = [mean_bytes if s is None else int(s) for s in trace_sizes]
+        return ValuePayloads(keys, sizes, default_bytes=mean_bytes)
+    drawn = draw_value_sizes(len(keys), distribution, mean_bytes, seed=seed)
+    return ValuePayloads(keys, drawn.tolist(), default_bytes=mean_bytes)
+
+
+__all__ = [
+    "MAX_VALUE_BYTES",
+    "VALUE_SIZE_DISTRIBUTIONS",
+    "PayloadFn",
+    "ValuePayloads",
+    "draw_value_sizes",
+    "value_payload",
+    "value_payloads",
+]
@@ -1,14 +1,24 @@
-from typing import Any, List
-import numpy as np
-from ..config.defaults import NP_RNG
+from typing import TYPE_CHECKING, Any, List
 
+from ..config import defaults
 
-def generate_zipf_workload(keys: List[Any], size: int, alpha: float = 1.1) -> List[Any]:
-    if not keys:
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def generate_zipf_indices(n: int, size: int, alpha: float = 1.1) -> "np.ndarray":
+    if n <= 0:
         raise ValueError("Key list is empty.")
-    n = len(keys)
+    import numpy as np
+
     ranks = np.arange(1, n + 1, dtype=np.float64)
     weights = ranks ** (-alpha)
     probabilities = weights / weights.sum()
-    indices = NP_RNG.choice(n, size=size, replace=True, p=probabilities)
+    return defaults.NP_RNG.choice(n, size=size, replace=True, p=probabilities)
+
+
+def generate_zipf_workload(keys: List[Any], size: int, alpha: float = 1.1) -> List[Any]:
+    if not keys:
+        raise ValueError("Key list is empty.")
+    indices = generate_zipf_indices(len(keys), size, alpha)
     return [keys[i] for i in indices]
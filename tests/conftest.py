@@ -0,0 +1,62 @@
+import os
+import statistics
+import subprocess
+import sys
+from typing import Callable
+
+import pytest
+
+RunPython = Callable[..., "subprocess.CompletedProcess[str]"]
+ImportTime = Callable[[str], dict[str, int]]
+
+# Timed imports are repeated and the median is compared, so one slow run on a busy machine does
+# not fail the budget tests.
+IMPORT_TIME_RUNS = 5
+
+
+@pytest.fixture(scope="session")
+def run_python(tmp_path_factory: pytest.TempPathFactory) -> RunPython:
+    # Bytecode goes to a private cache, so timed imports measure loading rather than compiling,
+    # even where PYTHONDONTWRITEBYTECODE is set.
+    env = dict(
+        os.environ,
+        PYTHONPATH=os.pathsep.join(sys.path),
+        PYTHONPYCACHEPREFIX=str(tmp_path_factory.mktemp("pycache")),
+    )
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+
+    def run(*args: str) -> "subprocess.CompletedProcess[str]":
+        return subprocess.run(
+            [sys.executable, *args], capture_output=True, text=True, check=True, env=env
+        )
+
+    return run
+
+
+@pytest.fixture(scope="session")
+def importtime(run_python: RunPython) -> ImportTime:
+    # Self time in microseconds per imported module, from `python -X importtime`.
+    def profile(code: str) -> dict[str, int]:
+        proc = run_python("-X", "importtime", "-c", code)
+        self_us: dict[str, int] = {}
+        for line in proc.stderr.splitlines():
+            if not line.startswith("import time:") or "self [us]" in line:
+                continue
+            own, _cumulative, name = line[len("import time:") :].split("|")
+            self_us[name.strip()] = self_us.get(name.strip(), 0) + int(own)
+        return self_us
+
+    return profile
+
+
+@pytest.fixture(scope="session")
+def own_import_us(importtime: ImportTime) -> Callable[[str, tuple[str, ...]], float]:
+    def median(code: str, packages: tuple[str, ...]) -> float:
+        importtime(code)  # fills the bytecode cache
+        totals = [
+            sum(us for name, us in importtime(code).items() if name.split(".")[0] in packages)
+            for _ in range(IMPORT_TIME_RUNS)
+        ]
+        return statistics.median(totals)
+
+    return median
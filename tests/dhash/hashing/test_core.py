@@ -8,6 +8,7 @@ from dhash.hashing.core import (
     RendezvousHashing,
     WeightedConsistentHashing,
     fast_hash64,
+    suffixed_key,
 )
 
 
@@ -29,6 +30,19 @@ def test_hashing_algorithms_route_to_known_nodes(algo: Any) -> None:
     assert node in {"node1", "node2", "node3"}
 
 
+def test_bytes_keys_hash_and_route_like_their_str_form() -> None:
+    assert fast_hash64(b"user:42") == fast_hash64("user:42")
+    assert suffixed_key(b"user:42", "alt") == b"user:42|alt"
+    assert fast_hash64(suffixed_key(b"user:42", "alt")) == fast_hash64(
+        suffixed_key("user:42", "alt")
+    )
+
+    nodes = ["node1", "node2", "node3"]
+    for algo in (ConsistentHashing(nodes), RendezvousHashing(nodes)):
+        for i in range(50):
+            assert algo.get_node(f"k{i}".encode()) == algo.get_node(f"k{i}")
+
+
 def test_consistent_hashing_uses_virtual_points_default() -> None:
     algo = ConsistentHashing(["node1", "node2"])
 
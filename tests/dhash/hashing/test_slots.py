@@ -0,0 +1,66 @@
+import pytest
+
+from dhash.hashing.slots import CLUSTER_SLOTS, SlotRouter, crc16, hash_tag, key_slot, key_slots
+from dhash.routing.router import DHash
+
+NODES = ["n1", "n2", "n3"]
+
+
+def test_crc16_matches_redis_reference() -> None:
+    assert crc16(b"123456789") == 0x31C3
+    assert key_slot("foo") == 12182
+    assert key_slot(b"bar") == 5061
+
+
+@pytest.mark.parametrize(
+    ("key", "tag"),
+    [
+        (b"{user1000}.following", b"user1000"),
+        (b"foo{}{bar}", b"foo{}{bar}"),
+        (b"foo{{bar}}zap", b"{bar"),
+        (b"foo{bar}{zap}", b"bar"),
+        (b"plain", b"plain"),
+    ],
+)
+def test_hash_tag_follows_cluster_rules(key: bytes, tag: bytes) -> None:
+    assert hash_tag(key) == tag
+
+
+def test_batch_slots_match_scalar() -> None:
+    keys = ["foo", "", "{user1000}.followers", "a" * 40, "ключ", b"raw", 42]
+
+    assert key_slots(keys).tolist() == [key_slot(k) for k in keys]
+
+
+def test_rebalance_moves_only_what_is_needed() -> None:
+    router = SlotRouter(NODES)
+    before = list(router.slot_table)
+
+    moves = router.add_node("n4")
+    counts = router.slot_counts()
+
+    assert max(counts.values()) - min(counts.values()) <= 1
+    assert all(dst == "n4" for _, _, _, dst in moves)
+    changed = sum(1 for a, b in zip(before, router.slot_table) if a != b)
+    assert changed == counts["n4"] == sum(end - start + 1 for start, end, _, _ in moves)
+
+    router.remove_node("n2")
+    counts = router.slot_counts()
+    assert "n2" not in counts
+    assert sum(counts.values()) == CLUSTER_SLOTS
+    assert max(counts.values()) - min(counts.values()) <= 1
+
+
+def test_dhash_uses_slot_router_as_primary_placement() -> None:
+    base = SlotRouter(NODES)
+    router = DHash(NODES, hot_key_threshold=2, window_size=1, ring=base)
+
+    routed = {router.get_node("{tag}hot") for _ in range(10)}
+
+    assert router._primary_safe("{tag}hot") == base.get_node("{tag}hot")
+    assert routed == {base.get_node("{tag}hot"), router.alt["{tag}hot"]}
+    assert len(routed) == 2
+
+    base.add_node("n4")
+    router.get_node("{tag}hot")
+    assert router.nodes == NODES + ["n4"]
@@ -0,0 +1,70 @@
+import pytest
+
+from dhash.routing.adaptive import AdaptiveDHash
+
+
+def test_imbalance_lowers_threshold_within_bounds() -> None:
+    router = AdaptiveDHash(["n1", "n2", "n3"], hot_key_threshold=400, window_size=50, interval=200)
+    for i in range(200):
+        router.get_node("hot" if i % 4 else f"cold-{i}")
+
+    assert len(router.history) == 1
+    assert router.history[0]["load_cv"] > router.target_cv
+    assert router.history[0]["top_k_share"] > 0.75
+    assert router.min_T <= router.T < 400
+
+
+def test_threshold_backs_off_when_lowering_does_not_help() -> None:
+    router = AdaptiveDHash(["n1", "n2"], hot_key_threshold=400, window_size=50, interval=100)
+    for _ in range(300):
+        router.get_node("hot")
+
+    moves = [h["T"] for h in router.history]
+    cvs = [h["load_cv"] for h in router.history]
+    # The key never reaches T, so the first interval lowers T and the imbalance stays the same.
+    assert moves[0] < 400
+    assert cvs[1] >= cvs[0] * (1 - router.tolerance)
+    # A lowering step that did not improve the CV is followed by a raise.
+    assert moves[1] > moves[0]
+    assert all(router.min_T <= t <= router.max_T for t in moves)
+
+
+def test_writes_keep_the_alternate_current_while_t_is_raised() -> None:
+    router = AdaptiveDHash(["n1", "n2", "n3"], hot_key_threshold=10, window_size=5, interval=10**6)
+    store: dict[str, dict[str, str]] = {n: {} for n in router.nodes}
+
+    def write(value: str) -> None:
+        for node in router.get_write_nodes("k"):
+            store[node]["k"] = value
+
+    write("v1")
+    for _ in range(20):
+        router.get_node("k")
+    assert "k" in router.alt
+
+    # The controller raises T above the key's count, then lowers it again.
+    router.T = 1000
+    write("v2")
+    router.T = 10
+    routed = [router.get_node("k") for _ in range(20)]
+
+    assert router.alt["k"] in routed
+    assert {store[node].get("k") for node in routed} == {"v2"}
+
+
+def test_balanced_traffic_that_splits_keys_raises_threshold() -> None:
+    router = AdaptiveDHash(
+        ["n1", "n2"], hot_key_threshold=2, window_size=1, interval=400, target_cv=1.0
+    )
+    for i in range(400):
+        router.get_node(f"k{i % 20}")
+
+    assert router.history[0]["alt_rate"] > 0
+    assert router.T > 2
+
+
+def test_invalid_controller_settings_are_rejected() -> None:
+    with pytest.raises(ValueError):
+        AdaptiveDHash(["n1"], interval=0)
+    with pytest.raises(ValueError):
+        AdaptiveDHash(["n1"], damping=0.0)
@@ -0,0 +1,56 @@
+import threading
+
+import pytest
+
+from dhash.routing.concurrent import ConcurrentDHash
+from dhash.routing.router import DHash
+
+
+def _hammer(router: ConcurrentDHash, keys: list[str], threads: int, rounds: int) -> None:
+    barrier = threading.Barrier(threads)
+
+    def worker() -> None:
+        barrier.wait()
+        for _ in range(rounds):
+            for k in keys:
+                router.get_node(k, op="read")
+        router.flush_local()
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+
+
+@pytest.mark.parametrize("flush_every", [0, 16])
+def test_concurrent_reads_do_not_lose_increments(flush_every: int) -> None:
+    router = ConcurrentDHash(
+        ["n1", "n2", "n3"], hot_key_threshold=5, window_size=3, stripes=4, flush_every=flush_every
+    )
+    keys = [f"k{i}" for i in range(20)]
+
+    _hammer(router, keys, threads=8, rounds=50)
+
+    counts = router.read_counts()
+    assert all(counts[k] == 8 * 50 for k in keys)
+
+
+def test_racing_threads_agree_on_one_alternate() -> None:
+    router = ConcurrentDHash(["n1", "n2", "n3", "n4"], hot_key_threshold=1, window_size=1)
+    keys = [f"hot{i}" for i in range(50)]
+
+    _hammer(router, keys, threads=8, rounds=3)
+
+    reference = DHash(["n1", "n2", "n3", "n4"], hot_key_threshold=1, window_size=1)
+    for k in keys:
+        reference.get_node(k)
+        assert router.alt[k] == reference.alt[k]
+
+
+def test_single_thread_routing_matches_dhash() -> None:
+    concurrent = ConcurrentDHash(["n1", "n2"], hot_key_threshold=10, window_size=5)
+    plain = DHash(["n1", "n2"], hot_key_threshold=10, window_size=5)
+
+    for _ in range(40):
+        assert concurrent.get_node("hot-key") == plain.get_node("hot-key")
@@ -0,0 +1,78 @@
+from typing import List
+
+import pytest
+
+from dhash.hashing.core import ConsistentHashing
+from dhash.routing import DHash, FailoverRouter
+
+NODES = ["n1", "n2", "n3"]
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_dhash_fails_over_to_the_alternate_first() -> None:
+    router = DHash(NODES, hot_key_threshold=100, window_size=5)
+    failover = FailoverRouter(router)
+    primary = router.get_node("k", op="write")
+    failover.mark_down(primary)
+
+    node = failover.get_node("k")
+
+    assert node != primary
+    # The alternate is worked out on the side; the key is not registered as hot.
+    assert "k" not in router.alt
+    assert failover.failovers == 1
+    # Writes land on the same node reads fall back to.
+    assert failover.get_write_nodes("k") == [node]
+
+
+def test_consistent_hashing_fails_over_to_the_next_ring_node() -> None:
+    ring = ConsistentHashing(NODES)
+    failover = FailoverRouter(ring)
+    primary = ring.get_node("k")
+    failover.mark_down(primary)
+    down: List[str] = [primary]
+
+    second = failover.get_node("k")
+    failover.mark_down(second)
+    down.append(second)
+    third = failover.get_node("k")
+
+    assert len({primary, second, third}) == 3
+    assert sorted(failover.down_nodes) == sorted(down)
+
+
+def test_down_node_is_retried_after_retry_after() -> None:
+    clock = FakeClock()
+    ring = ConsistentHashing(NODES)
+    failover = FailoverRouter(ring, retry_after=2.0, clock=clock)
+    primary = ring.get_node("k")
+    failover.mark_down(primary)
+
+    assert failover.get_node("k") != primary
+    clock.now = 2.0
+    assert failover.get_node("k") == primary
+    assert not failover.down_nodes
+
+
+def test_fallback_raises_when_every_node_is_down() -> None:
+    failover = FailoverRouter(ConsistentHashing(NODES))
+    for node in NODES:
+        failover.mark_down(node)
+
+    with pytest.raises(RuntimeError):
+        failover.get_node("k")
+
+
+def test_attributes_come_from_the_wrapped_router() -> None:
+    router = DHash(NODES, hot_key_threshold=3, window_size=2)
+    failover = FailoverRouter(router)
+
+    assert failover.alt is router.alt
+    assert failover.nodes == router.nodes
@@ -0,0 +1,119 @@
+from typing import Dict, List
+
+import pytest
+
+from dhash.routing.rate import RateDHash
+
+NODES = ["n1", "n2", "n3"]
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _read(router: RateDHash, clock: FakeClock, key: str, n: int, step: float) -> List[str]:
+    routed = []
+    for _ in range(n):
+        routed.append(router.get_node(key))
+        clock.now += step
+    return routed
+
+
+def test_key_becomes_hot_on_rate_and_alternates() -> None:
+    clock = FakeClock()
+    router = RateDHash(NODES, hot_key_threshold=10, window_size=5, clock=clock)
+    primary = router._primary_safe("k")
+
+    # 10 reads in 0.1s crosses T=10 reads per second.
+    routed = _read(router, clock, "k", 30, 0.01)
+
+    assert router.is_hot("k")
+    # Promoted on the 10th read, then a guard phase of W reads before alternating.
+    assert routed[:14] == [primary] * 14
+    assert routed[14:19] == [router.alt["k"]] * 5
+
+
+def test_slow_reads_never_become_hot() -> None:
+    clock = FakeClock()
+    router = RateDHash(NODES, hot_key_threshold=10, window_size=5, clock=clock)
+
+    routed = _read(router, clock, "k", 100, 0.5)
+
+    assert not router.is_hot("k")
+    assert set(routed) == {router._primary_safe("k")}
+    assert router.read_count("k") <= 3
+
+
+def test_hot_key_cools_down_when_rate_drops() -> None:
+    clock = FakeClock()
+    router = RateDHash(NODES, hot_key_threshold=10, window_size=5, clock=clock)
+    _read(router, clock, "k", 30, 0.01)
+    assert router.is_hot("k")
+
+    clock.now += 5.0
+    assert router.get_node("k") == router._primary_safe("k")
+    assert not router.is_hot("k")
+    assert "k" not in router.alt
+    assert len(router.get_write_nodes("k")) == 2
+
+
+def test_idle_keys_are_swept() -> None:
+    clock = FakeClock()
+    router = RateDHash(NODES, hot_key_threshold=10, window_size=5, clock=clock)
+    _read(router, clock, "hot", 30, 0.01)
+    _read(router, clock, "cold", 1, 0.0)
+
+    clock.now += 10.0
+    router.get_node("other")
+
+    assert router.read_counts() == {"other": 1}
+    assert router.alt == {}
+
+
+def test_invalid_rate_settings_are_rejected() -> None:
+    with pytest.raises(ValueError):
+        RateDHash(NODES, rate_window_seconds=0)
+    with pytest.raises(ValueError):
+        RateDHash(NODES, buckets=0)
+
+
+def test_writes_reach_the_alternate_while_the_rate_is_between_exit_and_t() -> None:
+    clock = FakeClock()
+    router = RateDHash(NODES, hot_key_threshold=10, window_size=5, clock=clock)
+    _read(router, clock, "k", 30, 0.01)
+
+    # About 7 reads per second: under T=10 but above exit_ratio * T = 5.
+    routed = _read(router, clock, "k", 20, 1 / 7)
+
+    assert router.is_hot("k")
+    assert 5 <= router.read_count("k") < 10
+    assert router.alt["k"] in routed
+    assert router.get_write_nodes("k") == [router._primary_safe("k"), router.alt["k"]]
+
+
+def test_writes_keep_reaching_the_alternate_after_the_key_cools() -> None:
+    clock = FakeClock()
+    router = RateDHash(NODES, hot_key_threshold=10, window_size=5, clock=clock)
+    store: Dict[str, Dict[str, str]] = {n: {} for n in NODES}
+
+    def write(value: str) -> None:
+        for node in router.get_write_nodes("k"):
+            store[node]["k"] = value
+
+    _read(router, clock, "k", 30, 0.01)
+    write("v1")
+    # The key goes idle and is swept, then it is written while cold.
+    clock.now += 10.0
+    router.get_node("other")
+    assert not router.is_hot("k")
+    write("v2")
+
+    routed = _read(router, clock, "k", 30, 0.01)
+
+    assert router.is_hot("k")
+    assert router.alt["k"] in routed
+    assert {store[node].get("k") for node in routed} == {"v2"}
@@ -65,3 +65,56 @@ def test_membership_change_invalidates_alternate_cache_automatically() -> None:
     assert key in router.alt
     assert set(router.nodes) == {"n1", "n2", "n3"}
     assert router.alt[key] in {"n1", "n2", "n3"}
+
+
+def test_removed_node_invalidates_alternate_cache() -> None:
+    ring = ConsistentHashing(["n1", "n2", "n3"], replicas=10)
+    router = DHash(["n1", "n2", "n3"], hot_key_threshold=1, window_size=3, ring=ring)
+    keys = [f"hot-{i}" for i in range(30)]
+    for k in keys:
+        router.get_node(k, op="read")
+    assert "n3" in router.alt.values()
+
+    ring.remove_node("n3")
+
+    routed = {router.get_node(k, op="read") for k in keys for _ in range(3)}
+    assert set(router.nodes) == {"n1", "n2"}
+    assert routed <= {"n1", "n2"}
+    assert "n3" not in router.alt.values()
+
+
+def test_ring_edited_without_a_version_bump_is_still_noticed() -> None:
+    ring = ConsistentHashing(["n1", "n2"], replicas=10)
+    router = DHash(["n1", "n2"], hot_key_threshold=1, window_size=3, ring=ring)
+    points = [k for k, owner in ring.ring.items() if owner == "n2"]
+    for k in points:
+        del ring.ring[k]
+    ring.sorted_keys = [k for k in ring.sorted_keys if k not in points]
+
+    assert {router.get_node(f"k{i}", op="read") for i in range(50)} == {"n1"}
+    assert router.nodes == ["n1"]
+
+
+def test_router_fans_writes_out_once_key_is_hot() -> None:
+    router = DHash(["n1", "n2", "n3"], hot_key_threshold=3, window_size=2)
+    key = "hot-key"
+    primary = router._primary_safe(key)
+
+    assert router.get_write_nodes(key) == [primary]
+    for _ in range(3):
+        router.get_node(key, op="read")
+
+    assert router.get_write_nodes(key) == [primary, router.alt[key]]
+    assert router.get_node(key, op="write") == primary
+
+
+def test_bytes_keys_pick_the_same_alternate_as_str_keys() -> None:
+    nodes = ["n1", "n2", "n3", "n4"]
+    by_str = DHash(nodes, hot_key_threshold=2, window_size=2)
+    by_bytes = DHash(nodes, hot_key_threshold=2, window_size=2)
+    for i in range(20):
+        key = f"hot{i}"
+        routes_str = [by_str.get_node(key) for _ in range(12)]
+        routes_bytes = [by_bytes.get_node(key.encode()) for _ in range(12)]
+        assert routes_str == routes_bytes
+        assert by_str.alt[key] == by_bytes.alt[key.encode()]
@@ -0,0 +1,62 @@
+import pytest
+
+from dhash.hashing.core import ConsistentHashing
+from dhash.routing import ConcurrentDHash, DHash, RateDHash
+
+NODES = ["n1", "n2", "n3"]
+
+
+def test_stats_are_off_by_default() -> None:
+    router = DHash(NODES, hot_key_threshold=3, window_size=2)
+    router.get_node("k")
+
+    assert router.stats is None
+    with pytest.raises(RuntimeError):
+        router.stats_snapshot()
+
+
+@pytest.mark.parametrize("cls", [DHash, ConcurrentDHash])
+def test_stats_count_routing_decisions(cls: type) -> None:
+    router = cls(NODES, hot_key_threshold=3, window_size=2)
+    stats = router.enable_stats()
+    routes = [router.get_node("hot") for _ in range(12)]
+    router.get_node("cold")
+    router.get_node("hot", op="write")
+
+    primary = router.get_node("hot", op="write")
+    snap = router.stats_snapshot(top_n=1)
+    assert snap["reads"] == 13
+    assert snap["writes"] == 2
+    assert snap["alternate_reads"] == sum(1 for r in routes if r != primary)
+    assert snap["primary_reads"] + snap["alternate_reads"] == 13
+    assert snap["hot_keys"] == 1
+    assert snap["alternates_computed"] == 1
+    assert sum(snap["node_routes"].values()) == 15
+    assert snap["keys_over_threshold"] == 1
+    assert snap["top_keys"] == [
+        {"key": "hot", "reads": 12, "primary": primary, "alternate": router.alt["hot"]}
+    ]
+    assert stats is router.stats
+
+
+def test_stats_count_membership_changes() -> None:
+    ring = ConsistentHashing(NODES)
+    router = DHash(NODES, ring=ring)
+    router.enable_stats()
+    router.get_node("k")
+    ring.add_node("n4")
+    router.get_node("k")
+    router.refresh_membership(NODES)
+
+    assert router.stats_snapshot()["membership_changes"] == 2
+
+
+def test_rate_router_counts_promotions() -> None:
+    router = RateDHash(NODES, hot_key_threshold=4, window_size=2, clock=lambda: 0.0)
+    router.enable_stats()
+    for _ in range(10):
+        router.get_node("k")
+
+    snap = router.stats_snapshot()
+    assert snap["hot_keys"] == 1
+    assert snap["alternate_reads"] > 0
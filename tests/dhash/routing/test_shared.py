@@ -0,0 +1,67 @@
+import multiprocessing
+from collections.abc import Iterator
+
+import pytest
+
+from dhash.routing.router import DHash
+from dhash.routing.shared import SharedDHash, SharedHotKeyTable
+
+NODES = ["n1", "n2", "n3"]
+
+
+def _read_many(name: str, key: str, reads: int) -> None:
+    table = SharedHotKeyTable.attach(name, NODES)
+    router = SharedDHash(NODES, table, hot_key_threshold=10, window_size=5)
+    for _ in range(reads):
+        router.get_node(key)
+    table.close()
+
+
+@pytest.fixture
+def table() -> Iterator[SharedHotKeyTable]:
+    t = SharedHotKeyTable.create(NODES, depth=4, width=1024, alt_slots=1024)
+    yield t
+    t.close()
+    t.unlink()
+
+
+def test_processes_share_hot_key_counts(table: SharedHotKeyTable) -> None:
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=_read_many, args=(table.name, "hot", 200)) for _ in range(3)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+        assert p.exitcode == 0
+
+    # Lost updates only lower the count; one key in an empty sketch has no collisions to raise it.
+    assert 200 <= table.estimate("hot") <= 600
+
+
+def test_shared_router_matches_dhash_in_one_process(table: SharedHotKeyTable) -> None:
+    shared = SharedDHash(NODES, table, hot_key_threshold=10, window_size=5)
+    plain = DHash(NODES, hot_key_threshold=10, window_size=5)
+
+    for _ in range(40):
+        assert shared.get_node("hot-key") == plain.get_node("hot-key")
+    assert table.get_alternate("hot-key") == plain.alt["hot-key"]
+
+
+def test_shared_router_reports_its_hot_keys(table: SharedHotKeyTable) -> None:
+    router = SharedDHash(NODES, table, hot_key_threshold=10, window_size=5)
+    router.enable_stats()
+    for _ in range(30):
+        router.get_node("hot-key")
+    for _ in range(3):
+        router.get_node("cold-key")
+
+    snap = router.stats_snapshot(top_n=3)
+
+    assert router.read_counts() == {"hot-key": table.estimate("hot-key")}
+    assert [e["key"] for e in snap["top_keys"]] == ["hot-key"]
+    assert snap["keys_over_threshold"] == 1
+
+
+def test_attach_rejects_different_node_set(table: SharedHotKeyTable) -> None:
+    with pytest.raises(ValueError, match="different node set"):
+        SharedHotKeyTable.attach(table.name, ["n1", "n2"])
@@ -0,0 +1,62 @@
+from pathlib import Path
+
+import pytest
+
+from dhash.routing.concurrent import ConcurrentDHash
+from dhash.routing.router import DHash
+from dhash.routing.snapshot import SnapshotWriter, load_snapshot, save_snapshot
+
+NODES = ["n1", "n2", "n3"]
+
+
+def _warm(router: DHash, key: str, reads: int) -> None:
+    for _ in range(reads):
+        router.get_node(key, op="read")
+
+
+def test_snapshot_restores_counts_and_alternates(tmp_path: Path) -> None:
+    path = str(tmp_path / "router.snap")
+    router = DHash(NODES, hot_key_threshold=10, window_size=5)
+    _warm(router, "hot", 20)
+    _warm(router, "cold", 2)
+
+    assert save_snapshot(router, path) == 1
+
+    restored = ConcurrentDHash(NODES, hot_key_threshold=10, window_size=5)
+    assert load_snapshot(restored, path) == 1
+    assert restored.read_count("hot") == 20
+    assert restored.read_count("cold") == 0
+    assert restored.alt == {"hot": router.alt["hot"]}
+    # The next read continues the window sequence instead of starting over below T.
+    assert restored.get_node("hot") == router.get_node("hot")
+
+
+def test_snapshot_drops_alternates_for_a_different_ring(tmp_path: Path) -> None:
+    path = str(tmp_path / "router.snap")
+    router = DHash(NODES, hot_key_threshold=10, window_size=5)
+    _warm(router, "hot", 20)
+    save_snapshot(router, path)
+
+    restored = DHash(NODES + ["n4"], hot_key_threshold=10, window_size=5)
+    load_snapshot(restored, path)
+
+    assert restored.read_count("hot") == 20
+    assert restored.alt == {}
+
+
+def test_load_snapshot_rejects_other_files(tmp_path: Path) -> None:
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"x" * 64)
+
+    with pytest.raises(ValueError):
+        load_snapshot(DHash(NODES), str(path))
+
+
+def test_snapshot_writer_saves_on_stop(tmp_path: Path) -> None:
+    path = str(tmp_path / "router.snap")
+    router = DHash(NODES, hot_key_threshold=4, window_size=2)
+    with SnapshotWriter(router, path, interval_seconds=60.0):
+        _warm(router, "hot", 8)
+
+    restored = DHash(NODES, hot_key_threshold=4, window_size=2)
+    assert load_snapshot(restored, path) == 1
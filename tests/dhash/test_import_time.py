@@ -0,0 +1,39 @@
+from typing import Callable
+
+HEAVY_MODULES = ("numpy", "pandas", "redis", "xxhash")
+# Loaded on first use through the package __getattr__ hooks.
+LAZY_MODULES = (
+    "dhash.hashing.slots",
+    "dhash.routing.adaptive",
+    "dhash.routing.failover",
+    "dhash.routing.rate",
+    "dhash.routing.snapshot",
+)
+OWN_IMPORT_BUDGET_US = 25_000
+
+
+def test_router_import_skips_heavy_dependencies(
+    importtime: Callable[[str], dict[str, int]],
+) -> None:
+    modules = importtime("import dhash")
+
+    assert not [m for m in modules if m.split(".")[0] in HEAVY_MODULES]
+    assert not [m for m in modules if m in LAZY_MODULES]
+
+
+def test_router_import_stays_within_budget(
+    own_import_us: Callable[[str, tuple[str, ...]], float],
+) -> None:
+    assert own_import_us("import dhash", ("dhash",)) < OWN_IMPORT_BUDGET_US
+
+
+def test_routing_a_key_does_not_load_numpy_or_pandas(
+    run_python: Callable[..., object],
+) -> None:
+    code = (
+        "import sys\n"
+        "from dhash import DHash\n"
+        "DHash(['n1', 'n2']).get_node('k')\n"
+        "assert 'numpy' not in sys.modules and 'pandas' not in sys.modules\n"
+    )
+    run_python("-c", code)
@@ -1,8 +1,9 @@
+import random
 from typing import List, Tuple
 
 import pytest
 
-from dhash.stats import weighted_percentile
+from dhash.stats import QuantileSketch, weighted_percentile, weighted_percentiles
 
 
 @pytest.mark.parametrize(
@@ -21,3 +22,38 @@ def test_weighted_percentile_robustness(
     expected: float,
 ) -> None:
     assert weighted_percentile(samples, q) == pytest.approx(expected)
+
+
+CASES = [
+    [],
+    [(10.0, 0), (20.0, 0)],
+    [(50.0, 100)],
+    [(10.0, 10), (20.0, 10)],
+    [(20.0, 2), (10.0, 10), (20.0, 8), (5.0, 0), (30.0, 1)],
+]
+
+
+@pytest.mark.parametrize("samples", CASES)
+def test_vectorized_and_sketch_match_weighted_percentile(samples: List[Tuple[float, int]]) -> None:
+    qs = [0.0, 0.25, 0.5, 0.75, 0.95, 0.99, 1.0]
+    expected = [weighted_percentile(samples, q) for q in qs]
+
+    assert weighted_percentiles(samples, qs) == expected
+
+    sketch = QuantileSketch()
+    sketch.update(samples)
+    assert sketch.quantiles(qs) == expected
+
+
+def test_sketch_stays_close_on_large_streams_and_merges() -> None:
+    rng = random.Random(3)
+    samples = [(rng.lognormvariate(0.0, 1.0), rng.randint(1, 5)) for _ in range(50_000)]
+    left, right = QuantileSketch(compression=100), QuantileSketch(compression=100)
+    left.update(samples[:20_000])
+    right.update(samples[20_000:])
+    merged = left.merge(right)
+
+    assert merged.total_weight == sum(w for _, w in samples)
+    assert len(merged._centroids()[0]) < 200
+    for q, exact in zip([0.5, 0.95, 0.99], weighted_percentiles(samples, [0.5, 0.95, 0.99])):
+        assert merged.quantile(q) == pytest.approx(exact, rel=0.03)
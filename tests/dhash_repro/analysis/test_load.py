@@ -0,0 +1,82 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from dhash import ConsistentHashing, DHash, RateDHash
+from dhash_repro.analysis import alternate_reads, analyze_load, gini, sweep_load
+
+NODES = ["n1", "n2", "n3", "n4"]
+
+
+def _zipf_ids(n_keys: int, size: int, alpha: float) -> np.ndarray:
+    rng = np.random.default_rng(7)
+    p = np.arange(1, n_keys + 1, dtype=np.float64) ** -alpha
+    return rng.choice(n_keys, size=size, p=p / p.sum())
+
+
+def test_gini_of_even_and_concentrated_loads() -> None:
+    assert gini([5, 5, 5, 5]) == pytest.approx(0.0)
+    assert gini([0, 0, 0, 12]) == pytest.approx(0.75)
+    assert gini([]) == 0.0
+
+
+def test_alternate_reads_matches_per_read_rule() -> None:
+    counts = np.arange(0, 60)
+    got = alternate_reads(counts, threshold=5, window=4).tolist()
+    router = DHash(["a", "b"], hot_key_threshold=5, window_size=4)
+    for n in counts.tolist():
+        router.reads.clear()
+        router.alt.clear()
+        routes = [router.get_node("k") for _ in range(n)]
+        alternate = router.alt.get("k")
+        assert got[n] == sum(1 for r in routes if alternate is not None and r == alternate)
+
+
+def test_closed_form_matches_replaying_the_workload() -> None:
+    keys = [f"key-{i}".encode() for i in range(200)]
+    ids = _zipf_ids(len(keys), 20_000, 1.2)
+
+    result = analyze_load(DHash(NODES, hot_key_threshold=30, window_size=8), ids, keys)
+
+    replay = DHash(NODES, hot_key_threshold=30, window_size=8)
+    expected = Counter(replay.get_node(keys[i]) for i in ids.tolist())
+    assert result["method"] == "closed-form"
+    assert result["node_load"] == {n: expected[n] for n in NODES}
+    assert result["split_keys"] == len(replay.alt)
+    assert 0.0 < result["alternate_share"] < 0.5
+    assert sum(result["node_share"].values()) == pytest.approx(1.0)
+
+
+def test_plain_ring_routes_in_batch_and_reports_hottest_key() -> None:
+    keys = [f"key-{i}" for i in range(50)]
+    ids = np.array([0] * 90 + list(range(1, 11)))
+    ring = ConsistentHashing(NODES)
+
+    result = analyze_load(ring, ids, keys)
+
+    owner = ring.get_node("key-0")
+    assert result["method"] == "batch"
+    assert result["alternate_share"] == 0.0
+    assert result["hottest_key"][owner] == "key-0"
+    assert result["hottest_key_share"][owner] >= 0.9
+    assert result["max_mean_ratio"] > 3.0
+
+
+def test_order_dependent_routers_are_replayed() -> None:
+    keys = [f"key-{i}" for i in range(20)]
+    ids = np.array([0] * 500 + list(range(20)))
+    router = RateDHash(NODES, hot_key_threshold=50, window_size=10, clock=lambda: 0.0)
+
+    result = analyze_load(router, ids, keys)
+
+    assert result["method"] == "replay"
+    assert result["alternate_share"] > 0.0
+
+
+def test_sweep_runs_every_point_in_parallel() -> None:
+    rows = sweep_load([1.1, 1.5], [50], [10, 20], [3], n_keys=500, size=5_000, processes=2)
+
+    assert [(r["alpha"], r["W"]) for r in rows] == [(1.1, 10), (1.1, 20), (1.5, 10), (1.5, 20)]
+    assert all(r["method"] == "closed-form" for r in rows)
+    assert rows == sweep_load([1.1, 1.5], [50], [10, 20], [3], n_keys=500, size=5_000, processes=1)
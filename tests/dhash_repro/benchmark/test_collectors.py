@@ -0,0 +1,287 @@
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+import pytest
+
+from dhash.hashing.core import ConsistentHashing
+from dhash.routing import FailoverRouter
+from dhash.routing.router import DHash
+from dhash_repro.benchmark.collectors import benchmark_cluster
+from dhash_repro.benchmark.timeseries import IntervalRecorder
+from dhash_repro.workloads import ValuePayloads
+
+NODES = ["n1", "n2", "n3"]
+
+
+class FakePipeline:
+    def __init__(self, store: Dict[str, int]) -> None:
+        self.store = store
+        self.ops: List[Any] = []
+
+    def set(self, key: str, payload: bytes, ex: int) -> None:
+        self.ops.append(key)
+
+    def get(self, key: str) -> None:
+        self.ops.append(None)
+
+    def execute(self) -> List[Any]:
+        for key in self.ops:
+            if key is not None:
+                self.store[key] = self.store.get(key, 0) + 1
+        return self.ops
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.sets: Dict[str, int] = {}
+
+    def pipeline(self) -> FakePipeline:
+        return FakePipeline(self.sets)
+
+
+def _run(mode: str) -> Dict[str, Any]:
+    clients = {n: FakeRedis() for n in NODES}
+    router = DHash(NODES, hot_key_threshold=5, window_size=5)
+    keys = ["hot"] * 40 + [f"cold-{i}" for i in range(20)]
+
+    def lookup(node: str, db: int = 0) -> FakeRedis:
+        return clients[node]
+
+    with (
+        patch("dhash_repro.benchmark.collectors.redis_client_for_node", lookup),
+        patch("dhash_repro.clients.replication.redis_client_for_node", lookup),
+    ):
+        for k in keys:
+            router.get_node(k, op="read")
+        metrics = benchmark_cluster(
+            keys, router, nodes=NODES, write_fraction=0.5, write_replication=mode
+        )
+    metrics["alt_sets"] = clients[router.alt["hot"]].sets.get("hot", 0)
+    return metrics
+
+
+@pytest.mark.parametrize("mode", ["sync", "async"])
+def test_benchmark_copies_hot_writes_to_alternate(mode: str) -> None:
+    metrics = _run(mode)
+
+    assert metrics["alt_sets"] == 20
+    assert metrics["write_fanout"] == pytest.approx(50 / 30)
+
+
+def test_benchmark_without_replication_writes_primary_only() -> None:
+    metrics = _run("off")
+
+    assert metrics["alt_sets"] == 0
+    assert metrics["write_fanout"] == 1.0
+    assert metrics["replication_lag_ms"] == 0.0
+
+
+def test_benchmark_records_intervals_with_alternate_reads() -> None:
+    clients = {n: FakeRedis() for n in NODES}
+    router = DHash(NODES, hot_key_threshold=5, window_size=5)
+    keys = ["hot"] * 40 + [f"cold-{i}" for i in range(20)]
+    recorder = IntervalRecorder(NODES, interval_seconds=60.0)
+
+    with patch(
+        "dhash_repro.benchmark.collectors.redis_client_for_node",
+        lambda node, db=0: clients[node],
+    ):
+        metrics = benchmark_cluster(keys, router, nodes=NODES, pipeline_size=8, recorder=recorder)
+
+    (row,) = recorder.rows()
+    assert row["Ops"] == 2 * len(keys)
+    assert row["PrimaryReads"] + row["AltReads"] == len(keys)
+    # Reads 10..40 of "hot" are past the guard phase; windows of 5 alternate, alternate first.
+    assert row["AltReads"] == 16
+    assert row["NodeOps"] == [metrics["node_load"][n] for n in NODES]
+
+
+def test_benchmark_counts_payload_bytes_per_key() -> None:
+    clients = {n: FakeRedis() for n in NODES}
+    router = DHash(NODES, hot_key_threshold=100, window_size=5)
+    keys = ["a", "b", "c", "a"]
+    payloads = ValuePayloads(keys[:3], [100, 200, 300])
+
+    with patch(
+        "dhash_repro.benchmark.collectors.redis_client_for_node", lambda node, db=0: clients[node]
+    ):
+        metrics = benchmark_cluster(keys, router, nodes=NODES, payloads=payloads)
+
+    assert metrics["bytes_written"] == 700
+    assert metrics["bandwidth_mb_s"] > 0
+
+
+class DownRedis(FakeRedis):
+    def pipeline(self) -> FakePipeline:
+        pipe = FakePipeline(self.sets)
+
+        def execute() -> List[Any]:
+            raise ConnectionError("node is down")
+
+        pipe.execute = execute  # type: ignore[method-assign]
+        return pipe
+
+
+def test_benchmark_counts_errors_on_a_down_node() -> None:
+    clients: Dict[str, FakeRedis] = {n: FakeRedis() for n in NODES}
+    router = ConsistentHashing(NODES)
+    clients[router.get_node("k-0")] = DownRedis()
+    keys = [f"k-{i}" for i in range(30)]
+
+    with patch(
+        "dhash_repro.benchmark.collectors.redis_client_for_node", lambda node, db=0: clients[node]
+    ):
+        metrics = benchmark_cluster(keys, router, nodes=NODES)
+
+    assert metrics["errors"] > 0
+    assert metrics["error_rate"] == pytest.approx(metrics["errors"] / (2 * len(keys)))
+    assert metrics["rerouted"] == 0
+
+
+def test_benchmark_reroutes_around_a_down_node_with_failover() -> None:
+    clients: Dict[str, FakeRedis] = {n: FakeRedis() for n in NODES}
+    router = FailoverRouter(ConsistentHashing(NODES))
+    down = router.get_node("k-0")
+    clients[down] = DownRedis()
+    keys = [f"k-{i}" for i in range(30)]
+
+    with patch(
+        "dhash_repro.benchmark.collectors.redis_client_for_node", lambda node, db=0: clients[node]
+    ):
+        metrics = benchmark_cluster(keys, router, nodes=NODES)
+
+    assert metrics["errors"] == 0
+    assert metrics["rerouted"] > 0
+    assert router.is_down(down)
+    assert sum(clients[n].sets.get(k, 0) for n in NODES for k in keys) == len(keys)
+
+
+class StorePipeline:
+    def __init__(self, data: Dict[str, bytes]) -> None:
+        self.data = data
+        self.ops: List[Any] = []
+
+    def set(self, key: str, payload: bytes, ex: int) -> None:
+        self.ops.append((key, payload))
+
+    def get(self, key: str) -> None:
+        self.ops.append(key)
+
+    def execute(self) -> List[Any]:
+        out: List[Any] = []
+        for op in self.ops:
+            if isinstance(op, tuple):
+                self.data[op[0]] = op[1]
+                out.append(True)
+            else:
+                out.append(self.data.get(op))
+        return out
+
+
+class StoreRedis:
+    def __init__(self) -> None:
+        self.data: Dict[str, bytes] = {}
+
+    def pipeline(self) -> StorePipeline:
+        return StorePipeline(self.data)
+
+
+def _read_back(write_replication: str) -> Dict[str, Any]:
+    clients = {n: StoreRedis() for n in NODES}
+    router = DHash(NODES, hot_key_threshold=5, window_size=5)
+    keys = ["hot"] * 40 + ["missing"]
+    for k in keys:
+        router.get_node(k, op="read")
+    # The preload wrote the hot key to its primary and its alternate.
+    for node in (router.get_node("hot", op="write"), router.alt["hot"]):
+        clients[node].data["hot"] = b'{"preload":1}'
+
+    with (
+        patch("dhash_repro.benchmark.collectors.redis_client_for_node", lambda n, db=0: clients[n]),
+        patch("dhash_repro.clients.replication.redis_client_for_node", lambda n, db=0: clients[n]),
+    ):
+        return benchmark_cluster(
+            keys, router, nodes=NODES, write_fraction=0.5, write_replication=write_replication
+        )
+
+
+def test_reads_from_an_alternate_without_replication_are_stale() -> None:
+    metrics = _read_back("off")
+
+    assert metrics["read_misses"] == 1
+    assert metrics["read_stale"] > 0
+    assert metrics["read_counts_by_route"]["alternate"]["stale"] == metrics["read_stale"]
+    assert metrics["read_counts_by_route"]["primary"]["stale"] == 0
+    assert metrics["hit_ratio"] < 1.0
+
+
+def test_replicated_writes_keep_alternate_reads_fresh() -> None:
+    metrics = _read_back("sync")
+
+    assert metrics["read_stale"] == 0
+    assert metrics["alt_hit_ratio"] == 1.0
+    assert metrics["read_hits"] + metrics["read_misses"] == 21
+
+
+def test_values_left_by_an_earlier_cell_are_stale() -> None:
+    clients = {n: StoreRedis() for n in NODES}
+    router = DHash(NODES, hot_key_threshold=5, window_size=5)
+    keys = ["hot"] * 40
+    for k in keys:
+        router.get_node(k, op="read")
+
+    with (
+        patch("dhash_repro.benchmark.collectors.redis_client_for_node", lambda n, db=0: clients[n]),
+        patch("dhash_repro.clients.replication.redis_client_for_node", lambda n, db=0: clients[n]),
+    ):
+        # value_bytes=0 still writes the version marker, so the two cells' values differ.
+        first = benchmark_cluster(
+            keys, router, nodes=NODES, value_bytes=0, write_fraction=0.5, write_replication="sync"
+        )
+        second = benchmark_cluster(
+            keys, router, nodes=NODES, value_bytes=0, write_fraction=0.5, write_replication="off"
+        )
+
+    assert first["read_stale"] == 0
+    assert second["read_counts_by_route"]["alternate"]["stale"] > 0
+
+
+def test_on_start_runs_after_routing_and_before_io() -> None:
+    clients = {n: FakeRedis() for n in NODES}
+    routed: List[Any] = []
+
+    class SpyDHash(DHash):
+        def get_node(self, key: Any, op: str = "read") -> str:
+            routed.append(key)
+            return super().get_node(key, op=op)
+
+    router = SpyDHash(NODES, hot_key_threshold=5, window_size=5)
+    keys = [f"k{i % 7}" for i in range(50)]
+    seen: List[Any] = []
+
+    def on_start() -> None:
+        seen.append((len(routed), sum(sum(c.sets.values()) for c in clients.values())))
+
+    with patch(
+        "dhash_repro.benchmark.collectors.redis_client_for_node", lambda n, db=0: clients[n]
+    ):
+        benchmark_cluster(keys, router, nodes=NODES, write_fraction=0.5, on_start=on_start)
+
+    assert seen == [(len(routed), 0)]
+    assert len(routed) >= len(keys)
+
+
+def test_alternate_check_does_not_count_as_routed_writes() -> None:
+    clients = {n: FakeRedis() for n in NODES}
+    router = DHash(NODES, hot_key_threshold=5, window_size=5)
+    router.enable_stats()
+    keys = ["hot"] * 40
+
+    with patch(
+        "dhash_repro.benchmark.collectors.redis_client_for_node", lambda n, db=0: clients[n]
+    ):
+        benchmark_cluster(keys, router, nodes=NODES, write_fraction=0.5)
+
+    snap = router.stats_snapshot()
+    assert snap["writes"] == 20
+    assert snap["reads"] == 20
@@ -0,0 +1,50 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from dhash_repro.benchmark.micro import (
+    ROUTERS,
+    compare_to_baseline,
+    load_results,
+    make_keys,
+    run_suite,
+    write_results,
+)
+
+
+def test_suite_covers_every_router_and_key_type(tmp_path: Path) -> None:
+    rows = run_suite(node_counts=[4], vnodes=[20], alphas=[1.1], ops=300, n_keys=100, repeat=1)
+
+    assert {r["router"] for r in rows} == set(ROUTERS)
+    assert {r["key_type"] for r in rows} == {"str", "bytes", "int"}
+    for r in rows:
+        assert r["ns_per_op"] > 0
+        assert r["construct_us"] > 0
+        assert r["rebuild_us"] > 0
+
+    out = tmp_path / "micro.json"
+    write_results(str(out), rows)
+    assert "python" in json.loads(out.read_text())["metadata"]
+    assert load_results(str(out)) == rows
+
+
+def test_keys_have_the_requested_type() -> None:
+    assert all(isinstance(k, bytes) for k in make_keys(50, 200, 0.0, "bytes"))
+    assert all(isinstance(k, int) for k in make_keys(50, 200, 1.1, "int"))
+    with pytest.raises(ValueError):
+        make_keys(50, 200, 1.1, "float")
+
+
+def test_compare_flags_only_slowdowns_beyond_tolerance() -> None:
+    baseline = [{"case": "a", "ns_per_op": 100.0}, {"case": "b", "ns_per_op": 100.0}]
+    rows = [
+        {"case": "a", "ns_per_op": 120.0},
+        {"case": "b", "ns_per_op": 150.0},
+        {"case": "new", "ns_per_op": 999.0},
+    ]
+
+    regressions = compare_to_baseline(rows, baseline, tolerance=0.25)
+
+    assert [r["case"] for r in regressions] == ["b"]
+    assert regressions[0]["ratio"] == pytest.approx(1.5)
@@ -0,0 +1,36 @@
+import pytest
+
+from dhash_repro.benchmark.timeseries import IntervalRecorder
+
+
+def test_recorder_buckets_ops_by_time_slice_and_grows() -> None:
+    now = [100.0]
+    recorder = IntervalRecorder(
+        ["a", "b"],
+        interval_seconds=0.5,
+        hist_bounds_us=[10.0, 100.0],
+        expected_seconds=1.0,
+        clock=lambda: now[0],
+    ).start()
+
+    recorder.record("a", 10, 5e-6, reads=10, alternate_reads=0)
+    now[0] = 100.7
+    recorder.record("b", 4, 50e-6, reads=4, alternate_reads=3)
+    recorder.record("a", 6, 500e-6)
+    now[0] = 103.2
+    recorder.record("b", 2, 5e-6)
+
+    rows = recorder.rows()
+    assert [r["Interval"] for r in rows] == list(range(7))
+    assert [r["Ops"] for r in rows] == [10, 10, 0, 0, 0, 0, 2]
+    assert rows[1]["NodeOps"] == [6, 4]
+    assert (rows[1]["PrimaryReads"], rows[1]["AltReads"]) == (1, 3)
+    assert rows[1]["LatencyHist"] == [0, 4, 6]
+    assert rows[1]["Thr"] == pytest.approx(20.0)
+    assert rows[1]["AvgMs"] == pytest.approx((4 * 0.05 + 6 * 0.5) / 10)
+    assert recorder.arrays["node_ops"].shape == (7, 2)
+
+
+def test_recorder_rejects_non_positive_interval() -> None:
+    with pytest.raises(ValueError):
+        IntervalRecorder(["a"], interval_seconds=0)
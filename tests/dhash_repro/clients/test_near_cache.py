@@ -0,0 +1,49 @@
+from dhash.routing.router import DHash
+from dhash_repro.clients.near_cache import NearCache
+
+
+def test_near_cache_admits_only_keys_past_threshold() -> None:
+    router = DHash(["n1", "n2"], hot_key_threshold=3, window_size=2)
+    cache = NearCache(router, capacity=8)
+
+    router.get_node("k")
+    assert cache.put("k", b"v") is False
+
+    router.get_node("k")
+    router.get_node("k")
+    assert cache.put("k", b"v") is True
+    assert cache.get("k") == b"v"
+
+
+def test_near_cache_expires_and_invalidates_entries() -> None:
+    now = [0.0]
+    cache = NearCache(capacity=8, ttl_seconds=5.0, clock=lambda: now[0])
+
+    cache.put("a", b"1")
+    cache.put("b", b"2")
+    cache.invalidate("a")
+    now[0] = 10.0
+
+    assert cache.get("a") is None
+    assert cache.get("b") is None
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_near_cache_keeps_frequent_keys_over_one_hit_scans() -> None:
+    cache = NearCache(capacity=10, window_ratio=0.1)
+    hot = [f"hot{i}" for i in range(9)]
+    for _ in range(5):
+        for k in hot:
+            if cache.get(k) is None:
+                cache.put(k, b"v")
+
+    for i in range(60):
+        cache.get(f"scan{i}")
+        cache.put(f"scan{i}", b"v")
+
+    assert sum(1 for k in hot if cache.get(k) is not None) == len(hot)
+    assert len(cache) <= 10
+    # The one-hit scan keys lose admission; none of them evicts a hot key.
+    stats = cache.stats()
+    assert stats["evictions"] == 0
+    assert stats["admissions_rejected"] > 0
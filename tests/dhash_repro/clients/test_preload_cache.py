@@ -0,0 +1,83 @@
+from unittest.mock import patch
+
+from dhash.hashing.core import ConsistentHashing
+from dhash.routing.router import DHash
+from dhash_repro.clients.preload_cache import PreloadCache
+from dhash_repro.clients.redis_client import preload_cluster
+
+
+class FakePipeline:
+    def __init__(self, log: list[str]) -> None:
+        self.log = log
+
+    def set(self, key: str, payload: bytes, ex: int) -> None:
+        self.log.append(key)
+
+    def execute(self) -> None:
+        return None
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.written: list[str] = []
+
+    def pipeline(self) -> FakePipeline:
+        return FakePipeline(self.written)
+
+
+def _preload(router: object, keys: list[str], cache: PreloadCache) -> int:
+    clients = {n: FakeRedis() for n in ("n1", "n2", "n3")}
+    with patch(
+        "dhash_repro.clients.redis_client.redis_client_for_node",
+        side_effect=lambda node, db=0: clients[node],
+    ):
+        preload_cluster(router, keys, cache=cache)
+    return sum(len(c.written) for c in clients.values())
+
+
+def test_preload_cache_skips_resident_placement() -> None:
+    keys = [f"key-{i}" for i in range(200)]
+    cache = PreloadCache()
+    nodes = ["n1", "n2", "n3"]
+
+    assert _preload(ConsistentHashing(nodes, replicas=10), keys, cache) == 200
+    assert _preload(ConsistentHashing(nodes, replicas=10), keys, cache) == 0
+
+
+def test_preload_cache_writes_only_alternate_delta_after_ring_baseline() -> None:
+    keys = [f"key-{i}" for i in range(200)]
+    cache = PreloadCache()
+    nodes = ["n1", "n2", "n3"]
+
+    _preload(ConsistentHashing(nodes, replicas=10), keys, cache)
+    router = DHash(nodes, replicas=10)
+    written = _preload(router, keys, cache)
+
+    assert written == sum(1 for k in keys if router.alt[k] != router._primary_safe(k))
+
+
+def test_preload_cache_rewrites_keys_near_expiry() -> None:
+    now = [0.0]
+    keys = [f"key-{i}" for i in range(50)]
+    cache = PreloadCache(min_remaining_seconds=100, clock=lambda: now[0])
+    ring = ConsistentHashing(["n1", "n2", "n3"], replicas=10)
+
+    _preload(ring, keys, cache)
+    now[0] = 550.0
+
+    assert _preload(ring, keys, cache) == 50
+
+
+def test_preload_cache_hashes_the_same_key_list_once() -> None:
+    keys = [f"key-{i}" for i in range(200)]
+    cache = PreloadCache()
+    nodes = ["n1", "n2", "n3"]
+
+    with patch(
+        "dhash_repro.clients.preload_cache._keyset_signature", return_value="sig"
+    ) as signature:
+        _preload(ConsistentHashing(nodes, replicas=10), keys, cache)
+        _preload(ConsistentHashing(nodes, replicas=10), keys, cache)
+        assert signature.call_count == 1
+        _preload(ConsistentHashing(nodes, replicas=10), list(keys), cache)
+        assert signature.call_count == 2
@@ -0,0 +1,79 @@
+import threading
+import time
+from typing import Any, Dict, List
+
+import pytest
+
+from dhash_repro.clients.preloader import StreamingPreloader
+
+
+def test_keys_are_written_in_chunks_per_node() -> None:
+    chunks: Dict[str, List[List[Any]]] = {"n1": [], "n2": []}
+    marked: List[str] = []
+
+    def write(node: str, keys: List[Any]) -> None:
+        chunks[node].append(keys)
+
+    with StreamingPreloader(write, chunk_size=3, on_written=lambda n, ks: marked.append(n)) as p:
+        for i in range(7):
+            p.add("n1", i)
+        p.add_many("n2", list(range(5)))
+
+    assert chunks["n1"] == [[0, 1, 2], [3, 4, 5], [6]]
+    assert chunks["n2"] == [[0, 1, 2], [3, 4]]
+    assert p.stats()["written"] == 12
+    assert sorted(marked) == ["n1"] * 3 + ["n2"] * 2
+
+
+def test_failed_chunks_are_counted_and_not_marked() -> None:
+    marked: List[str] = []
+
+    def write(node: str, keys: List[Any]) -> None:
+        if node == "down":
+            raise ConnectionError("node is down")
+
+    with StreamingPreloader(write, chunk_size=2, on_written=lambda n, ks: marked.append(n)) as p:
+        p.add_many("up", [1, 2, 3])
+        p.add_many("down", [1, 2, 3])
+
+    assert (p.written, p.failed) == (3, 3)
+    assert set(marked) == {"up"}
+
+
+def test_nodes_are_written_concurrently() -> None:
+    barrier = threading.Barrier(2, timeout=5.0)
+
+    def write(node: str, keys: List[Any]) -> None:
+        # Each writer waits for the other, so a serial preloader would time out here.
+        barrier.wait()
+
+    with StreamingPreloader(write, chunk_size=1) as p:
+        p.add("n1", "a")
+        p.add("n2", "b")
+
+    assert p.failed == 0
+
+
+def test_a_slow_node_bounds_what_is_buffered() -> None:
+    release = threading.Event()
+
+    def write(node: str, keys: List[Any]) -> None:
+        release.wait(5.0)
+
+    loader = StreamingPreloader(write, chunk_size=10, queue_depth=2)
+    producer = threading.Thread(target=loader.add_many, args=("n1", list(range(1_000))))
+    producer.start()
+    time.sleep(0.2)
+
+    # One chunk in the writer, two queued, and one waiting in add_many.
+    assert loader.queued <= 4 * 10
+    release.set()
+    producer.join()
+    assert loader.close()["written"] == 1_000
+
+
+def test_invalid_sizes_are_rejected() -> None:
+    with pytest.raises(ValueError):
+        StreamingPreloader(lambda n, ks: None, chunk_size=0)
+    with pytest.raises(ValueError):
+        StreamingPreloader(lambda n, ks: None, queue_depth=0)
@@ -0,0 +1,33 @@
+import pytest
+
+from dhash_repro.clients.read_counts import ReadCounts
+
+
+def test_replies_are_split_into_hits_misses_and_stale_per_route() -> None:
+    reads = ReadCounts()
+    keys = ["a", "b", "c", "d"]
+    replies = [b"new", None, b"old", b"new"]
+
+    nbytes = reads.count("n1", keys, replies, lambda k: b"new", alternates=b"\x00\x00\x01\x01")
+
+    assert nbytes == 9
+    assert reads.totals() == {"hits": 2, "misses": 1, "stale": 1}
+    assert reads.by_route() == {
+        "primary": {"hits": 1, "misses": 1, "stale": 0},
+        "alternate": {"hits": 1, "misses": 0, "stale": 1},
+    }
+    assert reads.hit_ratio() == pytest.approx(0.5)
+    assert reads.hit_ratio("alternate") == pytest.approx(0.5)
+
+
+def test_any_value_is_a_hit_without_an_expected_value() -> None:
+    reads = ReadCounts()
+    reads.count("n1", ["a", "b"], [b"x", None], route="failover")
+    reads.count("n2", ["a"], [b"y"], lambda k: None)
+
+    assert reads.by_node() == {
+        "n1": {"hits": 1, "misses": 1, "stale": 0},
+        "n2": {"hits": 1, "misses": 0, "stale": 0},
+    }
+    assert set(reads.by_route()) == {"failover", "primary"}
+    assert reads.hit_ratio("alternate") == 0.0
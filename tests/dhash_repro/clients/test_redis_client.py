@@ -1,7 +1,8 @@
 from unittest.mock import patch
 
 from dhash.routing.router import DHash
-from dhash_repro.clients.redis_client import warmup_cluster
+from dhash_repro.clients.redis_client import node_memory_stats, preload_cluster, warmup_cluster
+from dhash_repro.workloads import ValuePayloads
 
 
 class FakePipeline:
@@ -35,7 +36,7 @@ def test_warmup_cluster_defaults_to_up_to_1000_keys() -> None:
 
     with patch(
         "dhash_repro.clients.redis_client.redis_client_for_node",
-        side_effect=lambda node: clients[node],
+        side_effect=lambda node, db=0: clients[node],
     ):
         warmup_cluster(router, keys)
 
@@ -45,3 +46,69 @@ def test_warmup_cluster_defaults_to_up_to_1000_keys() -> None:
             touched += sum(1 for cmd in pipe.commands if cmd[0] == "get")
 
     assert touched == 1000
+
+
+def test_preload_reports_bytes_of_alternate_copies() -> None:
+    router = DHash(["n1", "n2", "n3"], hot_key_threshold=10, window_size=5)
+    keys = ["a", "b", "c"]
+    clients = {n: FakeRedis() for n in router.nodes}
+    payloads = ValuePayloads(keys, [100, 20, 3])
+
+    with patch(
+        "dhash_repro.clients.redis_client.redis_client_for_node",
+        side_effect=lambda node, db=0: clients[node],
+    ):
+        placed = preload_cluster(router, keys, payloads=payloads)
+
+    # Placement gives every key a copy on its alternate as well as its primary.
+    assert placed["keys"] == 3
+    assert placed["copies"] == 6
+    assert placed["key_bytes"] == 123
+    assert placed["replica_bytes"] == 123
+
+
+class FakeInfoRedis:
+    def __init__(self, used: int, keys: int) -> None:
+        self.used = used
+        self.keys = keys
+
+    def info(self, section: str) -> dict[str, object]:
+        if section == "memory":
+            return {"used_memory": self.used, "used_memory_dataset": self.used // 2}
+        return {"db0": {"keys": self.keys, "expires": self.keys}}
+
+
+def test_node_memory_stats_skips_unreachable_nodes() -> None:
+    def lookup(node: str, db: int = 0) -> FakeInfoRedis:
+        if node == "down":
+            raise ConnectionError("refused")
+        return FakeInfoRedis(2_000_000, 42)
+
+    with patch("dhash_repro.clients.redis_client.redis_client_for_node", side_effect=lookup):
+        stats = node_memory_stats(["up", "down"])
+
+    assert stats == {
+        "up": {
+            "used_memory": 2_000_000,
+            "used_memory_dataset": 1_000_000,
+            "keys": 42,
+            "expires": 42,
+        }
+    }
+
+
+def test_preload_splits_each_node_into_pipelines_of_chunk_size() -> None:
+    router = DHash(["n1", "n2"], hot_key_threshold=10, window_size=5)
+    keys = [f"key-{i}" for i in range(50)]
+    clients = {n: FakeRedis() for n in router.nodes}
+
+    with patch(
+        "dhash_repro.clients.redis_client.redis_client_for_node",
+        side_effect=lambda node, db=0: clients[node],
+    ):
+        placed = preload_cluster(router, keys, chunk_size=8)
+
+    sizes = [len(pipe.commands) for client in clients.values() for pipe in client.pipes]
+    assert max(sizes) <= 8
+    assert sum(sizes) == placed["copies"] == placed["written"]
+    assert placed["failed"] == 0
@@ -0,0 +1,43 @@
+from typing import Any, List, Tuple
+
+import pytest
+
+from dhash_repro.benchmark.collectors import split_read_write
+from dhash_repro.clients.replication import ReplicationQueue
+
+
+def test_replication_queue_groups_by_node_and_flushes_on_close() -> None:
+    sent: List[Tuple[str, List[Any]]] = []
+    with ReplicationQueue(lambda node, keys: sent.append((node, keys))) as queue:
+        for i in range(10):
+            queue.submit("n1" if i % 2 else "n2", f"k{i}")
+        queue.flush()
+
+    assert sorted(k for _, keys in sent for k in keys) == sorted(f"k{i}" for i in range(10))
+    for node, keys in sent:
+        assert all((int(k[1:]) % 2 == 1) == (node == "n1") for k in keys)
+    assert queue.stats()["replicated"] == 10
+
+
+def test_replication_queue_applies_back_pressure_without_worker() -> None:
+    sent: List[List[Any]] = []
+    queue = ReplicationQueue(lambda node, keys: sent.append(keys), max_pending=3)
+    for i in range(7):
+        queue.submit("n1", i)
+
+    assert sent == [[0, 1, 2], [3, 4, 5]]
+    assert queue.stalls == 2
+    queue.close()
+    assert sent[-1] == [6]
+    with pytest.raises(RuntimeError):
+        queue.submit("n1", 7)
+
+
+def test_split_read_write_is_even_and_deterministic() -> None:
+    keys = list(range(100))
+    writes, reads = split_read_write(keys, 0.1)
+
+    assert len(writes) == 10
+    assert len(reads) == 90
+    assert writes == [9, 19, 29, 39, 49, 59, 69, 79, 89, 99]
+    assert split_read_write(keys, None) == (keys, keys)
@@ -0,0 +1,34 @@
+import urllib.request
+
+from dhash.routing import DHash
+from dhash_repro.monitoring import MetricsServer, render_prometheus
+
+
+def test_render_lists_counters_node_routes_and_top_keys() -> None:
+    router = DHash(["n1", "n2"], hot_key_threshold=2, window_size=1)
+    router.enable_stats()
+    for _ in range(5):
+        router.get_node(b'say "hi"')
+
+    text = render_prometheus(router.stats_snapshot(top_n=1), prefix="test")
+
+    assert "test_reads_total 5\n" in text
+    assert "# TYPE test_alternate_reads_total counter" in text
+    assert "test_t 2\n" in text
+    assert 'test_node_routes_total{node="n1"}' in text or 'node="n2"' in text
+    assert 'key="say \\"hi\\""' in text
+    assert text.endswith("\n")
+
+
+def test_server_exposes_metrics_endpoint() -> None:
+    router = DHash(["n1", "n2"])
+    server = MetricsServer(router, host="127.0.0.1", port=0).start()
+    try:
+        router.get_node("k")
+        host, port = server.address
+        with urllib.request.urlopen(f"http://{host}:{port}/metrics", timeout=5) as resp:
+            body = resp.read().decode()
+    finally:
+        server.stop()
+
+    assert "dhash_reads_total 1" in body
@@ -0,0 +1,60 @@
+import csv
+import json
+from pathlib import Path
+
+import pytest
+
+from dhash_repro.persistence.writer import ResultWriter
+
+
+def _row(mode: str, t: int | None) -> dict[str, object]:
+    return {
+        "Dataset": "nasa",
+        "Mode": mode,
+        "Alpha": 1.5,
+        "Pipeline": 200,
+        "W": 200 if t is not None else None,
+        "T": t,
+        "Thr": 1234.5,
+        "LatencyHist": [0, 3, 7],
+    }
+
+
+def test_csv_writer_streams_rows_before_close(tmp_path: Path) -> None:
+    writer = ResultWriter(str(tmp_path / "out"), fmt="csv")
+    writer.append(_row("Consistent Hashing", None))
+
+    with open(writer.path, encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 1
+    assert rows[0]["T"] == ""
+    assert json.loads(rows[0]["LatencyHist"]) == [0, 3, 7]
+
+    writer.append(_row("D-HASH", 300))
+    writer.close()
+
+    with open(writer.path, encoding="utf-8") as f:
+        assert len(list(csv.DictReader(f))) == 2
+
+
+@pytest.mark.parametrize("fmt", ["arrow", "parquet"])
+def test_columnar_writer_keeps_types_and_metadata(tmp_path: Path, fmt: str) -> None:
+    pa = pytest.importorskip("pyarrow")
+
+    with ResultWriter(
+        str(tmp_path / "out"), fmt=fmt, metadata={"seed": 1337}, batch_size=1
+    ) as writer:
+        writer.append(_row("Consistent Hashing", None))
+        writer.append(_row("D-HASH", 300))
+
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(writer.path)
+    else:
+        table = pa.ipc.open_file(writer.path).read_all()
+
+    assert table.num_rows == 2
+    assert table.column("T").to_pylist() == [None, 300]
+    assert table.column("LatencyHist").to_pylist() == [[0, 3, 7], [0, 3, 7]]
+    assert json.loads(table.schema.metadata[b"seed"]) == 1337
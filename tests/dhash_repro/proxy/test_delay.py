@@ -0,0 +1,79 @@
+import socket
+import threading
+import time
+from typing import Iterator, Tuple
+
+import pytest
+
+from dhash_repro.proxy import DelayProxy
+
+
+@pytest.fixture
+def echo_server() -> Iterator[Tuple[str, int]]:
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen()
+
+    def _serve() -> None:
+        while True:
+            try:
+                conn, _ = listener.accept()
+            except OSError:
+                return
+            threading.Thread(target=_echo, args=(conn,), daemon=True).start()
+
+    def _echo(conn: socket.socket) -> None:
+        with conn:
+            while data := conn.recv(65536):
+                conn.sendall(data)
+
+    threading.Thread(target=_serve, daemon=True).start()
+    host, port = listener.getsockname()
+    yield host, port
+    listener.close()
+
+
+def _roundtrip(address: Tuple[str, int], payload: bytes = b"ping") -> Tuple[bytes, float]:
+    with socket.create_connection(address, timeout=5.0) as sock:
+        start = time.perf_counter()
+        sock.sendall(payload)
+        data = sock.recv(65536)
+        return data, time.perf_counter() - start
+
+
+def _is_refused(address: Tuple[str, int]) -> bool:
+    try:
+        return _roundtrip(address)[0] == b""
+    except ConnectionResetError:
+        return True
+
+
+def test_delay_proxy_forwards_with_delay(echo_server: Tuple[str, int]) -> None:
+    with DelayProxy(echo_server) as proxy:
+        data, fast = _roundtrip(proxy.address)
+        proxy.set_delay(0.05)
+        _, slow = _roundtrip(proxy.address)
+
+    assert data == b"ping"
+    assert slow >= 0.05 > fast
+
+
+def test_delay_proxy_cuts_connections_while_down(echo_server: Tuple[str, int]) -> None:
+    with DelayProxy(echo_server) as proxy:
+        sock = socket.create_connection(proxy.address, timeout=5.0)
+        sock.sendall(b"a")
+        assert sock.recv(16) == b"a"
+
+        proxy.set_down(True)
+        # The live connection is closed, and new ones are refused until the node is back.
+        assert sock.recv(16) == b""
+        sock.close()
+        assert _is_refused(proxy.address)
+
+        proxy.set_down(False)
+        assert _roundtrip(proxy.address)[0] == b"ping"
+
+
+def test_delay_proxy_requires_start() -> None:
+    with pytest.raises(RuntimeError):
+        _ = DelayProxy(("127.0.0.1", 1)).address
@@ -0,0 +1,50 @@
+import pytest
+
+from dhash_repro.proxy.resp import (
+    ProtocolError,
+    RespError,
+    RespParser,
+    RespSimple,
+    RespValue,
+    encode_command,
+    encode_reply,
+)
+
+
+def test_parser_handles_split_frames() -> None:
+    payload = encode_command([b"SET", b"k", b"v"]) + encode_command([b"GET", b"k"])
+    parser = RespParser()
+    parser.feed(payload[:7])
+    assert parser.parse_all() == []
+    parser.feed(payload[7:])
+    assert parser.parse_all() == [[b"SET", b"k", b"v"], [b"GET", b"k"]]
+
+
+def test_parser_accepts_inline_commands() -> None:
+    parser = RespParser()
+    parser.feed(b"PING\r\n")
+    assert parser.parse_all() == [[b"PING"]]
+
+
+def test_reply_round_trip() -> None:
+    replies: list[RespValue] = [
+        RespSimple("OK"),
+        RespError("ERR boom"),
+        3,
+        None,
+        b"v",
+        [b"a", None, 1],
+    ]
+    parser = RespParser()
+    parser.feed(b"".join(encode_reply(r) for r in replies))
+    parsed = parser.parse_all()
+    assert parsed == replies
+    assert isinstance(parsed[0], RespSimple)
+    assert isinstance(parsed[1], RespError)
+
+
+def test_parser_rejects_unknown_type() -> None:
+    parser = RespParser()
+    parser.feed(b"*1\r\n!oops\r\n")
+    with pytest.raises(ProtocolError):
+        parser.parse_all()
@@ -0,0 +1,297 @@
+import asyncio
+from typing import Dict, List, Tuple
+
+from dhash.hashing.core import ConsistentHashing
+from dhash.routing import DHash
+from dhash_repro.proxy import (
+    RespError,
+    RespParser,
+    RespSimple,
+    RoutingProxy,
+    encode_command,
+    encode_reply,
+)
+from dhash_repro.proxy.resp import RespValue
+
+NODES = ["n1", "n2", "n3"]
+
+
+class FakeRedisServer:
+    def __init__(self) -> None:
+        self.data: Dict[bytes, bytes] = {}
+
+    def execute(self, args: List[bytes]) -> RespValue:
+        name = args[0].upper()
+        if name == b"SET":
+            self.data[args[1]] = args[2]
+            return RespSimple("OK")
+        if name == b"GET":
+            return self.data.get(args[1])
+        if name == b"MGET":
+            return [self.data.get(k) for k in args[1:]]
+        if name == b"DEL":
+            return sum(1 for k in args[1:] if self.data.pop(k, None) is not None)
+        if name == b"PTTL":
+            return -1 if args[1] in self.data else -2
+        raise AssertionError(f"unexpected command {args!r}")
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        parser = RespParser()
+        while True:
+            data = await reader.read(65536)
+            if not data:
+                break
+            parser.feed(data)
+            for command in parser.parse_all():
+                assert isinstance(command, list)
+                writer.write(encode_reply(self.execute(command)))
+            await writer.drain()
+        writer.close()
+
+
+async def _request(address: Tuple[str, int], commands: List[List[bytes]]) -> List[RespValue]:
+    reader, writer = await asyncio.open_connection(*address)
+    writer.write(b"".join(encode_command(c) for c in commands))
+    await writer.drain()
+    parser = RespParser()
+    replies: List[RespValue] = []
+    while len(replies) < len(commands):
+        parser.feed(await reader.read(65536))
+        replies.extend(parser.parse_all())
+    writer.close()
+    return replies
+
+
+async def _scenario() -> Tuple[Dict[str, FakeRedisServer], List[RespValue], List[RespValue]]:
+    fakes = {n: FakeRedisServer() for n in NODES}
+    servers = []
+    addresses = {}
+    for node, fake in fakes.items():
+        server = await asyncio.start_server(fake.handle, "127.0.0.1", 0)
+        servers.append(server)
+        addresses[node] = server.sockets[0].getsockname()[:2]
+
+    proxy = RoutingProxy(ConsistentHashing(NODES), addresses)
+    proxy_addr = await proxy.start("127.0.0.1", 0)
+    try:
+        keys = [f"key-{i}".encode() for i in range(20)]
+        writes = await _request(proxy_addr, [[b"SET", k, b"v" + k] for k in keys])
+        reads = await _request(
+            proxy_addr,
+            [[b"GET", keys[0]], [b"MGET", *keys], [b"DEL", *keys[:5]], [b"PING"]],
+        )
+    finally:
+        await proxy.close()
+        for server in servers:
+            server.close()
+            await server.wait_closed()
+    return fakes, writes, reads
+
+
+def test_proxy_routes_keys_to_router_nodes() -> None:
+    fakes, writes, reads = asyncio.run(_scenario())
+    router = ConsistentHashing(NODES)
+    keys = [f"key-{i}".encode() for i in range(20)]
+
+    assert writes == ["OK"] * len(keys)
+    for k in keys[5:]:
+        assert k in fakes[router.get_node(k.decode())].data
+
+    get_reply, mget_reply, del_reply, ping_reply = reads
+    assert get_reply == b"v" + keys[0]
+    assert mget_reply == [b"v" + k for k in keys]
+    assert del_reply == 5
+    assert ping_reply == "PONG"
+    assert sum(len(f.data) for f in fakes.values()) == len(keys) - 5
+
+
+async def _start(
+    fakes: Dict[str, FakeRedisServer],
+) -> Tuple[List[asyncio.AbstractServer], Dict[str, Tuple[str, int]]]:
+    servers: List[asyncio.AbstractServer] = []
+    addresses: Dict[str, Tuple[str, int]] = {}
+    for node, fake in fakes.items():
+        server = await asyncio.start_server(fake.handle, "127.0.0.1", 0)
+        servers.append(server)
+        addresses[node] = server.sockets[0].getsockname()[:2]
+    return servers, addresses
+
+
+async def _dhash_scenario() -> Tuple[DHash, Dict[str, FakeRedisServer], List[RespValue]]:
+    fakes = {n: FakeRedisServer() for n in NODES}
+    servers, addresses = await _start(fakes)
+    router = DHash(NODES, hot_key_threshold=2, window_size=1)
+    proxy = RoutingProxy(router, addresses)
+    proxy_addr = await proxy.start("127.0.0.1", 0)
+    try:
+        await _request(proxy_addr, [[b"SET", b"hot", b"v1"], [b"SET", b"other", b"v2"]])
+        replies = []
+        for _ in range(10):
+            replies.extend(await _request(proxy_addr, [[b"GET", b"hot"]]))
+        replies.extend(await _request(proxy_addr, [[b"MGET", b"hot", b"other"]]))
+    finally:
+        await proxy.close()
+        for server in servers:
+            server.close()
+            await server.wait_closed()
+    return router, fakes, replies
+
+
+def test_dhash_reads_of_keys_written_before_turning_hot_are_served() -> None:
+    router, fakes, replies = asyncio.run(_dhash_scenario())
+
+    assert replies[:10] == [b"v1"] * 10
+    assert replies[10] == [b"v1", b"v2"]
+    # The first alternate read copied the value over, so later alternate reads hit directly.
+    assert fakes[router.alt[b"hot"]].data[b"hot"] == b"v1"
+
+
+class DroppingRedisServer(FakeRedisServer):
+    # Closes the connection without replying when it sees GET boom.
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        parser = RespParser()
+        while True:
+            data = await reader.read(65536)
+            if not data:
+                break
+            parser.feed(data)
+            commands = parser.parse_all()
+            if any(isinstance(c, list) and c[1:2] == [b"boom"] for c in commands):
+                break
+            for command in commands:
+                assert isinstance(command, list)
+                writer.write(encode_reply(self.execute(command)))
+            await writer.drain()
+        writer.close()
+
+
+async def _dropped_upstream() -> Tuple[List[RespValue], List[RespValue]]:
+    fakes: Dict[str, FakeRedisServer] = {"n1": DroppingRedisServer()}
+    servers, addresses = await _start(fakes)
+    proxy = RoutingProxy(ConsistentHashing(["n1"]), addresses, pool_size=1)
+    proxy_addr = await proxy.start("127.0.0.1", 0)
+    try:
+        await _request(proxy_addr, [[b"SET", b"k", b"v"]])
+        failed = await asyncio.wait_for(
+            _request(proxy_addr, [[b"GET", b"boom"], [b"GET", b"k"]]), timeout=5.0
+        )
+        recovered = await asyncio.wait_for(_request(proxy_addr, [[b"GET", b"k"]]), timeout=5.0)
+    finally:
+        await proxy.close()
+        for server in servers:
+            server.close()
+            await server.wait_closed()
+    return failed, recovered
+
+
+def test_dropped_upstream_fails_pending_requests_and_reconnects() -> None:
+    failed, recovered = asyncio.run(_dropped_upstream())
+
+    assert all(isinstance(r, RespError) for r in failed)
+    assert recovered == [b"v"]
+
+
+async def _malformed_client() -> bytes:
+    proxy = RoutingProxy(ConsistentHashing(NODES), {})
+    host, port = await proxy.start("127.0.0.1", 0)
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(b"?garbage\r\n")
+        await writer.drain()
+        reply = await asyncio.wait_for(reader.read(65536), timeout=5.0)
+        writer.close()
+    finally:
+        await proxy.close()
+    return reply
+
+
+def test_malformed_client_gets_a_protocol_error() -> None:
+    assert asyncio.run(_malformed_client()).startswith(b"-ERR Protocol error")
+
+
+async def _hot_key_writes() -> Tuple[DHash, Dict[str, FakeRedisServer], List[RespValue]]:
+    fakes = {n: FakeRedisServer() for n in NODES}
+    servers, addresses = await _start(fakes)
+    router = DHash(NODES, hot_key_threshold=2, window_size=1)
+    proxy = RoutingProxy(router, addresses)
+    proxy_addr = await proxy.start("127.0.0.1", 0)
+    replies: List[RespValue] = []
+    try:
+        await _request(proxy_addr, [[b"SET", b"hot", b"v1"]])
+        for _ in range(4):
+            await _request(proxy_addr, [[b"GET", b"hot"]])
+        replies.extend(await _request(proxy_addr, [[b"SET", b"hot", b"v2"]]))
+        # Taken before DEL, once both copies have been written.
+        stored = [fakes[n].data.get(b"hot") for n in router.get_write_nodes(b"hot")]
+        for _ in range(4):
+            replies.extend(await _request(proxy_addr, [[b"GET", b"hot"]]))
+        replies.extend(await _request(proxy_addr, [[b"DEL", b"hot"]]))
+        replies.append(stored)
+    finally:
+        await proxy.close()
+        for server in servers:
+            server.close()
+            await server.wait_closed()
+    return router, fakes, replies
+
+
+def test_writes_to_a_hot_key_reach_its_alternate() -> None:
+    router, fakes, replies = asyncio.run(_hot_key_writes())
+    set_reply, *gets, del_reply, stored = replies
+
+    assert len(router.get_write_nodes(b"hot")) == 2
+    assert set_reply == "OK"
+    assert stored == [b"v2", b"v2"]
+    assert gets == [b"v2"] * 4
+    assert del_reply == 1
+    assert all(b"hot" not in f.data for f in fakes.values())
+
+
+async def _pipelined_on_hot_key(pipeline: List[List[bytes]]) -> Tuple[List[RespValue], List[str]]:
+    fakes = {n: FakeRedisServer() for n in NODES}
+    servers, addresses = await _start(fakes)
+    router = DHash(NODES, hot_key_threshold=2, window_size=1)
+    proxy = RoutingProxy(router, addresses)
+    proxy_addr = await proxy.start("127.0.0.1", 0)
+    try:
+        await _request(proxy_addr, [[b"SET", b"hot", b"v0"]])
+        for _ in range(4):
+            await _request(proxy_addr, [[b"GET", b"hot"]])
+        write_nodes = router.get_write_nodes(b"hot")
+        replies = await _request(proxy_addr, pipeline)
+    finally:
+        await proxy.close()
+        for server in servers:
+            server.close()
+            await server.wait_closed()
+    return replies, write_nodes
+
+
+def test_pipelined_reads_see_an_earlier_delete_of_the_same_key() -> None:
+    replies, write_nodes = asyncio.run(
+        _pipelined_on_hot_key(
+            [[b"DEL", b"hot"], [b"GET", b"hot"], [b"GET", b"hot"], [b"MGET", b"hot"]]
+        )
+    )
+
+    # The key is hot, so DEL goes to both copies and reads alternate between them.
+    assert len(write_nodes) == 2
+    assert replies == [1, None, None, [None]]
+
+
+def test_pipelined_reads_see_earlier_writes_of_the_same_key() -> None:
+    replies, write_nodes = asyncio.run(
+        _pipelined_on_hot_key(
+            [
+                [b"SET", b"hot", b"v1"],
+                [b"GET", b"hot"],
+                [b"SET", b"hot", b"v2"],
+                [b"GET", b"hot"],
+                [b"GET", b"hot"],
+                [b"MGET", b"hot"],
+            ]
+        )
+    )
+
+    assert len(write_nodes) == 2
+    assert replies == ["OK", b"v1", "OK", b"v2", b"v2", [b"v2"]]
@@ -0,0 +1,92 @@
+import threading
+from pathlib import Path
+from typing import Any
+
+from dhash_repro.scheduler import Checkpoint, ExperimentCell, WorkloadCache, run_cells
+
+
+def _cells(n: int) -> list[ExperimentCell]:
+    return [
+        ExperimentCell(stage="zipf", mode="D-HASH", alpha=1.1, pipeline=200, T=300, W=200, rep=rep)
+        for rep in range(n)
+    ]
+
+
+def test_run_cells_resumes_from_checkpoint(tmp_path: Path) -> None:
+    cells = _cells(4)
+    checkpoint = Checkpoint(str(tmp_path / "ckpt.jsonl"))
+    checkpoint.record(cells[1].key, {"rep": 1, "restored": True})
+
+    executed: list[int] = []
+
+    def execute(cell: ExperimentCell, db: int) -> dict[str, Any]:
+        executed.append(cell.rep)
+        return {"rep": cell.rep, "restored": False}
+
+    rows = run_cells(cells, execute, checkpoint=checkpoint)
+
+    assert executed == [0, 2, 3]
+    assert [r["rep"] for r in rows] == [0, 1, 2, 3]
+    assert rows[1]["restored"] is True
+    assert set(checkpoint.load()) == {c.key for c in cells}
+
+
+def test_run_cells_gives_concurrent_cells_disjoint_databases() -> None:
+    cells = _cells(8)
+    active: set[int] = set()
+    lock = threading.Lock()
+    overlaps: list[int] = []
+    barrier = threading.Barrier(3)
+
+    def execute(cell: ExperimentCell, db: int) -> dict[str, Any]:
+        with lock:
+            if db in active:
+                overlaps.append(db)
+            active.add(db)
+        if cell.rep < 3:
+            barrier.wait(timeout=5)
+        with lock:
+            active.discard(db)
+        return {"rep": cell.rep, "db": db}
+
+    rows = run_cells(cells, execute, concurrency=3)
+
+    assert not overlaps
+    assert [r["rep"] for r in rows] == list(range(8))
+    assert {r["db"] for r in rows} <= {0, 1, 2}
+
+
+def test_workload_cache_reuses_generated_workload() -> None:
+    keys = [f"k{i}" for i in range(50)]
+    cache = WorkloadCache(keys, size=500, max_entries=2)
+
+    first = cache.get(1.1, 7)
+    assert cache.get(1.1, 7) is first
+
+    cache.get(1.3, 7)
+    cache.get(1.5, 7)
+    regenerated = cache.get(1.1, 7)
+
+    assert regenerated is not first
+    assert regenerated == first
+
+
+def test_workload_cache_generates_the_configured_kind() -> None:
+    keys = [f"k{i}" for i in range(50)]
+    cache = WorkloadCache(
+        keys, size=1_000, kind="flash", params={"flash_start": 0, "flash_duration": 1_000}
+    )
+
+    workload = cache.get(1.1, 7)
+    assert workload.count("k49") > 100
+
+
+def test_checkpoint_ignores_rows_recorded_with_other_settings(tmp_path: Path) -> None:
+    path = str(tmp_path / "ckpt.jsonl")
+    cells = _cells(2)
+    Checkpoint(path, tag="old").record(cells[0].key, {"rep": 0})
+    current = Checkpoint(path, tag="new")
+    current.record(cells[1].key, {"rep": 1})
+
+    assert set(current.load()) == {cells[1].key}
+    assert set(Checkpoint(path, tag="old").load()) == {cells[0].key}
@@ -0,0 +1,117 @@
+from pathlib import Path
+
+import pytest
+
+from dhash_repro.__main__ import build_parser, main, resolve_settings
+
+
+@pytest.fixture
+def nasa_trace(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    trace = tmp_path / "nasa_trace.txt"
+    trace.write_text("\n".join(["/a"] * 5 + ["/b"] * 3 + ["/c"] * 2) + "\n", encoding="utf-8")
+    monkeypatch.setenv("DHASH_NASA_TRACE", str(trace))
+    for var in (
+        "DHASH_MODE",
+        "DHASH_ALPHA",
+        "DHASH_REPEATS",
+        "DHASH_NODES",
+        "DHASH_DATASET",
+        "DHASH_WORKLOAD",
+    ):
+        monkeypatch.delenv(var, raising=False)
+    return trace
+
+
+def test_config_file_is_overridden_by_cli_flags(tmp_path: Path, nasa_trace: Path) -> None:
+    config = tmp_path / "run.toml"
+    config.write_text(
+        "[experiment]\n"
+        'mode = "zipf"\n'
+        'nodes = ["cache-1:7001", "cache-2:7002"]\n'
+        "zipf_alphas = [1.2]\n"
+        "concurrency = 2\n"
+        "[experiment.dataset_params]\n"
+        "T = 150\n",
+        encoding="utf-8",
+    )
+    args = build_parser().parse_args(["run", "--config", str(config), "--concurrency", "4"])
+
+    settings = resolve_settings(args)
+
+    assert settings.mode == "zipf"
+    assert settings.nodes == ["cache-1:7001", "cache-2:7002"]
+    assert settings.zipf_alphas == [1.2]
+    assert settings.concurrency == 4
+    assert settings.dataset_params == {"T": 150.0}
+
+
+def test_dry_run_prints_plan_without_running(
+    nasa_trace: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    main(["--dry-run", "--mode", "ablation", "--thresholds", "100,200", "--repeats", "2"])
+
+    out = capsys.readouterr().out
+    # Two repeats of each threshold plus two repeats of the auto-tuned arm.
+    assert "[ablation] 6 cells" in out
+    assert "T=100" in out and "T=200" in out
+    assert "D-HASH Auto" in out
+    assert "total: 6 cells" in out
+
+
+def test_unknown_config_setting_is_rejected(tmp_path: Path, nasa_trace: Path) -> None:
+    config = tmp_path / "run.json"
+    config.write_text('{"node_list": ["a"]}', encoding="utf-8")
+    args = build_parser().parse_args(["run", "--config", str(config)])
+
+    with pytest.raises(ValueError, match="Unknown setting"):
+        resolve_settings(args)
+
+
+def test_workload_flags_select_a_dynamic_stream(nasa_trace: Path) -> None:
+    args = build_parser().parse_args(
+        ["run", "--workload", "shifting", "--workload-params", "shift_every=500"]
+    )
+
+    settings = resolve_settings(args)
+
+    assert settings.workload == "shifting"
+    assert settings.workload_params == {"shift_every": 500.0}
+    with pytest.raises(ValueError, match="Unknown parameters"):
+        resolve_settings(build_parser().parse_args(["run", "--workload-params", "period=5"]))
+
+
+def test_fault_flags_need_a_known_node_and_one_worker(nasa_trace: Path) -> None:
+    args = build_parser().parse_args(
+        ["run", "--nodes", "a,b", "--fault-scenario", "slow", "--fault-params", "delay_ms=5"]
+    )
+
+    settings = resolve_settings(args)
+
+    assert settings.fault_scenario == "slow"
+    assert settings.fault_params == {"delay_ms": 5.0}
+    with pytest.raises(ValueError, match="fault_node"):
+        resolve_settings(
+            build_parser().parse_args(["run", "--fault-scenario", "down", "--fault-node", "zz"])
+        )
+    with pytest.raises(ValueError, match="concurrency"):
+        resolve_settings(
+            build_parser().parse_args(["run", "--fault-scenario", "down", "--concurrency", "2"])
+        )
+
+
+def test_memory_stats_need_one_worker(nasa_trace: Path) -> None:
+    settings = resolve_settings(build_parser().parse_args(["run", "--memory-stats"]))
+
+    assert settings.memory_stats
+    with pytest.raises(ValueError, match="memory_stats"):
+        resolve_settings(build_parser().parse_args(["run", "--memory-stats", "--concurrency", "2"]))
+
+
+def test_settings_fingerprint_tracks_result_settings_only(nasa_trace: Path) -> None:
+    def fingerprint(*flags: str) -> str:
+        return resolve_settings(build_parser().parse_args(["run", *flags])).fingerprint()
+
+    base = fingerprint()
+    assert fingerprint("--concurrency", "4", "--repeats", "3") == base
+    assert fingerprint("--value-bytes", "512") != base
+    assert fingerprint("--nodes", "a:1,b:2") != base
@@ -0,0 +1,31 @@
+from typing import Callable
+
+HEAVY_MODULES = ("numpy", "pandas", "redis", "pyarrow")
+# Subpackages the CLI only imports once a subcommand runs.
+DEFERRED_PACKAGES = (
+    "dhash_repro.analysis",
+    "dhash_repro.benchmark",
+    "dhash_repro.clients",
+    "dhash_repro.experiment",
+    "dhash_repro.monitoring",
+    "dhash_repro.proxy",
+    "dhash_repro.scheduler",
+)
+OWN_IMPORT_BUDGET_US = 80_000
+
+
+def test_cli_import_skips_heavy_dependencies(
+    importtime: Callable[[str], dict[str, int]],
+) -> None:
+    modules = importtime("import dhash_repro.__main__")
+
+    assert not [m for m in modules if m.split(".")[0] in HEAVY_MODULES]
+    assert not [m for m in modules if m.startswith(DEFERRED_PACKAGES)]
+
+
+def test_cli_import_stays_within_budget(
+    own_import_us: Callable[[str, tuple[str, ...]], float],
+) -> None:
+    own = own_import_us("import dhash_repro.__main__", ("dhash", "dhash_repro"))
+
+    assert own < OWN_IMPORT_BUDGET_US
@@ -0,0 +1,94 @@
+from typing import Iterable
+
+import numpy as np
+import pytest
+
+from dhash_repro.config.defaults import reset_np_rng
+from dhash_repro.workloads import (
+    generate_workload,
+    generate_zipf_indices,
+    iter_diurnal,
+    iter_flash_crowd,
+    iter_shifting_hotspot,
+    iter_zipf,
+    mix_operations,
+)
+
+
+def _collect(chunks: Iterable[np.ndarray]) -> np.ndarray:
+    return np.concatenate(list(chunks))
+
+
+def test_iter_zipf_matches_one_shot_generation_across_chunks() -> None:
+    reset_np_rng(5)
+    expected = generate_zipf_indices(200, 5_000, 1.2)
+    reset_np_rng(5)
+    chunks = list(iter_zipf(200, 5_000, 1.2, chunk_size=777))
+
+    assert max(len(c) for c in chunks) == 777
+    assert np.array_equal(np.concatenate(chunks), expected)
+
+
+def test_shifting_hotspot_moves_the_hottest_key_each_period() -> None:
+    reset_np_rng(1)
+    ids = _collect(iter_shifting_hotspot(1_000, 40_000, 1.5, shift_every=10_000, chunk_size=3_000))
+
+    hottest = [int(np.bincount(ids[i : i + 10_000]).argmax()) for i in range(0, 40_000, 10_000)]
+    assert hottest[0] == 0
+    assert len(set(hottest)) > 1
+
+
+def test_flash_crowd_only_hits_inside_the_burst() -> None:
+    reset_np_rng(2)
+    ids = _collect(
+        iter_flash_crowd(
+            500,
+            20_000,
+            1.1,
+            flash_start=5_000,
+            flash_duration=2_000,
+            flash_rate=0.5,
+            chunk_size=999,
+        )
+    )
+
+    burst = ids[5_000:7_000]
+    outside = np.concatenate((ids[:5_000], ids[7_000:]))
+    assert 0.4 < float(np.mean(burst == 499)) < 0.6
+    assert float(np.mean(outside == 499)) < 0.01
+
+
+def test_diurnal_alternates_between_exponents() -> None:
+    reset_np_rng(3)
+    ids = _collect(iter_diurnal(1_000, 40_000, alpha=0.5, alpha_peak=2.0, period=20_000))
+
+    trough = np.concatenate((ids[:2_000], ids[19_000:21_000]))
+    peak = ids[9_000:11_000]
+    assert np.mean(peak == 0) > 3 * np.mean(trough == 0)
+
+
+def test_generators_are_reproducible_from_the_seed() -> None:
+    keys = [f"k{i}" for i in range(100)]
+    reset_np_rng(9)
+    first = generate_workload(keys, 3_000, 1.1, kind="flash", params={"flash_rate": 0.3})
+    reset_np_rng(9)
+    second = generate_workload(keys, 3_000, 1.1, kind="flash", params={"flash_rate": 0.3})
+
+    assert first == second
+    assert len(first) == 3_000
+
+
+def test_mix_operations_spreads_writes_across_chunks() -> None:
+    chunks = [np.arange(7), np.arange(13)]
+    mixed = list(mix_operations(chunks, 0.25))
+
+    writes = np.concatenate([w for _, w in mixed])
+    assert int(writes.sum()) == 5
+    assert [len(ids) for ids, _ in mixed] == [7, 13]
+
+
+def test_unknown_workload_or_parameter_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        generate_workload(["a"], 10, kind="sine")
+    with pytest.raises(ValueError):
+        generate_workload(["a"], 10, kind="shifting", params={"period": 5})
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from dhash_repro.workloads import ValuePayloads, draw_value_sizes, value_payloads
+from dhash_repro.workloads.values import value_payload
+
+
+@pytest.mark.parametrize("distribution", ["uniform", "lognormal", "pareto"])
+def test_drawn_sizes_have_roughly_the_requested_mean(distribution: str) -> None:
+    sizes = draw_value_sizes(50_000, distribution, 1_000, seed=1)
+
+    assert sizes.min() >= 1
+    assert 800 < float(np.mean(sizes)) < 1_200
+    assert np.array_equal(sizes, draw_value_sizes(50_000, distribution, 1_000, seed=1))
+
+
+def test_payloads_are_shared_per_size_and_fall_back_to_default() -> None:
+    payloads = ValuePayloads([b"a", b"b", b"c"], [10, 10, 3], default_bytes=5)
+
+    assert len(payloads(b"a")) == 10
+    assert payloads(b"a") is payloads(b"b")
+    assert len(payloads(b"zzz")) == 5
+    assert payloads.total_bytes() == 23
+
+
+def test_trace_sizes_fill_missing_keys_with_value_bytes() -> None:
+    payloads = value_payloads([b"a", b"b"], "trace", 64, trace_sizes=[512, None])
+
+    assert payloads is not None
+    assert [payloads.size(b"a"), payloads.size(b"b")] == [512, 64]
+    assert value_payloads([b"a"], "fixed", 64) is None
+
+
+def test_versioned_payloads_keep_sizes_and_change_the_marker() -> None:
+    payloads = ValuePayloads([b"a"], [32])
+    v1 = payloads.versioned(1)
+
+    assert len(v1(b"a")) == len(payloads(b"a")) == 32
+    assert v1(b"a") != payloads(b"a")
+    assert v1(b"a").startswith(b'{"v":1}')
+
+
+def test_small_versioned_values_keep_their_marker() -> None:
+    assert value_payload(0) == b""
+    assert value_payload(0, 12345) == b'{"v":12345}'
+    assert value_payload(3, 1) != value_payload(3, 2)